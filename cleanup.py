@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import argparse
-from utilities.cleanup_utils import run_cleanup
+from utilities.cleanup_utils import run_cleanup, parse_size
+from config.config import CLEANUP_WORKERS
 
 def main():
     """
@@ -13,9 +14,21 @@ def main():
                         default='match_reports',
                         help='Screenshot cleanup strategy (default: match_reports)')
     parser.add_argument('--max-screenshots', type=int, default=None,
-                        help='Number of recent screenshots to keep (default: all from last execution)')
+                        help='Number of recent screenshots to keep, counted over whole runs (default: all from last execution)')
     parser.add_argument('--reports-to-match', type=int, default=5,
                         help='Number of reports to match screenshots with (default: 5)')
+    parser.add_argument('--rebuild-catalog', action='store_true',
+                        help='Rebuild the artifact catalog from the report and screenshot directories first')
+    parser.add_argument('--max-bytes', type=parse_size, default=None,
+                        help='Total size budget of runs and screenshots, e.g. 20G; older runs beyond it are deleted')
+    parser.add_argument('--max-age', type=float, default=None,
+                        help='Delete runs older than this many days')
+    parser.add_argument('--keep-failed', action='store_true',
+                        help='Always keep runs with failed tests')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print a summary of what would be deleted without deleting anything')
+    parser.add_argument('--workers', type=int, default=CLEANUP_WORKERS,
+                        help=f'Number of deletion threads (default: {CLEANUP_WORKERS})')
     
     args = parser.parse_args()
     
@@ -23,7 +36,13 @@ def main():
         max_reports=args.reports,
         screenshot_option=args.screenshots,
         max_screenshots=args.max_screenshots,
-        reports_to_match=args.reports_to_match
+        reports_to_match=args.reports_to_match,
+        rebuild_catalog=args.rebuild_catalog,
+        max_bytes=args.max_bytes,
+        max_age_days=args.max_age,
+        keep_failed=args.keep_failed,
+        dry_run=args.dry_run,
+        workers=args.workers
     )
 
 if __name__ == "__main__":
@@ -4,6 +4,9 @@ from datetime import datetime
 # Base URL for the application
 BASE_URL = "https://webdriveruniversity.com/"
 
+# Serve the pages under test from the local offline mirror instead of BASE_URL
+USE_MIRROR = os.environ.get("USE_MIRROR", "false").lower() in ("1", "true", "yes")
+
 # Browser options
 BROWSER = "chrome"  # chrome, firefox, edge
 HEADLESS = False
@@ -12,18 +15,89 @@ WINDOW_SIZE = (1920, 1080)
 # Timeouts in seconds
 IMPLICIT_WAIT = 10
 PAGE_LOAD_TIMEOUT = 30
+PAGE_LOAD_STRATEGY = "eager"  # "normal" waits for every subresource, "eager" for the DOM, "none" for nothing; pages then wait for their READY_WHEN contract
 EXPLICIT_WAIT = 20
+COMMAND_TIMEOUT = 90  # Wall-clock ceiling of any WebDriver command, above the page load and wait timeouts; a browser hung for longer is killed and respawned
+HEALTH_CHECK_TIMEOUT = 5  # Seconds a pooled browser gets to answer the health ping before a test leases it
+CIRCUIT_BREAKER_THRESHOLD = 3  # Consecutive environmental failures (unreachable site, broken driver) after which remaining tests fail at once; 0 disables
+
+# Zero the implicit wait inside explicit waits and absence checks so each has a single timeout
+SINGLE_TIMEOUT_WAITS = True
+
+# Wait engine: "observer" blocks in the browser on DOM mutations, "polling" uses WebDriverWait
+WAIT_ENGINE = "polling"
+
+# Page navigation: "direct" loads a page's own URL in the current tab,
+# "click" opens it from the homepage link in a new tab
+NAVIGATION_MODE = "direct"
+
+# Page object action log: "INFO" logs actions, "DEBUG" also the waits behind them,
+# "WARNING" or "OFF" skip message formatting entirely for throughput runs
+ACTION_LOG_LEVEL = os.environ.get("ACTION_LOG_LEVEL", "INFO").upper()
+
+# Driver pool
+DRIVER_POOL_SIZE = 1  # Browsers kept warm per worker
+DRIVER_POOL_MAX_LEASES = 50  # Recycle a browser after this many tests
+ISOLATION_MODE = "context"  # Between tests: "reset" clears the browser, "context" opens a fresh browser context (Chromium), "restart" starts a new browser
+
+# Resource blocking on Chrome and Edge (CDP Network.setBlockedURLs): requests matching the
+# selected profile are never sent; tests marked full_render load every resource
+RESOURCE_BLOCKING = os.environ.get("RESOURCE_BLOCKING", "third_party")  # Profile name below
+THIRD_PARTY_URL_PATTERNS = [  # Analytics, ads and web fonts the page objects never assert on
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*hotjar.com*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"
+]
+RESOURCE_BLOCKING_PROFILES = {
+    "none": {},
+    "third_party": {"url_patterns": THIRD_PARTY_URL_PATTERNS},
+    "assets": {
+        "resource_types": ["image", "font", "media"],  # Matched by file extension
+        "url_patterns": THIRD_PARTY_URL_PATTERNS
+    }
+}
+
+# Driver binaries
+DRIVER_CACHE_DIR = os.path.expanduser("~/.webdriver")
+DRIVER_OFFLINE = os.environ.get("DRIVER_OFFLINE", "false").lower() in ("1", "true", "yes")  # Fail fast instead of downloading
+DRIVER_LOCK_TIMEOUT = 120  # Seconds to wait for another worker resolving the same driver
+DRIVER_LOCK_STALE_AGE = 1800  # Seconds after which a lock whose owner cannot be checked is broken, far above any driver download
 
 # Test data
 TEST_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests", "test_data")
+MIRROR_DIR = os.path.join(TEST_DATA_PATH, "mirror")  # Pinned snapshot served by the mirror server
+BASELINES_DIR = os.path.join(TEST_DATA_PATH, "baselines")  # Visual regression baselines, per browser
+
+# Visual regression
+UPDATE_BASELINES = os.environ.get("UPDATE_BASELINES", "false").lower() in ("1", "true", "yes")  # Record or re-record baselines; without it a missing baseline fails the check
+VISUAL_TILE_SIZE = 32  # Tile edge in pixels; unchanged tiles are skipped by fingerprint
+VISUAL_PIXEL_TOLERANCE = 16  # Perceived difference (0-255) below which a pixel counts as unchanged
+VISUAL_MAX_DIFF_RATIO = 0.001  # Share of changed pixels allowed before a comparison fails
 
 # Reports
 REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "reports")
 SCREENSHOTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "screenshots")
-LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+SCREENSHOT_WORKERS = 2  # Background threads decoding and writing screenshots
+SCREENSHOT_MAX_PENDING = 16  # Captures waiting for a writer before capturing blocks
+SCREENSHOT_FORMAT = "png"  # "png" keeps the browser image, "jpeg" re-encodes it (requires Pillow)
+SCREENSHOT_JPEG_QUALITY = 85
+SCREENSHOT_MODE = "viewport"  # "viewport" or "full_page" (CDP on Chromium, native on Firefox)
+FAILURE_SCREENSHOT_MODE = "full_page"  # Capture mode of the screenshots attached to failed tests
+THUMBNAIL_SIZE = (480, 720)  # Bounding box of the report previews; the full image is linked
+THUMBNAIL_JPEG_QUALITY = 70
+REPORT_MODE = os.environ.get("REPORT_MODE", "self_contained")  # "self_contained" or "linked" (artifacts next to the report)
+TIMINGS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".test_timings.json")  # Per-test durations used for sharding
+ARTIFACT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".artifacts.db")  # Index of reports and screenshots used by cleanup
+CLEANUP_WORKERS = 8  # Threads deleting old runs and screenshots
+RETENTION_UNFINISHED_HOURS = 24  # Runs without a report are assumed to be still running for this long
 
 # Create a timestamp for report names
 def get_timestamp():
     return datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 
-REPORT_NAME = f"test_report_{get_timestamp()}.html" 
\ No newline at end of file
+# Run id shared by everything a test run writes; parallel workers inherit it from the runner
+RUN_ID = os.environ.get("RUN_ID") or f"{get_timestamp()}_{os.getpid()}"
+RUN_DIR = os.path.join(REPORTS_DIR, RUN_ID)  # Report, logs, screenshot manifests and shard output of this run
+LOGS_DIR = os.path.join(RUN_DIR, "logs")
+WORKER_ID = os.environ.get("WORKER_ID") or "main"  # Name of this process's log file; set per shard by the parallel runner
+REPORT_NAME = "report.html"
+ 
\ No newline at end of file
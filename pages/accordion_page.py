@@ -4,6 +4,9 @@ from pages.base_page import BasePage
 class AccordionPage(BasePage):
     """Page object for WebDriverUniversity Accordion page"""
     
+    # Page path relative to BASE_URL
+    PATH = "Accordion/index.html"
+    
     # Locators
     MANUAL_TESTING_HEADING = (By.ID, "manual-testing-accordion")
     MANUAL_TESTING_CONTENT = (By.ID, "manual-testing-description")
@@ -15,6 +18,9 @@ class AccordionPage(BasePage):
     CLICK_CONTENT = (By.ID, "timeout")
     LOADING_ICON = (By.CSS_SELECTOR, "div.dotcontainer")
     
+    # Readiness contract: elements the page must have interactable before it is used
+    READY_WHEN = (MANUAL_TESTING_HEADING,)
+    
     def __init__(self, driver):
         """Initialize the AccordionPage object"""
         super().__init__(driver)
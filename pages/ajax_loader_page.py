@@ -1,11 +1,12 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from pages.base_page import BasePage
 
 class AjaxLoaderPage(BasePage):
     """Page object for WebDriverUniversity Ajax Loader page"""
     
+    # Page path relative to BASE_URL
+    PATH = "Ajax-Loader/index.html"
+    
     # Locators
     CLICK_ME_BUTTON = (By.ID, "button1")
     AJAX_LOADER_SPINNER = (By.CSS_SELECTOR, "div#loader")
@@ -25,9 +26,7 @@ class AjaxLoaderPage(BasePage):
             AjaxLoaderPage: Self reference for method chaining
         """
         self.logger.info("Waiting for Ajax loader to disappear")
-        WebDriverWait(self.driver, 10).until(
-            EC.invisibility_of_element_located(self.AJAX_LOADER_SPINNER)
-        )
+        self.wait_for_element_invisible(self.AJAX_LOADER_SPINNER, timeout=10)
         return self
     
     def click_button_after_loader(self):
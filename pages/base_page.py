@@ -1,19 +1,38 @@
-import os
 import logging
-from datetime import datetime
+from urllib.parse import urljoin
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from config.config import EXPLICIT_WAIT, SCREENSHOTS_DIR
+from config import config
+from config.config import EXPLICIT_WAIT, WAIT_ENGINE, ACTION_LOG_LEVEL, PAGE_LOAD_STRATEGY
+from utilities.logger import setup_logger
+from utilities.observer_wait import ObserverWait, polling_condition
+from utilities.batch_query import BATCH_QUERY_JS
+from utilities.wait_policy import single_timeout, wait_for_ready_state, LEAVING_PAGE_FLAG
+from utilities.screenshot_pipeline import get_pipeline
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 
+# Logger levels for ACTION_LOG_LEVEL; "OFF" is above every level the pages log at
+ACTION_LOG_LEVELS = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "WARNING": logging.WARNING, "OFF": logging.CRITICAL + 1}
+
 class BasePage:
     """
     Base page class that all page objects inherit from.
     Contains common methods for all pages.
     """
     
+    # Path of the page relative to BASE_URL, None for pages without their own URL
+    PATH = None
+    
+    # Wait engine for this page object: "observer", "polling" or None to use WAIT_ENGINE from config
+    WAIT_ENGINE = None
+    
+    # Readiness contract: locators that must be interactable before the page is used.
+    # With the "eager" or "none" page load strategy, opening the page returns as soon as
+    # they are; pages without a contract wait for the whole document to load.
+    READY_WHEN = ()
+    
     def __init__(self, driver):
         """
         Initialize the BasePage class
@@ -31,19 +50,82 @@ class BasePage:
                 StaleElementReferenceException
             ]
         )
+        self.observer_wait = ObserverWait(driver) if (self.WAIT_ENGINE or WAIT_ENGINE) == "observer" else None
         self.actions = ActionChains(driver)
-        self.logger = self._setup_logger()
+        self.logger = self._get_logger()
     
-    def _setup_logger(self):
-        """Set up the logger for the page object"""
-        logger = logging.getLogger(self.__class__.__name__)
-        logger.setLevel(logging.INFO)
+    @classmethod
+    def _get_logger(cls):
+        """
+        Get the action logger of the page class, set up once per class
+        
+        Actions (navigation, clicks, typing) are logged at INFO and the waits behind
+        them at DEBUG, with %-style arguments so messages are only formatted when
+        ACTION_LOG_LEVEL lets them through.
+        
+        Returns:
+            Logger: Logger named after the page class
+        """
+        logger = cls.__dict__.get("_logger")
+        if logger is None:
+            if ACTION_LOG_LEVEL not in ACTION_LOG_LEVELS:
+                raise ValueError(f"Unknown ACTION_LOG_LEVEL: {ACTION_LOG_LEVEL}")
+            logger = setup_logger(cls.__name__)
+            logger.setLevel(ACTION_LOG_LEVELS[ACTION_LOG_LEVEL])
+            cls._logger = logger
         return logger
     
+    @property
+    def url(self):
+        """Absolute URL of the page, resolved against the current BASE_URL"""
+        if self.PATH is None:
+            raise ValueError(f"{self.__class__.__name__} does not declare a PATH")
+        return urljoin(config.BASE_URL, self.PATH)
+    
+    def open(self):
+        """
+        Open the page directly by its URL
+        
+        Returns:
+            BasePage: Self reference for method chaining
+        """
+        self.navigate_to(self.url)
+        return self
+    
     def navigate_to(self, url):
-        """Navigate to the specified URL"""
-        self.logger.info(f"Navigating to: {url}")
+        """Navigate to the specified URL and wait until this page is ready to use"""
+        self.logger.info("Navigating to: %s", url)
+        if PAGE_LOAD_STRATEGY == "none":
+            # get() may return before the new document replaced the current one; marking
+            # the current one keeps readiness checks from passing on the page being left
+            self.driver.execute_script(f"window.{LEAVING_PAGE_FLAG} = true;")
         self.driver.get(url)
+        self.wait_until_ready()
+    
+    def wait_until_ready(self):
+        """
+        Enforce the page's readiness contract after navigating to it
+        
+        Navigation blocks until the page has loaded under the "normal" page load
+        strategy, so there is nothing left to wait for. Otherwise every READY_WHEN
+        locator must be interactable, or, for pages without a contract, the document
+        must have finished loading, so no test acts on a page that is not ready.
+        
+        Returns:
+            BasePage: Self reference for method chaining
+        """
+        if PAGE_LOAD_STRATEGY == "normal":
+            return self
+        if not self.READY_WHEN:
+            wait_for_ready_state(self.driver, "complete")
+            return self
+        
+        # Interactable elements need a parsed document, which "none" does not wait for
+        if PAGE_LOAD_STRATEGY == "none":
+            wait_for_ready_state(self.driver, "interactive")
+        for locator in self.READY_WHEN:
+            self.wait_for_element_clickable(locator)
+        return self
     
     def get_title(self):
         """Get the page title"""
@@ -63,8 +145,11 @@ class BasePage:
         Returns:
             WebElement: The element once it's visible
         """
-        self.logger.info(f"Waiting for element to be visible: {locator}")
-        return self.wait.until(EC.visibility_of_element_located(locator))
+        self.logger.debug("Waiting for element to be visible: %s", locator)
+        with single_timeout(self.driver, "visible"):
+            if self.observer_wait:
+                return self.observer_wait.until(locator, "visible")
+            return self.wait.until(EC.visibility_of_element_located(locator))
     
     def wait_for_element_clickable(self, locator):
         """
@@ -76,8 +161,11 @@ class BasePage:
         Returns:
             WebElement: The element once it's clickable
         """
-        self.logger.info(f"Waiting for element to be clickable: {locator}")
-        return self.wait.until(EC.element_to_be_clickable(locator))
+        self.logger.debug("Waiting for element to be clickable: %s", locator)
+        with single_timeout(self.driver, "clickable"):
+            if self.observer_wait:
+                return self.observer_wait.until(locator, "clickable")
+            return self.wait.until(EC.element_to_be_clickable(locator))
     
     def wait_for_elements_visible(self, locator):
         """
@@ -89,8 +177,126 @@ class BasePage:
         Returns:
             List[WebElement]: A list of visible elements
         """
-        self.logger.info(f"Waiting for elements to be visible: {locator}")
-        return self.wait.until(EC.visibility_of_all_elements_located(locator))
+        self.logger.debug("Waiting for elements to be visible: %s", locator)
+        with single_timeout(self.driver, "all_visible"):
+            if self.observer_wait:
+                return self.observer_wait.until(locator, "all_visible")
+            return self.wait.until(EC.visibility_of_all_elements_located(locator))
+    
+    def wait_for_element_invisible(self, locator, timeout=EXPLICIT_WAIT):
+        """
+        Wait for element to be invisible or absent
+        
+        Args:
+            locator: (by, value) tuple
+            timeout: Time to wait for the element to disappear
+        """
+        self.logger.debug("Waiting for element to be invisible: %s", locator)
+        with single_timeout(self.driver, "invisible"):
+            if self.observer_wait:
+                self.observer_wait.until(locator, "invisible", timeout=timeout)
+            else:
+                WebDriverWait(self.driver, timeout).until(EC.invisibility_of_element_located(locator))
+    
+    def wait_for_element_count_change(self, locator, previous_count, timeout=EXPLICIT_WAIT):
+        """
+        Wait for the number of elements matching a locator to change
+        
+        Args:
+            locator: (by, value) tuple
+            previous_count: Number of matching elements before the action
+            timeout: Time to wait for the change
+        """
+        self.logger.debug("Waiting for element count of %s to change from %s", locator, previous_count)
+        self._wait_for_state(locator, "count_changed", previous_count, timeout)
+    
+    def wait_for_class(self, locator, class_name, present=True, timeout=EXPLICIT_WAIT):
+        """
+        Wait for an element to gain or lose a CSS class
+        
+        Args:
+            locator: (by, value) tuple
+            class_name: CSS class to wait for
+            present: Wait for the class to be added (True) or removed (False)
+            timeout: Time to wait for the class change
+            
+        Returns:
+            WebElement: The element once its class matches
+        """
+        self.logger.debug("Waiting for class '%s' to be %s %s", class_name, "added to" if present else "removed from", locator)
+        return self._wait_for_state(locator, "class_present" if present else "class_absent", class_name, timeout)
+    
+    def wait_for_staleness(self, element, timeout=EXPLICIT_WAIT):
+        """
+        Wait for an element to be removed from the DOM
+        
+        Args:
+            element: WebElement expected to go stale
+            timeout: Time to wait for the removal
+        """
+        self.logger.debug("Waiting for element to be removed from the page")
+        self._wait_for_state(element, "absent", None, timeout)
+    
+    def wait_for_text_change(self, locator, previous_text, timeout=EXPLICIT_WAIT):
+        """
+        Wait for the text of a visible element to change
+        
+        Args:
+            locator: (by, value) tuple
+            previous_text: Text of the element before the action
+            timeout: Time to wait for the change
+            
+        Returns:
+            WebElement: The element once its text has changed
+        """
+        self.logger.debug("Waiting for text of %s to change from '%s'", locator, previous_text)
+        return self._wait_for_state(locator, "text_changed", previous_text, timeout)
+    
+    def _wait_for_state(self, target, condition, expected, timeout):
+        """Wait for a state condition using the page's wait engine"""
+        with single_timeout(self.driver, condition):
+            if self.observer_wait:
+                return self.observer_wait.until(target, condition, timeout=timeout, expected=expected)
+            return WebDriverWait(
+                self.driver,
+                timeout,
+                poll_frequency=0.5,
+                ignored_exceptions=[NoSuchElementException, StaleElementReferenceException]
+            ).until(polling_condition(target, condition, expected))
+    
+    def find_elements_now(self, locator):
+        """
+        Find elements without waiting, for presence and absence checks
+        
+        Args:
+            locator: (by, value) tuple
+            
+        Returns:
+            List[WebElement]: Elements currently matching the locator
+        """
+        with single_timeout(self.driver, "absence"):
+            return self.driver.find_elements(*locator)
+    
+    def batch_query(self, locators, attributes=(), all_matches=False):
+        """
+        Read the state of several elements in a single script call
+    
+        Args:
+            locators: Dict of name to (by, value) tuple
+            attributes: Attribute names to read from each element
+            all_matches: Describe every match of each locator instead of only the first
+    
+        Returns:
+            dict: Name to a dict with present, visible, text, attributes, classes and count
+                  keys, or to a list of such dicts (without count) when all_matches is set
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Querying %d locators in one call: %s", len(locators), ", ".join(locators))
+        queries = {
+            name: {"by": locator[0], "value": locator[1], "all": all_matches}
+            for name, locator in locators.items()
+        }
+        return self.driver.execute_script(BATCH_QUERY_JS, queries, list(attributes))
     
     def click(self, locator):
         """
@@ -99,7 +305,7 @@ class BasePage:
         Args:
             locator: (by, value) tuple
         """
-        self.logger.info(f"Clicking on element: {locator}")
+        self.logger.info("Clicking on element: %s", locator)
         element = self.wait_for_element_clickable(locator)
         element.click()
     
@@ -111,7 +317,7 @@ class BasePage:
             locator: (by, value) tuple
             text: Text to type
         """
-        self.logger.info(f"Typing '{text}' into element: {locator}")
+        self.logger.info("Typing '%s' into element: %s", text, locator)
         element = self.wait_for_element_visible(locator)
         element.clear()
         element.send_keys(text)
@@ -128,7 +334,7 @@ class BasePage:
         """
         element = self.wait_for_element_visible(locator)
         text = element.text
-        self.logger.info(f"Got text from element {locator}: '{text}'")
+        self.logger.info("Got text from element %s: '%s'", locator, text)
         return text
     
     def is_element_displayed(self, locator, timeout=5):
@@ -143,9 +349,13 @@ class BasePage:
             bool: True if element is displayed, False otherwise
         """
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
+            with single_timeout(self.driver, "displayed"):
+                if self.observer_wait:
+                    self.observer_wait.until(locator, "visible", timeout=timeout)
+                else:
+                    WebDriverWait(self.driver, timeout).until(
+                        EC.visibility_of_element_located(locator)
+                    )
             return True
         except TimeoutException:
             return False
@@ -179,25 +389,23 @@ class BasePage:
         """
         self.hover_over_element(locator)
     
-    def take_screenshot(self, name=None):
+    def take_screenshot(self, name=None, locator=None, full_page=None):
         """
         Take a screenshot
         
         Args:
             name: Screenshot name (optional)
+            locator: (by, value) tuple of an element to capture instead of the page (optional)
+            full_page: Capture the whole document instead of the viewport, None to use SCREENSHOT_MODE
             
         Returns:
             str: Path to the screenshot
         """
-        if not os.path.exists(SCREENSHOTS_DIR):
-            os.makedirs(SCREENSHOTS_DIR)
-            
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        screenshot_name = f"{name}_{timestamp}.png" if name else f"screenshot_{timestamp}.png"
-        screenshot_path = os.path.join(SCREENSHOTS_DIR, screenshot_name)
-        
-        self.driver.save_screenshot(screenshot_path)
-        self.logger.info(f"Screenshot saved: {screenshot_path}")
+        element = self.wait_for_element_visible(locator) if locator else None
+        mode = config.SCREENSHOT_MODE if full_page is None else ("full_page" if full_page else "viewport")
+        # Only the capture happens here, the file is written in the background
+        screenshot_path, _ = get_pipeline().capture(self.driver, name or "screenshot", mode, element)
+        self.logger.info("Screenshot queued: %s", screenshot_path)
         
         return screenshot_path
     
@@ -4,6 +4,9 @@ from pages.base_page import BasePage
 class ButtonClicksPage(BasePage):
     """Page object for WebDriverUniversity Button Clicks page"""
     
+    # Page path relative to BASE_URL
+    PATH = "Click-Buttons/index.html"
+    
     # Locators
     SIMPLE_BUTTON = (By.ID, "button1")
     ACTION_MOVE_BUTTON = (By.ID, "button2")
@@ -14,6 +17,9 @@ class ButtonClicksPage(BasePage):
     MODAL_BODY = (By.CSS_SELECTOR, ".modal-body")
     MODAL_CLOSE_BUTTON = (By.CSS_SELECTOR, ".modal-footer .btn")
     
+    # Readiness contract: elements the page must have interactable before it is used
+    READY_WHEN = (SIMPLE_BUTTON,)
+    
     def __init__(self, driver):
         """Initialize the ButtonClicksPage object"""
         super().__init__(driver)
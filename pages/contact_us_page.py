@@ -4,6 +4,9 @@ from pages.base_page import BasePage
 class ContactUsPage(BasePage):
     """Page object for the WebDriverUniversity Contact Us page"""
     
+    # Page path relative to BASE_URL
+    PATH = "Contact-Us/contactus.html"
+    
     # Locators
     FIRST_NAME_FIELD = (By.CSS_SELECTOR, "input[name='first_name']")
     LAST_NAME_FIELD = (By.CSS_SELECTOR, "input[name='last_name']")
@@ -14,6 +17,9 @@ class ContactUsPage(BasePage):
     SUCCESS_MESSAGE = (By.CSS_SELECTOR, "#contact_reply h1")
     ERROR_MESSAGE = (By.CSS_SELECTOR, "body")
     
+    # Readiness contract: elements the page must have interactable before it is used
+    READY_WHEN = (FIRST_NAME_FIELD, SUBMIT_BUTTON)
+    
     def __init__(self, driver):
         """Initialize the ContactUsPage object"""
         super().__init__(driver)
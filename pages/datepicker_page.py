@@ -1,12 +1,14 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from pages.base_page import BasePage
-import time
 from datetime import datetime
 
 class DatepickerPage(BasePage):
     """Page object for WebDriverUniversity Datepicker page"""
     
+    # Page path relative to BASE_URL
+    PATH = "Datepicker/index.html"
+    
     # Locators
     DATEPICKER_INPUT = (By.ID, "datepicker")
     DATEPICKER_CONTAINER = (By.CSS_SELECTOR, ".datepicker-container")
@@ -15,6 +17,9 @@ class DatepickerPage(BasePage):
     NEXT_BUTTON = (By.CSS_SELECTOR, ".next")
     PREV_BUTTON = (By.CSS_SELECTOR, ".prev")
     
+    # Readiness contract: elements the page must have interactable before it is used
+    READY_WHEN = (DATEPICKER_INPUT,)
+    
     def __init__(self, driver):
         """Initialize the DatepickerPage object"""
         super().__init__(driver)
@@ -53,7 +58,7 @@ class DatepickerPage(BasePage):
         Returns:
             DatepickerPage: Self reference for method chaining
         """
-        self.logger.info(f"Selecting date: {day}/{month}/{year}")
+        self.logger.info("Selecting date: %s/%s/%s", day, month, year)
         self.click(self.DATEPICKER_INPUT)
         
         # Navigate to the correct year and month
@@ -121,7 +126,7 @@ class DatepickerPage(BasePage):
         Returns:
             DatepickerPage: Self reference for method chaining
         """
-        self.logger.info(f"Entering date manually: {date_string}")
+        self.logger.info("Entering date manually: %s", date_string)
         input_element = self.wait_for_element_visible(self.DATEPICKER_INPUT)
         input_element.clear()
         input_element.send_keys(date_string)
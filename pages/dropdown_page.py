@@ -5,6 +5,9 @@ from pages.base_page import BasePage
 class DropdownPage(BasePage):
     """Page object for WebDriverUniversity Dropdown, Checkboxes & Radio Buttons page"""
     
+    # Page path relative to BASE_URL
+    PATH = "Dropdown-Checkboxes-RadioButtons/index.html"
+    
     # Dropdown Locators
     DROPDOWN_MENU_1 = (By.ID, "dropdowm-menu-1")
     DROPDOWN_MENU_2 = (By.ID, "dropdowm-menu-2")
@@ -26,6 +29,9 @@ class DropdownPage(BasePage):
     RADIO_CABBAGE = (By.CSS_SELECTOR, "input[value='cabbage']")
     RADIO_PUMPKIN = (By.CSS_SELECTOR, "input[value='pumpkin']")
     
+    # Readiness contract: elements the page must have interactable before it is used
+    READY_WHEN = (DROPDOWN_MENU_1,)
+    
     def __init__(self, driver):
         """Initialize the DropdownPage object"""
         super().__init__(driver)
@@ -4,10 +4,16 @@ from pages.base_page import BasePage
 class FileUploadPage(BasePage):
     """Page object for WebDriverUniversity File Upload page"""
     
+    # Page path relative to BASE_URL
+    PATH = "File-Upload/index.html"
+    
     # Locators
     FILE_UPLOAD_INPUT = (By.ID, "myFile")
     SUBMIT_BUTTON = (By.ID, "submit-button")
     
+    # Readiness contract: elements the page must have interactable before it is used
+    READY_WHEN = (FILE_UPLOAD_INPUT, SUBMIT_BUTTON)
+    
     def __init__(self, driver):
         """Initialize the FileUploadPage object"""
         super().__init__(driver)
@@ -22,7 +28,7 @@ class FileUploadPage(BasePage):
         Returns:
             FileUploadPage: Self reference for method chaining
         """
-        self.logger.info(f"Uploading file: {file_path}")
+        self.logger.info("Uploading file: %s", file_path)
         upload_input = self.wait_for_element_visible(self.FILE_UPLOAD_INPUT)
         upload_input.send_keys(file_path)
         return self
@@ -1,12 +1,13 @@
+import importlib
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
-from config.config import BASE_URL
+from config import config
 
 class HomePage(BasePage):
     """Page object for the WebDriverUniversity homepage"""
     
-    # URL
-    URL = BASE_URL
+    # Page path relative to BASE_URL
+    PATH = ""
     
     # Locators
     CONTACT_US_LINK = (By.CSS_SELECTOR, "#contact-us")
@@ -26,47 +27,68 @@ class HomePage(BasePage):
     FILE_UPLOAD_LINK = (By.CSS_SELECTOR, "#file-upload")
     DATEPICKER_LINK = (By.CSS_SELECTOR, "#datepicker")
     
+    # Routing table: page name -> (homepage link, page object module, page object class).
+    # Page objects are imported on navigation so pages without one only fail when used.
+    ROUTES = {
+        "contact_us": (CONTACT_US_LINK, "pages.contact_us_page", "ContactUsPage"),
+        "login_portal": (LOGIN_PORTAL_LINK, "pages.login_page", "LoginPage"),
+        "button_clicks": (BUTTON_CLICKS_LINK, "pages.button_clicks_page", "ButtonClicksPage"),
+        "to_do_list": (TO_DO_LIST_LINK, "pages.todo_list_page", "TodoListPage"),
+        "dropdown": (DROPDOWN_LINK, "pages.dropdown_page", "DropdownPage"),
+        "actions": (ACTIONS_LINK, "pages.actions_page", "ActionsPage"),
+        "popup_alerts": (POPUP_ALERTS_LINK, "pages.popup_alerts_page", "PopupAlertsPage"),
+        "ajax_loader": (AJAX_LOADER_LINK, "pages.ajax_loader_page", "AjaxLoaderPage"),
+        "accordion": (ACCORDION_LINK, "pages.accordion_page", "AccordionPage"),
+        "file_upload": (FILE_UPLOAD_LINK, "pages.file_upload_page", "FileUploadPage"),
+        "datepicker": (DATEPICKER_LINK, "pages.datepicker_page", "DatepickerPage"),
+        "iframe": (IFRAME_LINK, "pages.iframe_page", "IframePage")
+    }
+    
+    # Readiness contract: elements the page must have interactable before it is used
+    READY_WHEN = (CONTACT_US_LINK,)
+    
     def __init__(self, driver):
         """Initialize the HomePage object"""
         super().__init__(driver)
     
-    def open(self):
-        """Open the homepage"""
-        self.navigate_to(self.URL)
-        return self
-    
-    def click_contact_us(self):
+    def navigate(self, name, mode=None):
         """
-        Click on the Contact Us link
+        Navigate to a page listed in the routing table
         
+        Args:
+            name: Route name (see ROUTES)
+            mode: "direct" to load the page URL in the current tab, "click" to open it
+                  from the homepage link in a new tab, None to use NAVIGATION_MODE from config
+            
         Returns:
-            ContactUsPage: The Contact Us page
+            BasePage: Page object of the destination page
         """
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.CONTACT_US_LINK)
+        if name not in self.ROUTES:
+            raise ValueError(f"Unknown page '{name}'. Available pages: {', '.join(self.ROUTES)}")
+        link, module_name, class_name = self.ROUTES[name]
+        page_class = getattr(importlib.import_module(module_name), class_name)
+        page = page_class(self.driver)
+        
+        mode = mode or config.NAVIGATION_MODE
+        if mode == "direct":
+            page.open()
+        elif mode == "click":
+            self._open_link_in_new_tab(link)
+            page.wait_until_ready()
+        else:
+            raise ValueError(f"Unsupported navigation mode: {mode}")
+        return page
+    
+    def _open_link_in_new_tab(self, link):
+        """
+        Click a homepage link that opens in a new tab and switch to that tab
         
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
+        Args:
+            link: (by, value) tuple of the link
+        """
+        if self.driver.current_url.rstrip("/") != self.url.rstrip("/"):
+            self.open()
         
-        from pages.contact_us_page import ContactUsPage
-        return ContactUsPage(self.driver)
-    
-    def click_login_portal(self):
-        """Click on the Login Portal link"""
         # Store the original window handle
         original_window = self.driver.current_window_handle
         
@@ -79,285 +101,85 @@ class HomePage(BasePage):
             self.driver.switch_to.window(original_window)
         
         # Click the link
-        self.click(self.LOGIN_PORTAL_LINK)
+        self.click(link)
         
         # Switch to the new window
         for handle in self.driver.window_handles:
             if handle != original_window:
                 self.driver.switch_to.window(handle)
                 break
-                
-        from pages.login_page import LoginPage
-        return LoginPage(self.driver)
+    
+    def click_contact_us(self):
+        """Navigate to the Contact Us page"""
+        return self.navigate("contact_us")
+    
+    def click_login_portal(self):
+        """Navigate to the Login Portal page"""
+        return self.navigate("login_portal")
     
     def click_button_clicks(self):
-        """Click on the Button Clicks link"""
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.BUTTON_CLICKS_LINK)
-        
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
-        
-        from pages.button_clicks_page import ButtonClicksPage
-        return ButtonClicksPage(self.driver)
+        """Navigate to the Button Clicks page"""
+        return self.navigate("button_clicks")
     
     def click_to_do_list(self):
-        """Click on the To Do List link"""
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.TO_DO_LIST_LINK)
-        
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
-        
-        from pages.todo_list_page import TodoListPage
-        return TodoListPage(self.driver)
+        """Navigate to the To Do List page"""
+        return self.navigate("to_do_list")
     
     def click_dropdown_checkboxes_radiobuttons(self):
-        """Click on the Dropdown, Checkboxes, Radiobuttons link"""
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.DROPDOWN_LINK)
-        
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
-        
-        from pages.dropdown_page import DropdownPage
-        return DropdownPage(self.driver)
+        """Navigate to the Dropdown, Checkboxes, Radiobuttons page"""
+        return self.navigate("dropdown")
     
     def click_actions(self):
-        """Click on the Actions link"""
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.ACTIONS_LINK)
-        
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
-        
-        from pages.actions_page import ActionsPage
-        return ActionsPage(self.driver)
+        """Navigate to the Actions page"""
+        return self.navigate("actions")
     
     def click_popup_alerts(self):
-        """Click on the Popup & Alerts link"""
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.POPUP_ALERTS_LINK)
-        
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
-        
-        from pages.popup_alerts_page import PopupAlertsPage
-        return PopupAlertsPage(self.driver)
+        """Navigate to the Popup & Alerts page"""
+        return self.navigate("popup_alerts")
     
     def click_ajax_loader(self):
-        """Click on the Ajax Loader link"""
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.AJAX_LOADER_LINK)
-        
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
-        
-        from pages.ajax_loader_page import AjaxLoaderPage
-        return AjaxLoaderPage(self.driver)
+        """Navigate to the Ajax Loader page"""
+        return self.navigate("ajax_loader")
     
     def click_accordion(self):
-        """Click on the Accordion link"""
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.ACCORDION_LINK)
-        
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
-        
-        from pages.accordion_page import AccordionPage
-        return AccordionPage(self.driver)
+        """Navigate to the Accordion page"""
+        return self.navigate("accordion")
     
     def click_file_upload(self):
-        """Click on the File Upload link"""
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.FILE_UPLOAD_LINK)
-        
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
-        
-        from pages.file_upload_page import FileUploadPage
-        return FileUploadPage(self.driver)
+        """Navigate to the File Upload page"""
+        return self.navigate("file_upload")
     
     def click_datepicker(self):
-        """Click on the Datepicker link"""
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.DATEPICKER_LINK)
-        
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
-        
-        from pages.datepicker_page import DatepickerPage
-        return DatepickerPage(self.driver)
+        """Navigate to the Datepicker page"""
+        return self.navigate("datepicker")
     
     def click_iframe(self):
-        """Click on the IFrame link"""
-        # Store the original window handle
-        original_window = self.driver.current_window_handle
-        
-        # Close any other windows except the original one
-        if len(self.driver.window_handles) > 1:
-            for handle in self.driver.window_handles:
-                if handle != original_window:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
-            self.driver.switch_to.window(original_window)
-        
-        # Click the link
-        self.click(self.IFRAME_LINK)
-        
-        # Switch to the new window
-        for handle in self.driver.window_handles:
-            if handle != original_window:
-                self.driver.switch_to.window(handle)
-                break
-        
-        from pages.iframe_page import IframePage
-        return IframePage(self.driver)
+        """Navigate to the IFrame page"""
+        return self.navigate("iframe")
     
     def get_all_links(self):
-        """Get all links on the homepage"""
-        links = {
-            'contact_us': self.is_element_displayed(self.CONTACT_US_LINK),
-            'login_portal': self.is_element_displayed(self.LOGIN_PORTAL_LINK),
-            'button_clicks': self.is_element_displayed(self.BUTTON_CLICKS_LINK),
-            'to_do_list': self.is_element_displayed(self.TO_DO_LIST_LINK),
-            'page_object_model': self.is_element_displayed(self.PAGE_OBJECT_MODEL_LINK),
-            'accordion': self.is_element_displayed(self.ACCORDION_LINK),
-            'dropdown': self.is_element_displayed(self.DROPDOWN_LINK),
-            'ajax_loader': self.is_element_displayed(self.AJAX_LOADER_LINK),
-            'actions': self.is_element_displayed(self.ACTIONS_LINK),
-            'scrolling': self.is_element_displayed(self.SCROLLING_LINK),
-            'popup_alerts': self.is_element_displayed(self.POPUP_ALERTS_LINK),
-            'iframe': self.is_element_displayed(self.IFRAME_LINK),
-            'hidden_elements': self.is_element_displayed(self.HIDDEN_ELEMENTS_LINK),
-            'data_table': self.is_element_displayed(self.DATA_TABLE_LINK),
-            'file_upload': self.is_element_displayed(self.FILE_UPLOAD_LINK),
-            'datepicker': self.is_element_displayed(self.DATEPICKER_LINK)
-        }
-        return links 
\ No newline at end of file
+        """
+        Get the display state of all links on the homepage
+        
+        Returns:
+            dict: Link name to True if the link is displayed, False otherwise
+        """
+        states = self.batch_query({
+            'contact_us': self.CONTACT_US_LINK,
+            'login_portal': self.LOGIN_PORTAL_LINK,
+            'button_clicks': self.BUTTON_CLICKS_LINK,
+            'to_do_list': self.TO_DO_LIST_LINK,
+            'page_object_model': self.PAGE_OBJECT_MODEL_LINK,
+            'accordion': self.ACCORDION_LINK,
+            'dropdown': self.DROPDOWN_LINK,
+            'ajax_loader': self.AJAX_LOADER_LINK,
+            'actions': self.ACTIONS_LINK,
+            'scrolling': self.SCROLLING_LINK,
+            'popup_alerts': self.POPUP_ALERTS_LINK,
+            'iframe': self.IFRAME_LINK,
+            'hidden_elements': self.HIDDEN_ELEMENTS_LINK,
+            'data_table': self.DATA_TABLE_LINK,
+            'file_upload': self.FILE_UPLOAD_LINK,
+            'datepicker': self.DATEPICKER_LINK
+        })
+        return {name: state['visible'] for name, state in states.items()}
@@ -4,11 +4,17 @@ from pages.base_page import BasePage
 class LoginPage(BasePage):
     """Page object for the WebDriverUniversity Login Portal page"""
     
+    # Page path relative to BASE_URL
+    PATH = "Login-Portal/index.html"
+    
     # Locators
     USERNAME_FIELD = (By.CSS_SELECTOR, "#text")
     PASSWORD_FIELD = (By.CSS_SELECTOR, "#password")
     LOGIN_BUTTON = (By.CSS_SELECTOR, "#login-button")
     
+    # Readiness contract: elements the page must have interactable before it is used
+    READY_WHEN = (USERNAME_FIELD, PASSWORD_FIELD, LOGIN_BUTTON)
+    
     def __init__(self, driver):
         """Initialize the LoginPage object"""
         super().__init__(driver)
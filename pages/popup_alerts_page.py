@@ -1,11 +1,12 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from pages.base_page import BasePage
 
 class PopupAlertsPage(BasePage):
     """Page object for WebDriverUniversity Popup & Alerts page"""
     
+    # Page path relative to BASE_URL
+    PATH = "Popup-Alerts/index.html"
+    
     # Locators
     JAVASCRIPT_ALERT_BUTTON = (By.ID, "button1")
     MODAL_POPUP_BUTTON = (By.ID, "button2")
@@ -22,6 +23,9 @@ class PopupAlertsPage(BasePage):
     AJAX_LOADED_TEXT = (By.CSS_SELECTOR, "div.modal-body p")
     AJAX_CLOSE_BUTTON = (By.CSS_SELECTOR, ".modal-footer .btn-default")
     
+    # Readiness contract: elements the page must have interactable before it is used
+    READY_WHEN = (JAVASCRIPT_ALERT_BUTTON,)
+    
     def __init__(self, driver):
         """Initialize the PopupAlertsPage object"""
         super().__init__(driver)
@@ -105,9 +109,7 @@ class PopupAlertsPage(BasePage):
         self.wait_for_element_visible(self.AJAX_SPINNER)
         
         # Then wait for it to disappear and content to load
-        WebDriverWait(self.driver, 20).until(
-            EC.visibility_of_element_located(self.AJAX_LOADED_TEXT)
-        )
+        self.wait_for_element_visible(self.AJAX_LOADED_TEXT)
         return self
     
     def get_ajax_loaded_text(self):
@@ -1,11 +1,13 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from pages.base_page import BasePage
-import time
 
 class TodoListPage(BasePage):
     """Page object for WebDriverUniversity Todo List page"""
     
+    # Page path relative to BASE_URL
+    PATH = "To-Do-List/index.html"
+    
     # Locators
     TODO_ITEMS = (By.CSS_SELECTOR, "ul li")
     ADD_NEW_TODO_INPUT = (By.XPATH, "//input[@placeholder='Add new todo']")
@@ -13,6 +15,9 @@ class TodoListPage(BasePage):
     TODO_ITEM_DELETE = lambda self, item_text: (By.XPATH, f"//li[contains(text(), '{item_text}')]/span/i")
     HIDDEN_TODOS = (By.CSS_SELECTOR, "ul li.completed")
     
+    # Readiness contract: elements the page must have interactable before it is used
+    READY_WHEN = (ADD_NEW_TODO_INPUT,)
+    
     def __init__(self, driver):
         """Initialize the TodoListPage object"""
         super().__init__(driver)
@@ -25,10 +30,10 @@ class TodoListPage(BasePage):
             list: List of todo items
         """
         self.logger.info("Getting all todo items")
-        # Allow some time for the page to fully load
-        time.sleep(1)
-        elements = self.wait_for_elements_visible(self.TODO_ITEMS)
-        return [element.text for element in elements]
+        self.wait_for_elements_visible(self.TODO_ITEMS)
+        # Read every item's text in one call instead of one request per element
+        items = self.batch_query({'items': self.TODO_ITEMS}, all_matches=True)['items']
+        return [item['text'] for item in items]
     
     def add_todo_item(self, text):
         """
@@ -40,13 +45,14 @@ class TodoListPage(BasePage):
         Returns:
             TodoListPage: Self reference for method chaining
         """
-        self.logger.info(f"Adding todo item: {text}")
+        self.logger.info("Adding todo item: %s", text)
+        item_count = len(self.find_elements_now(self.TODO_ITEMS))
         input_field = self.wait_for_element_visible(self.ADD_NEW_TODO_INPUT)
         input_field.clear()
         input_field.send_keys(text)
         input_field.send_keys(Keys.RETURN)
-        # Allow some time for the item to be added
-        time.sleep(1)
+        # Wait for the new item to be appended to the list
+        self.wait_for_element_count_change(self.TODO_ITEMS, item_count)
         return self
     
     def mark_todo_as_complete(self, item_text):
@@ -59,11 +65,12 @@ class TodoListPage(BasePage):
         Returns:
             TodoListPage: Self reference for method chaining
         """
-        self.logger.info(f"Marking todo item as complete: {item_text}")
+        self.logger.info("Marking todo item as complete: %s", item_text)
         item = self.wait_for_element_clickable(self.TODO_ITEM_TEXT(item_text))
+        was_completed = "completed" in (item.get_attribute("class") or "").split()
         item.click()
-        # Allow some time for the state to change
-        time.sleep(1)
+        # Clicking toggles the completed class
+        self.wait_for_class(self.TODO_ITEM_TEXT(item_text), "completed", present=not was_completed)
         return self
     
     def delete_todo_item(self, item_text):
@@ -76,7 +83,7 @@ class TodoListPage(BasePage):
         Returns:
             TodoListPage: Self reference for method chaining
         """
-        self.logger.info(f"Deleting todo item: {item_text}")
+        self.logger.info("Deleting todo item: %s", item_text)
         # First hover over the item to make the delete button visible
         item = self.wait_for_element_visible(self.TODO_ITEM_TEXT(item_text))
         
@@ -91,8 +98,8 @@ class TodoListPage(BasePage):
             delete_button = self.wait_for_element_clickable(self.TODO_ITEM_DELETE(item_text))
             delete_button.click()
         
-        # Allow some time for the item to be deleted
-        time.sleep(1)
+        # Wait for the item to fade out and be removed from the list
+        self.wait_for_staleness(item)
         return self
     
     def is_todo_item_present(self, item_text):
@@ -105,11 +112,9 @@ class TodoListPage(BasePage):
         Returns:
             bool: True if the item is present, False otherwise
         """
-        self.logger.info(f"Checking if todo item is present: {item_text}")
-        # Allow some time for the page to update
-        time.sleep(1)
+        self.logger.info("Checking if todo item is present: %s", item_text)
         try:
-            elements = self.driver.find_elements(By.XPATH, f"//li[contains(text(), '{item_text}')]")
+            elements = self.find_elements_now(self.TODO_ITEM_TEXT(item_text))
             return len(elements) > 0
         except:
             return False
@@ -124,7 +129,7 @@ class TodoListPage(BasePage):
         Returns:
             bool: True if the item is completed, False otherwise
         """
-        self.logger.info(f"Checking if todo item is completed: {item_text}")
+        self.logger.info("Checking if todo item is completed: %s", item_text)
         try:
             item = self.wait_for_element_visible(self.TODO_ITEM_TEXT(item_text))
             return "completed" in item.get_attribute("class")
@@ -140,7 +145,7 @@ class TodoListPage(BasePage):
         """
         self.logger.info("Getting count of completed items")
         try:
-            elements = self.driver.find_elements(*self.HIDDEN_TODOS)
+            elements = self.find_elements_now(self.HIDDEN_TODOS)
             return len(elements)
         except:
             return 0 
\ No newline at end of file
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import os
+import sys
+import argparse
+from config.config import BROWSER
+from utilities.parallel_runner import build_targets, run_parallel
+from utilities.cleanup_utils import run_cleanup
+from utilities.sleep_lint import check_no_sleeps
+from utilities.logger import start_logging
+
+def main():
+    """
+    Main function to parse command line arguments and run the tests in parallel
+    """
+    # -h is used for headless mode, so the default help flag is replaced by --help
+    parser = argparse.ArgumentParser(description='Run tests in parallel worker processes', add_help=False)
+    parser.add_argument('-a', '--all', action='store_true',
+                        help='Run all tests')
+    parser.add_argument('-t', '--test', default='',
+                        help='Run a specific test file')
+    parser.add_argument('-m', '--module', default='',
+                        help='Run tests in a specific module (contact_us, login, etc.)')
+    parser.add_argument('-c', '--case', default='',
+                        help='Run a specific test case (requires -m)')
+    parser.add_argument('-b', '--browser', default=BROWSER,
+                        help=f'Specify browser (chrome, firefox, edge) (default: {BROWSER})')
+    parser.add_argument('-h', '--headless', action='store_true',
+                        help='Run in headless mode')
+    parser.add_argument('--mirror', action='store_true',
+                        help='Serve the pages under test from the local offline mirror')
+    parser.add_argument('--linked-report', action='store_true',
+                        help='Stream the shard reports to disk and keep screenshots next to them')
+    parser.add_argument('-n', '--workers', type=int, default=4,
+                        help='Number of worker processes (default: 4)')
+    parser.add_argument('--no-cleanup', action='store_true',
+                        help='Skip cleanup of old reports and screenshots')
+    parser.add_argument('--help', action='help',
+                        help='Display this help message')
+    
+    args = parser.parse_args()
+    
+    try:
+        targets, test_case = build_targets(args.all, args.test, args.module, args.case)
+    except ValueError as e:
+        parser.print_help()
+        print(f"\nError: {e}")
+        return 1
+    
+    # Page objects must synchronize on page state, not fixed sleeps
+    if not check_no_sleeps():
+        return 1
+    
+    # Every worker inherits the setting and starts its own mirror server
+    if args.mirror:
+        os.environ["USE_MIRROR"] = "1"
+    if args.linked_report:
+        os.environ["REPORT_MODE"] = "linked"
+    
+    start_logging()
+    
+    exit_code, report_path = run_parallel(
+        targets,
+        test_case=test_case,
+        workers=max(args.workers, 1),
+        browser=args.browser,
+        headless=args.headless
+    )
+    
+    if report_path:
+        print(f"Report saved to: {report_path}")
+    
+    if not args.no_cleanup:
+        run_cleanup(screenshot_option="match_reports")
+    
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,8 @@ function show_help {
     echo "  -c, --case TEST_CASE       Run a specific test case (requires -m)"
     echo "  -b, --browser BROWSER      Specify browser (chrome, firefox, edge)"
     echo "  -h, --headless             Run in headless mode"
+    echo "  --mirror                   Serve the pages under test from the local offline mirror"
+    echo "  --linked-report            Stream the report to disk and keep screenshots next to it"
     echo "  --no-cleanup               Skip cleanup of old reports and screenshots"
     echo "  --help                     Display this help message"
     echo ""
@@ -42,6 +44,8 @@ MODULE=""
 TEST_CASE=""
 BROWSER="chrome"
 HEADLESS=false
+MIRROR=false
+LINKED_REPORT=false
 CLEANUP=true
 
 # Parse command line arguments
@@ -71,6 +75,14 @@ while [[ $# -gt 0 ]]; do
             HEADLESS=true
             shift
             ;;
+        --mirror)
+            MIRROR=true
+            shift
+            ;;
+        --linked-report)
+            LINKED_REPORT=true
+            shift
+            ;;
         --no-cleanup)
             CLEANUP=false
             shift
@@ -99,6 +111,12 @@ if [[ "$ALL_TESTS" == "false" && "$TEST_FILE" == "" && "$MODULE" == "" ]]; then
     exit 1
 fi
 
+# Page objects must synchronize on page state, not fixed sleeps
+if ! python3 -m utilities.sleep_lint; then
+    echo -e "${RED}Error: Fixed sleeps found in page objects${NC}"
+    exit 1
+fi
+
 # Set up headless argument if needed
 HEADLESS_ARG=""
 if [[ "$HEADLESS" == "true" ]]; then
@@ -116,6 +134,16 @@ if [[ "$HEADLESS" == "true" ]]; then
     PYTEST_CMD="$PYTEST_CMD --headless=true"
 fi
 
+# Add mirror parameter if needed
+if [[ "$MIRROR" == "true" ]]; then
+    PYTEST_CMD="$PYTEST_CMD --mirror"
+fi
+
+# Add report mode parameter if needed
+if [[ "$LINKED_REPORT" == "true" ]]; then
+    PYTEST_CMD="$PYTEST_CMD --report-mode=linked"
+fi
+
 # Add tests to run
 if [[ "$ALL_TESTS" == "true" ]]; then
     PYTEST_CMD="$PYTEST_CMD tests/test_cases/"
@@ -165,13 +193,13 @@ elif [[ "$MODULE" != "" ]]; then
     fi
 fi
 
-# Add HTML report parameter
-TIMESTAMP=$(date +"%Y-%m-%d_%H-%M-%S")
-REPORT_NAME="test_report_$TIMESTAMP.html"
-PYTEST_CMD="$PYTEST_CMD -v --html=reports/$REPORT_NAME --self-contained-html"
+# Mint the run id; the report, logs and screenshot manifests of the run go to reports/<run id>/
+export RUN_ID="$(date +"%Y-%m-%d_%H-%M-%S")_$$"
+REPORT_PATH="reports/$RUN_ID/report.html"
+PYTEST_CMD="$PYTEST_CMD -v --html=$REPORT_PATH --self-contained-html"
 
-# Create reports directory if it doesn't exist
-mkdir -p reports
+# Create the run directory
+mkdir -p "reports/$RUN_ID"
 
 # Display the command
 echo -e "${BLUE}Executing:${NC} $PYTEST_CMD"
@@ -187,12 +215,12 @@ else
     echo -e "${RED}Tests completed with failures!${NC}"
 fi
 
-echo -e "${BLUE}Report saved to:${NC} reports/$REPORT_NAME"
-echo -e "${BLUE}Full path:${NC} $(pwd)/reports/$REPORT_NAME"
+echo -e "${BLUE}Report saved to:${NC} $REPORT_PATH"
+echo -e "${BLUE}Full path:${NC} $(pwd)/$REPORT_PATH"
 
 # Run cleanup if enabled
 if [[ "$CLEANUP" == "true" ]]; then
-    echo -e "${BLUE}Running cleanup to keep last 5 reports and organize screenshots...${NC}"
+    echo -e "${BLUE}Running cleanup to keep the last 5 runs and their screenshots...${NC}"
     python3 cleanup.py --screenshots match_reports
 fi
 
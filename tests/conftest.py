@@ -1,59 +1,130 @@
 import pytest
 import os
+from urllib3.exceptions import HTTPError
 from datetime import datetime
 from selenium import webdriver
-from config.config import BROWSER, REPORTS_DIR, REPORT_NAME
-from utilities.driver_factory import DriverFactory
-from utilities.logger import setup_logger
-from py.xml import html
+from selenium.common.exceptions import InvalidSessionIdException
+from config import config
+from config.config import BROWSER, RUN_ID, RUN_DIR, REPORT_NAME, REPORT_MODE, USE_MIRROR, FAILURE_SCREENSHOT_MODE, ISOLATION_MODE
+from utilities.driver_pool import DriverPool, ISOLATION_MODES
+from utilities.mirror_server import MirrorServer
+from utilities.linked_report import LinkedReport
+from utilities.circuit_breaker import CircuitBreaker
+from utilities.artifact_catalog import ArtifactCatalog, REPORT, FAILURE, directory_size
+from utilities.logger import setup_logger, start_logging
+from utilities.wait_policy import get_wait_stats, write_wait_report
+from utilities.screenshot_pipeline import flush_pipeline
+from utilities.screenshot_utils import capture_screenshot, embed_previews, PREVIEW_PLACEHOLDER
 
 # Set up logger
 logger = setup_logger("TestSetup")
 
+# Key for sharing driver pool counters with the terminal summary
+pool_stats_key = pytest.StashKey[dict]()
+
+# Key for sharing screenshot pipeline counters with the terminal summary
+screenshot_stats_key = pytest.StashKey[dict]()
+
+# Key for the report written in "linked" report mode
+linked_report_key = pytest.StashKey[LinkedReport]()
+
+# Key for the preview placeholders of the self-contained report and the files they stand for
+pending_previews_key = pytest.StashKey[dict]()
+
+# Key for the node ids of the failed tests, recorded so retention can keep failed runs
+failed_tests_key = pytest.StashKey[list]()
+
+# Key marking a test whose browser looked dead or hung, so the pool checks it on release
+browser_suspect_key = pytest.StashKey[bool]()
+
+# Key for the circuit breaker that fails the remaining tests when the environment is broken
+circuit_breaker_key = pytest.StashKey[CircuitBreaker]()
+
 def pytest_addoption(parser):
     """Add command line options for pytest"""
     parser.addoption("--browser-name", action="store", default=BROWSER,
                      help="Browser to run tests on: chrome, firefox, or edge")
     parser.addoption("--headless", action="store_true", default=False,
                      help="Run browser in headless mode")
+    parser.addoption("--mirror", action="store_true", default=USE_MIRROR,
+                     help="Serve the pages under test from the local offline mirror")
+    parser.addoption("--report-mode", action="store", default=REPORT_MODE, choices=["self_contained", "linked"],
+                     help="self_contained inlines screenshots in one HTML file, linked streams rows to disk "
+                          "and keeps screenshots in a directory next to the report")
+    parser.addoption("--isolation", action="store", default=ISOLATION_MODE, choices=ISOLATION_MODES,
+                     help="How tests are isolated from each other: reset the pooled browser, open a new "
+                          "browser context (Chromium) or restart the browser")
+
+@pytest.fixture(scope="session", autouse=True)
+def mirror_server(request):
+    """
+    Fixture to serve the pages under test from the local offline mirror
+    
+    Args:
+        request: Pytest request object
+        
+    Returns:
+        MirrorServer: Running server, or None when the live site is used
+    """
+    if not request.config.getoption("--mirror"):
+        yield None
+        return
+    
+    # Point every page object at the local server for the session
+    server = MirrorServer().start()
+    live_url = config.BASE_URL
+    config.BASE_URL = server.url
+    logger.info(f"Using offline mirror at {server.url} instead of {live_url}")
+    
+    yield server
+    
+    config.BASE_URL = live_url
+    server.stop()
 
 @pytest.fixture(scope="session")
-def driver_init(request):
+def driver_pool(request):
     """
-    Fixture to initialize WebDriver for the test session
+    Fixture to warm a pool of WebDriver instances for the test session
     
     Args:
         request: Pytest request object
         
     Returns:
-        WebDriver: WebDriver instance
+        DriverPool: Pool leasing browsers to individual tests
     """
     browser = request.config.getoption("--browser-name")
-    logger.info(f"Starting test session with {browser} browser")
+    headless = request.config.getoption("--headless") or None
+    isolation = request.config.getoption("--isolation")
+    logger.info(f"Starting test session with {browser} browser, isolating tests by {isolation}")
     
-    # Initialize the driver
-    driver = DriverFactory.get_driver(browser)
+    # Pre-spawn the browsers
+    pool = DriverPool(browser, headless=headless, isolation=isolation).start()
     
-    # Yield driver to the test
-    yield driver
+    # Yield pool to the tests
+    yield pool
     
-    # Quit the driver after the test
-    logger.info("Closing browser after test session")
-    driver.quit()
+    # Record the pool counters and quit the browsers
+    stats = pool.get_stats()
+    request.config.stash[pool_stats_key] = stats
+    logger.info(f"Driver pool stats: {stats}")
+    logger.info("Closing browsers after test session")
+    pool.shutdown()
 
 @pytest.fixture
-def driver(driver_init, request):
+def driver(driver_pool, request):
     """
-    Fixture to get WebDriver for a single test
+    Fixture to lease a WebDriver for a single test
     
     Args:
-        driver_init: Session-scoped WebDriver
+        driver_pool: Session-scoped DriverPool
         request: Pytest request object
         
     Returns:
         WebDriver: WebDriver instance
     """
-    driver = driver_init
+    # Tests marked full_render (e.g. screenshot comparisons) load every resource
+    driver = driver_pool.lease(full_render=request.node.get_closest_marker("full_render") is not None)
+    record_browser_events(request.node, "setup", driver_pool.drain_events())
     
     # Set up test name for logging
     test_name = request.node.name
@@ -62,18 +133,152 @@ def driver(driver_init, request):
     # Return driver to the test
     yield driver
     
-    # Log after test
-    logger.info(f"Finished test: {test_name}")
+    # Isolate the browser from the next test and return it to the pool; the time that
+    # took, including opening the test's browser context, ends up in the JUnit XML
+    isolation_seconds = driver_pool.release(driver, suspect=request.node.stash.get(browser_suspect_key, False))
+    record_browser_events(request.node, "teardown", driver_pool.drain_events())
+    request.node.user_properties.append(("isolation_ms", round(isolation_seconds * 1000)))
+    logger.info(f"Finished test: {test_name} (isolation overhead {isolation_seconds * 1000:.0f}ms)")
 
+def record_browser_events(item, when, events):
+    """
+    Add browsers the pool found dead or hung and respawned to the test's report
+    
+    Args:
+        item: Test item
+        when: Test phase the events happened in
+        events: Event descriptions from DriverPool.drain_events()
+    """
+    if not events:
+        return
+    item.add_report_section(when, "browser watchdog", "\n".join(events))
+    item.user_properties.append(("browser_respawns", len(events)))
+
+@pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
-    """Configure pytest with report settings"""
-    # Create reports directory if it doesn't exist
-    if not os.path.exists(REPORTS_DIR):
-        os.makedirs(REPORTS_DIR)
+    """Register this session's run and configure pytest with report settings"""
+    config.addinivalue_line("markers", "full_render: load every resource, ignoring the resource blocking profile")
+    
+    # Everything this session writes goes to the run directory; processes started from
+    # the session (and workers started by a runner that minted the id) share the run
+    os.environ["RUN_ID"] = RUN_ID
+    # Collecting tests is not a run and leaves nothing behind
+    if not config.option.collectonly:
+        start_logging()
+        os.makedirs(RUN_DIR, exist_ok=True)
+        ArtifactCatalog().add_run(RUN_ID, RUN_DIR)
+    
+    # Configure HTML report unless a path was given explicitly (e.g. by the parallel runner)
+    # or tests are only being collected
+    if not getattr(config.option, "htmlpath", None) and not config.option.collectonly:
+        config.option.htmlpath = os.path.join(RUN_DIR, REPORT_NAME)
+    
+    if config.getoption("report_mode") == "linked" and config.option.htmlpath:
+        # Take the report over from pytest-html, which builds the whole document at session end
+        linked_report = LinkedReport(config.option.htmlpath)
+        linked_report.open()
+        config.stash[linked_report_key] = linked_report
+        config.pluginmanager.register(linked_report, "linked-report")
+        config.option.htmlpath = None
+    else:
+        config.option.self_contained_html = True
+    
+    config.stash[failed_tests_key] = []
+    config.stash[circuit_breaker_key] = CircuitBreaker()
+
+def pytest_runtest_setup(item):
+    """Fail the test without running it once the circuit breaker is open"""
+    breaker = item.config.stash.get(circuit_breaker_key, None)
+    if breaker and breaker.is_open:
+        breaker.skipped += 1
+        pytest.fail(breaker.reason, pytrace=False)
+
+def pytest_sessionfinish(session, exitstatus):
+    """Finish writing screenshots and write the time spent inside waits next to the HTML report"""
+    screenshot_stats = flush_pipeline()
+    if screenshot_stats:
+        session.config.stash[screenshot_stats_key] = screenshot_stats
+    
+    # Screenshots are written now, so they can be placed next to the linked report
+    linked_report = session.config.stash.get(linked_report_key, None)
+    if linked_report:
+        linked_report.close()
     
-    # Configure HTML report
-    config.option.htmlpath = os.path.join(REPORTS_DIR, REPORT_NAME)
-    config.option.self_contained_html = True
+    htmlpath = linked_report.path if linked_report else getattr(session.config.option, "htmlpath", None)
+    if session.config.option.collectonly or not htmlpath:
+        return
+    write_wait_report(f"{os.path.splitext(htmlpath)[0]}_waits.json")
+
+def pytest_unconfigure(config):
+    """Record the failed tests, run size and finished HTML report in the artifact catalog"""
+    if config.option.collectonly:
+        return
+    catalog = ArtifactCatalog()
+    failed_tests = config.stash.get(failed_tests_key, [])
+    if failed_tests:
+        catalog.add_many((RUN_ID, FAILURE, RUN_DIR, test_id, None, None) for test_id in dict.fromkeys(failed_tests))
+    
+    # pytest-html has written the report and the pipeline its previews, so they can be inlined
+    linked_report = config.stash.get(linked_report_key, None)
+    htmlpath = linked_report.path if linked_report else getattr(config.option, "htmlpath", None)
+    pending_previews = config.stash.get(pending_previews_key, None)
+    if pending_previews and htmlpath and os.path.exists(htmlpath):
+        embed_previews(htmlpath, pending_previews)
+    catalog.set_run_size(RUN_ID, directory_size(RUN_DIR))
+    
+    if not htmlpath or not os.path.exists(htmlpath):
+        return
+    # Shard reports of parallel runs are part of the run; the runner records the merged report
+    if os.path.dirname(os.path.abspath(htmlpath)) != os.path.abspath(RUN_DIR):
+        return
+    catalog.add(RUN_ID, REPORT, htmlpath, size=os.path.getsize(htmlpath))
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Print driver pool counters and wait time at the end of the session"""
+    stats = config.stash.get(pool_stats_key, None)
+    if stats:
+        terminalreporter.write_sep("-", "driver pool")
+        terminalreporter.write_line(
+            f"hits={stats['hits']} misses={stats['misses']} hit_rate={stats['hit_rate']:.0%} "
+            f"spawns={stats['spawns']} avg_spawn={stats['avg_spawn_ms']:.0f}ms "
+            f"resets={stats['resets']} avg_reset={stats['avg_reset_ms']:.0f}ms "
+            f"recycled={stats['recycled']} health_failures={stats['health_failures']} respawns={stats['respawns']}"
+        )
+        terminalreporter.write_line(
+            f"isolation={stats['isolation']} isolated={stats['isolations']} "
+            f"avg_isolation={stats['avg_isolation_ms']:.0f}ms total_isolation={stats['isolation_seconds']:.1f}s"
+        )
+        if "blocking" in stats:
+            terminalreporter.write_sep("-", "resource blocking")
+            terminalreporter.write_line(
+                f"profile={stats['blocking']} blocked_requests={stats['blocked_requests']} "
+                f"bytes_saved={stats['bytes_saved']} (estimated from unblocked loads; "
+                f"{stats['unknown_size_requests']} blocked request(s) of unknown size)"
+            )
+    
+    screenshot_stats = config.stash.get(screenshot_stats_key, None)
+    if screenshot_stats:
+        terminalreporter.write_sep("-", "screenshots")
+        terminalreporter.write_line(
+            f"captures={screenshot_stats['captures']} avg_capture={screenshot_stats['avg_capture_ms']:.0f}ms "
+            f"writes={screenshot_stats['writes']} avg_write={screenshot_stats['avg_write_ms']:.0f}ms (background) "
+            f"bytes={screenshot_stats['bytes']} failures={screenshot_stats['failures']}"
+        )
+    
+    breaker = config.stash.get(circuit_breaker_key, None)
+    if breaker and breaker.is_open:
+        terminalreporter.write_sep("-", "circuit breaker")
+        terminalreporter.write_line(breaker.reason)
+        terminalreporter.write_line(f"{breaker.skipped} remaining test(s) were failed without running")
+    
+    wait_stats = get_wait_stats()
+    if wait_stats["count"]:
+        terminalreporter.write_sep("-", "waits")
+        policy = "on" if wait_stats["single_timeout_waits"] else "off"
+        terminalreporter.write_line(
+            f"{wait_stats['seconds']:.1f}s spent in {wait_stats['count']} waits (single timeout policy {policy}, "
+            f"{wait_stats['implicit_wait_changes']} implicit wait commands)"
+        )
 
 def pytest_html_report_title(report):
     """Set the title of the HTML report"""
@@ -82,7 +287,7 @@ def pytest_html_report_title(report):
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
-    Add description to HTML report
+    Add description to HTML report and a screenshot when a test fails, and remember the failure
     
     Args:
         item: Test item
@@ -91,8 +296,58 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
     
+    # Count consecutive environmental failures; tests failed by the open breaker itself do not count
+    breaker = item.config.stash.get(circuit_breaker_key, None)
+    if breaker and report.when in ("setup", "call") and (report.when == "call" or report.failed):
+        breaker.record(item.nodeid, call.excinfo.value if report.failed and call.excinfo else None)
+    
+    # Remember failed tests (including setup and teardown errors) for the artifact catalog
+    if report.failed:
+        item.config.stash[failed_tests_key].append(item.nodeid)
+        # A command that timed out or lost its session points at a dead or hung browser
+        if call.excinfo is not None and call.excinfo.errisinstance((HTTPError, InvalidSessionIdException)):
+            item.stash[browser_suspect_key] = True
+    
     if report.when == "call":
         # Add test docstring to the report
         doc = getattr(item.function, "__doc__", None)
         if doc:
-            report.description = doc.strip() 
\ No newline at end of file
+            report.description = doc.strip()
+        
+        # No screenshot of a dead or hung browser, it would only wait out another timeout
+        driver = item.funcargs.get("driver")
+        if report.failed and driver is not None and not item.stash.get(browser_suspect_key, False):
+            try:
+                test_name = item.nodeid.replace("::", "_").replace("/", "_").replace(".py", "")
+                pytest_html = item.config.pluginmanager.getplugin("html")
+                linked_report = item.config.stash.get(linked_report_key, None)
+                preview_name = f"{test_name}.thumb.jpg"
+                # The screenshot pipeline writes the full image and a small preview in the background
+                if not pytest_html:
+                    preview_path = None
+                elif linked_report:
+                    preview_path = os.path.join(linked_report.artifacts_dir, preview_name)
+                else:
+                    # Scratch file, embedded into the self-contained report once it is written
+                    html_path = item.config.getoption("htmlpath", None)
+                    report_dir = os.path.dirname(os.path.abspath(html_path)) if html_path else RUN_DIR
+                    preview_path = os.path.join(RUN_DIR, "previews", preview_name)
+                screenshot_path, _ = capture_screenshot(driver, test_name, FAILURE_SCREENSHOT_MODE, preview_path=preview_path)
+                if pytest_html:
+                    if linked_report:
+                        # Both the preview and the full image are files next to the report
+                        link = linked_report.add_artifact(screenshot_path)
+                        preview = linked_report.artifact_href(preview_name)
+                    else:
+                        # The preview is a placeholder until the report is written, see pytest_unconfigure
+                        link = os.path.relpath(screenshot_path, report_dir).replace(os.sep, "/")
+                        pending_previews = item.config.stash.setdefault(pending_previews_key, {})
+                        preview = f"{PREVIEW_PLACEHOLDER}{len(pending_previews)}"
+                        pending_previews[preview] = preview_path
+                    extras = getattr(report, "extras", [])
+                    extras.append(pytest_html.extras.html(
+                        f'<a href="{link}" target="_blank"><img src="{preview}" alt="{test_name}"/></a>'
+                    ))
+                    report.extras = extras
+            except Exception as e:
+                logger.error(f"Failed to take screenshot: {e}") 
\ No newline at end of file
@@ -13,9 +13,8 @@ class TestAccordion:
         """Test that all accordion sections can be expanded and collapsed"""
         logger.info("Starting test_accordion_sections")
         
-        # Navigate to homepage and then to Accordion page
+        # Navigate to Accordion page
         home_page = HomePage(driver)
-        home_page.open()
         accordion_page = home_page.click_accordion()
         
         # Test Manual Testing section
@@ -12,9 +12,8 @@ class TestAjaxLoader:
         """Test that the Ajax loader works and the button becomes clickable after loading"""
         logger.info("Starting test_ajax_loader")
         
-        # Navigate to homepage and then to Ajax Loader page
+        # Navigate to Ajax Loader page
         home_page = HomePage(driver)
-        home_page.open()
         ajax_page = home_page.click_ajax_loader()
         
         # Wait for loader to disappear and click the button
@@ -12,9 +12,8 @@ class TestButtonClicks:
         """Test that clicking the simple button opens a modal"""
         logger.info("Starting test_simple_button_click")
         
-        # Navigate to homepage and then to Button Clicks page
+        # Navigate to Button Clicks page
         home_page = HomePage(driver)
-        home_page.open()
         button_page = home_page.click_button_clicks()
         
         # Click the simple button and verify the modal is displayed
@@ -29,14 +28,33 @@ class TestButtonClicks:
         
         logger.info("test_simple_button_click completed successfully")
     
+    def test_open_from_homepage_link(self, driver):
+        """Test that the homepage link opens a usable Button Clicks page in a new tab"""
+        logger.info("Starting test_open_from_homepage_link")
+        
+        # Open the page by clicking its homepage link instead of loading its URL
+        home_page = HomePage(driver)
+        home_page.open()
+        homepage_window = driver.current_window_handle
+        button_page = home_page.navigate("button_clicks", mode="click")
+        
+        assert driver.current_window_handle != homepage_window, "Button Clicks page should open in a new tab"
+        assert button_page.get_url().rstrip("/") == button_page.url.rstrip("/"), "Link should open the Button Clicks page"
+        
+        # The page is ready to use once navigate() returns
+        button_page.click_simple_button()
+        assert button_page.is_modal_displayed(), "Modal should be displayed after clicking simple button"
+        button_page.close_modal()
+        
+        logger.info("test_open_from_homepage_link completed successfully")
+    
     @pytest.mark.skip(reason="Button hover not working reliably in WebDriverUniversity")
     def test_hover_button(self, driver):
         """Test that hovering over the action move button works"""
         logger.info("Starting test_hover_button")
         
-        # Navigate to homepage and then to Button Clicks page
+        # Navigate to Button Clicks page
         home_page = HomePage(driver)
-        home_page.open()
         button_page = home_page.click_button_clicks()
         
         # Hover over the action move button and click
@@ -52,9 +70,8 @@ class TestButtonClicks:
         """Test clicking the action click button"""
         logger.info("Starting test_action_button_click")
         
-        # Navigate to homepage and then to Button Clicks page
+        # Navigate to Button Clicks page
         home_page = HomePage(driver)
-        home_page.open()
         button_page = home_page.click_button_clicks()
         
         # Click the action click button
@@ -69,9 +86,8 @@ class TestButtonClicks:
         """Test opening and closing multiple modals in sequence"""
         logger.info("Starting test_multiple_modals")
         
-        # Navigate to homepage and then to Button Clicks page
+        # Navigate to Button Clicks page
         home_page = HomePage(driver)
-        home_page.open()
         button_page = home_page.click_button_clicks()
         
         # Since this test is skipped, no test logic needed
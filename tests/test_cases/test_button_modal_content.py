@@ -9,9 +9,8 @@ def test_print_button_modal_content(driver):
     """Print the exact content of the button click modals"""
     logger.info("Starting test_print_button_modal_content")
     
-    # Navigate to homepage and then to Button Clicks page
+    # Navigate to Button Clicks page
     home_page = HomePage(driver)
-    home_page.open()
     button_page = home_page.click_button_clicks()
     
     # Test simple button
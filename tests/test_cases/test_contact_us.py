@@ -13,9 +13,8 @@ class TestContactUs:
         """Test that a user can successfully submit the contact form with valid data"""
         logger.info("Starting test_successful_submission")
         
-        # Navigate to the homepage and then to the Contact Us page
+        # Navigate to the Contact Us page
         home_page = HomePage(driver)
-        home_page.open()
         contact_page = home_page.click_contact_us()
         
         # Fill and submit the form
@@ -37,9 +36,8 @@ class TestContactUs:
         """Test that the reset button clears the form"""
         logger.info("Starting test_reset_form")
         
-        # Navigate to the homepage and then to the Contact Us page
+        # Navigate to the Contact Us page
         home_page = HomePage(driver)
-        home_page.open()
         contact_page = home_page.click_contact_us()
         
         # Fill the form and reset it
@@ -60,9 +58,8 @@ class TestContactUs:
         """Test form submission with missing email"""
         logger.info("Starting test_missing_email")
         
-        # Navigate to the homepage and then to the Contact Us page
+        # Navigate to the Contact Us page
         home_page = HomePage(driver)
-        home_page.open()
         contact_page = home_page.click_contact_us()
         
         # Fill and submit the form with missing email
@@ -83,9 +80,8 @@ class TestContactUs:
         """Test form submission with missing first name"""
         logger.info("Starting test_missing_first_name")
         
-        # Navigate to the homepage and then to the Contact Us page
+        # Navigate to the Contact Us page
         home_page = HomePage(driver)
-        home_page.open()
         contact_page = home_page.click_contact_us()
         
         # Fill and submit the form with missing first name
@@ -1,5 +1,4 @@
 import pytest
-import time
 from pages.home_page import HomePage
 from utilities.logger import setup_logger
 from datetime import datetime, timedelta
@@ -14,9 +13,8 @@ class TestDatepicker:
         """Test basic navigation in the datepicker"""
         logger.info("Starting test_datepicker_navigation")
         
-        # Navigate to homepage and then to Datepicker page
+        # Navigate to Datepicker page
         home_page = HomePage(driver)
-        home_page.open()
         datepicker_page = home_page.click_datepicker()
         
         # Open datepicker
@@ -30,11 +28,8 @@ class TestDatepicker:
         # Click the next button and verify the month changes
         datepicker_page.click(datepicker_page.NEXT_BUTTON)
         
-        # Wait a moment for the transition
-        time.sleep(1)
-        
-        # Get the new month/year
-        new_switch_text = datepicker_page.wait_for_element_visible(datepicker_page.DATEPICKER_SWITCH).text
+        # Wait for the transition and get the new month/year
+        new_switch_text = datepicker_page.wait_for_text_change(datepicker_page.DATEPICKER_SWITCH, switch_text).text
         logger.info(f"New datepicker month/year: {new_switch_text}")
         
         # Verify the month changed
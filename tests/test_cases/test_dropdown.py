@@ -12,9 +12,8 @@ class TestDropdown:
         """Test that a user can select values from dropdown menus"""
         logger.info("Starting test_select_dropdown_values")
         
-        # Navigate to homepage and then to Dropdown page
+        # Navigate to Dropdown page
         home_page = HomePage(driver)
-        home_page.open()
         dropdown_page = home_page.click_dropdown_checkboxes_radiobuttons()
         
         # Select values from dropdowns
@@ -33,9 +32,8 @@ class TestDropdown:
         """Test that a user can check and uncheck checkboxes"""
         logger.info("Starting test_checkbox_functionality")
         
-        # Navigate to homepage and then to Dropdown page
+        # Navigate to Dropdown page
         home_page = HomePage(driver)
-        home_page.open()
         dropdown_page = home_page.click_dropdown_checkboxes_radiobuttons()
         
         # Check and uncheck checkboxes
@@ -56,9 +54,8 @@ class TestDropdown:
         """Test that a user can select radio buttons"""
         logger.info("Starting test_radio_button_selection")
         
-        # Navigate to homepage and then to Dropdown page
+        # Navigate to Dropdown page
         home_page = HomePage(driver)
-        home_page.open()
         dropdown_page = home_page.click_dropdown_checkboxes_radiobuttons()
         
         # Select a radio button (blue instead of green)
@@ -76,9 +73,8 @@ class TestDropdown:
         """Test that some elements are disabled"""
         logger.info("Starting test_disabled_elements")
         
-        # Navigate to homepage and then to Dropdown page
+        # Navigate to Dropdown page
         home_page = HomePage(driver)
-        home_page.open()
         dropdown_page = home_page.click_dropdown_checkboxes_radiobuttons()
         
         # Verify the disabled radio buttons
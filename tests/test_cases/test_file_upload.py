@@ -22,9 +22,8 @@ class TestFileUpload:
             file_path = temp_file.name
             logger.info(f"Created temporary file: {file_path}")
             
-            # Navigate to homepage and then to File Upload page
+            # Navigate to File Upload page
             home_page = HomePage(driver)
-            home_page.open()
             file_upload_page = home_page.click_file_upload()
             
             # Upload the file and submit
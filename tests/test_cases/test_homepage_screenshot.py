@@ -2,11 +2,12 @@ import pytest
 import os
 from pages.home_page import HomePage
 from utilities.logger import setup_logger
-from utilities.screenshot_utils import take_screenshot
+from utilities.screenshot_utils import compare_screenshot
 
 # Set up logger for this test module
 logger = setup_logger("HomepageScreenshotTest")
 
+@pytest.mark.full_render
 def test_homepage_screenshot(driver):
     """Take a screenshot of the homepage to see what elements are available"""
     logger.info("Starting test_homepage_screenshot")
@@ -15,9 +16,10 @@ def test_homepage_screenshot(driver):
     home_page = HomePage(driver)
     home_page.open()
     
-    # Take a screenshot of the homepage using the utility
-    screenshot_path = take_screenshot(driver, "homepage")
-    logger.info(f"Saved homepage screenshot to {screenshot_path}")
+    # Take a screenshot of the homepage and compare it against the baseline
+    result = compare_screenshot(driver, "homepage")
+    logger.info(f"Saved homepage screenshot to {result['screenshot_path']}")
+    assert result["passed"], f"Homepage differs from its baseline: {result['reason']} (heat-map: {result['heatmap_path']})"
     
     # Log all available links
     available_links = home_page.get_all_links()
@@ -13,9 +13,8 @@ class TestLogin:
         """Test that a user can successfully login with valid credentials"""
         logger.info("Starting test_successful_login")
         
-        # Navigate to the homepage and then to the Login Portal page
+        # Navigate to the Login Portal page
         home_page = HomePage(driver)
-        home_page.open()
         login_page = home_page.click_login_portal()
         
         # Login with valid credentials
@@ -32,9 +31,8 @@ class TestLogin:
         """Test that a user cannot login with invalid credentials"""
         logger.info("Starting test_failed_login")
         
-        # Navigate to the homepage and then to the Login Portal page
+        # Navigate to the Login Portal page
         home_page = HomePage(driver)
-        home_page.open()
         login_page = home_page.click_login_portal()
         
         # Login with invalid credentials
@@ -51,9 +49,8 @@ class TestLogin:
         """Test that a user cannot login with empty credentials"""
         logger.info("Starting test_empty_credentials")
         
-        # Navigate to the homepage and then to the Login Portal page
+        # Navigate to the Login Portal page
         home_page = HomePage(driver)
-        home_page.open()
         login_page = home_page.click_login_portal()
         
         # Login with empty credentials
@@ -70,9 +67,8 @@ class TestLogin:
         """Test that a user cannot login with only a username"""
         logger.info("Starting test_username_only")
         
-        # Navigate to the homepage and then to the Login Portal page
+        # Navigate to the Login Portal page
         home_page = HomePage(driver)
-        home_page.open()
         login_page = home_page.click_login_portal()
         
         # Login with only username
@@ -89,9 +85,8 @@ class TestLogin:
         """Test that a user cannot login with only a password"""
         logger.info("Starting test_password_only")
         
-        # Navigate to the homepage and then to the Login Portal page
+        # Navigate to the Login Portal page
         home_page = HomePage(driver)
-        home_page.open()
         login_page = home_page.click_login_portal()
         
         # Login with only password
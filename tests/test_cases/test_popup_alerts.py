@@ -12,9 +12,8 @@ class TestPopupAlerts:
         """Test that a JavaScript alert can be handled"""
         logger.info("Starting test_javascript_alert")
         
-        # Navigate to homepage and then to Popup & Alerts page
+        # Navigate to Popup & Alerts page
         home_page = HomePage(driver)
-        home_page.open()
         popup_page = home_page.click_popup_alerts()
         
         # Click the JavaScript Alert button and accept the alert
@@ -27,9 +26,8 @@ class TestPopupAlerts:
         """Test that a modal popup can be displayed and closed"""
         logger.info("Starting test_modal_popup")
         
-        # Navigate to homepage and then to Popup & Alerts page
+        # Navigate to Popup & Alerts page
         home_page = HomePage(driver)
-        home_page.open()
         popup_page = home_page.click_popup_alerts()
         
         # Click the Modal Popup button and verify the modal
@@ -58,9 +56,8 @@ class TestPopupAlerts:
         """Test that a JavaScript confirm box can be accepted"""
         logger.info("Starting test_javascript_confirm_box_accept")
         
-        # Navigate to homepage and then to Popup & Alerts page
+        # Navigate to Popup & Alerts page
         home_page = HomePage(driver)
-        home_page.open()
         popup_page = home_page.click_popup_alerts()
         
         # Click the JavaScript Confirm Box button and accept
@@ -77,9 +74,8 @@ class TestPopupAlerts:
         """Test that a JavaScript confirm box can be dismissed"""
         logger.info("Starting test_javascript_confirm_box_dismiss")
         
-        # Navigate to homepage and then to Popup & Alerts page
+        # Navigate to Popup & Alerts page
         home_page = HomePage(driver)
-        home_page.open()
         popup_page = home_page.click_popup_alerts()
         
         # Click the JavaScript Confirm Box button and dismiss
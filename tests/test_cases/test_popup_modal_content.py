@@ -9,9 +9,8 @@ def test_print_modal_content(driver):
     """Print the exact content of the modal title and body"""
     logger.info("Starting test_print_modal_content")
     
-    # Navigate to homepage and then to Popup & Alerts page
+    # Navigate to Popup & Alerts page
     home_page = HomePage(driver)
-    home_page.open()
     popup_page = home_page.click_popup_alerts()
     
     # Click the Modal Popup button
@@ -12,9 +12,8 @@ class TestTodoList:
         """Test that a new todo item can be added"""
         logger.info("Starting test_add_todo_item")
         
-        # Navigate to homepage and then to Todo List page
+        # Navigate to Todo List page
         home_page = HomePage(driver)
-        home_page.open()
         todo_page = home_page.click_to_do_list()
         
         # Add a new todo item
@@ -31,9 +30,8 @@ class TestTodoList:
         """Test that a todo item can be marked as complete"""
         logger.info("Starting test_mark_todo_as_complete")
         
-        # Navigate to homepage and then to Todo List page
+        # Navigate to Todo List page
         home_page = HomePage(driver)
-        home_page.open()
         todo_page = home_page.click_to_do_list()
         
         # Add a new todo item
@@ -52,9 +50,8 @@ class TestTodoList:
         """Test that a todo item can be deleted"""
         logger.info("Starting test_delete_todo_item")
         
-        # Navigate to homepage and then to Todo List page
+        # Navigate to Todo List page
         home_page = HomePage(driver)
-        home_page.open()
         todo_page = home_page.click_to_do_list()
         
         # Add a new todo item
@@ -76,9 +73,8 @@ class TestTodoList:
         """Test adding, completing, and deleting multiple todo items"""
         logger.info("Starting test_multiple_todo_items")
         
-        # Navigate to homepage and then to Todo List page
+        # Navigate to Todo List page
         home_page = HomePage(driver)
-        home_page.open()
         todo_page = home_page.click_to_do_list()
         
         # Add multiple todo items
@@ -1,10 +1,12 @@
 import pytest
 from pages.home_page import HomePage
 from utilities.logger import setup_logger
+from utilities.screenshot_utils import compare_screenshot
 
 # Set up logger for this test module
 logger = setup_logger("TodoListScreenshotTest")
 
+@pytest.mark.full_render
 class TestTodoListScreenshot:
     """Test to capture a screenshot of the Todo List page"""
     
@@ -12,13 +14,13 @@ class TestTodoListScreenshot:
         """Capture a screenshot of the Todo List page"""
         logger.info("Starting test_capture_todo_list_screenshot")
         
-        # Navigate to homepage and then to Todo List page
+        # Navigate to Todo List page
         home_page = HomePage(driver)
-        home_page.open()
         todo_page = home_page.click_to_do_list()
         
-        # Take screenshot
-        screenshot_path = todo_page.take_screenshot("todo_list_page")
-        logger.info(f"Screenshot saved at: {screenshot_path}")
+        # Take screenshot and compare it against the baseline
+        result = compare_screenshot(driver, "todo_list_page")
+        logger.info(f"Screenshot saved at: {result['screenshot_path']}")
+        assert result["passed"], f"Todo List page differs from its baseline: {result['reason']} (heat-map: {result['heatmap_path']})"
         
         logger.info("test_capture_todo_list_screenshot completed successfully") 
\ No newline at end of file
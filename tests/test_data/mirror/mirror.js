@@ -0,0 +1,15 @@
+// Shared behaviour for the offline mirror pages
+function showModal(id) {
+    document.getElementById(id).classList.add('in');
+}
+
+function hideModal(element) {
+    var modal = element.closest('.modal');
+    modal.classList.remove('in');
+}
+
+document.addEventListener('click', function (event) {
+    if (event.target.matches('[data-dismiss="modal"]')) {
+        hideModal(event.target);
+    }
+});
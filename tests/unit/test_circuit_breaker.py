@@ -0,0 +1,106 @@
+import pytest
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ReadTimeoutError
+from selenium.common.exceptions import WebDriverException, SessionNotCreatedException, NoSuchElementException
+from utilities.circuit_breaker import CircuitBreaker, classify_failure, NAVIGATION, CONNECTION, SESSION
+
+def refused():
+    """Error urllib3 raises when nothing listens on the port"""
+    return MaxRetryError(None, "/session", NewConnectionError(None, "Failed to establish a new connection: "
+                                                                    "[Errno 111] Connection refused"))
+
+def read_timeout():
+    """Error urllib3 raises when a hung browser does not answer a command"""
+    return MaxRetryError(None, "/session/1/url", ReadTimeoutError(None, "/session/1/url", "Read timed out."))
+
+class TestClassifyFailure:
+    """Test which failures count as environmental"""
+    
+    @pytest.mark.parametrize("error, expected", [
+        (WebDriverException("unknown error: net::ERR_NAME_NOT_RESOLVED"), NAVIGATION),
+        (WebDriverException("Reached error page: about:neterror?e=dnsNotFound"), NAVIGATION),
+        (refused(), CONNECTION),
+        (NewConnectionError(None, "Connection refused"), CONNECTION),
+        (ConnectionRefusedError(111, "Connection refused"), CONNECTION),
+        (SessionNotCreatedException("session not created: This version of ChromeDriver only supports Chrome 120"),
+         SESSION)
+    ])
+    def test_environmental_failures(self, error, expected):
+        """Test that unreachable sites, refused connections and broken drivers are recognized"""
+        assert classify_failure(error) == expected
+    
+    @pytest.mark.parametrize("error", [
+        read_timeout(),
+        ReadTimeoutError(None, "/session/1/url", "Read timed out."),
+        ConnectionResetError(104, "Connection reset by peer"),
+        NoSuchElementException("no such element"),
+        AssertionError("Modal should be displayed")
+    ])
+    def test_other_failures(self, error):
+        """Test that command timeouts and ordinary test failures are not environmental"""
+        assert classify_failure(error) is None
+    
+    def test_wrapped_failure(self):
+        """Test that a failure re-raised from an environmental one is recognized"""
+        try:
+            try:
+                raise refused()
+            except MaxRetryError as e:
+                raise RuntimeError("Could not start the browser") from e
+        except RuntimeError as e:
+            assert classify_failure(e) == CONNECTION
+
+class TestCircuitBreaker:
+    """Test when the circuit breaker opens"""
+    
+    def test_opens_after_threshold(self):
+        """Test that consecutive environmental failures open the breaker"""
+        breaker = CircuitBreaker(threshold=3)
+        
+        breaker.record("test_a", refused())
+        breaker.record("test_b", refused())
+        assert not breaker.is_open
+        breaker.record("test_c", refused())
+        
+        assert breaker.is_open
+        assert "3 consecutive environmental failures" in breaker.reason
+        assert "connection refused in test_c" in breaker.reason
+    
+    def test_other_outcomes_reset_count(self):
+        """Test that a passing test or an ordinary failure resets the count"""
+        breaker = CircuitBreaker(threshold=2)
+        
+        breaker.record("test_a", refused())
+        breaker.record("test_b", None)
+        breaker.record("test_c", refused())
+        breaker.record("test_d", AssertionError("Title incorrect"))
+        breaker.record("test_e", refused())
+        
+        assert not breaker.is_open
+        assert breaker.consecutive == 1
+    
+    def test_command_timeouts_do_not_open(self):
+        """Test that hung browsers, which the driver pool respawns, do not open the breaker"""
+        breaker = CircuitBreaker(threshold=2)
+        
+        for test_id in ("test_a", "test_b", "test_c"):
+            breaker.record(test_id, read_timeout())
+        
+        assert not breaker.is_open
+    
+    def test_zero_threshold_disables(self):
+        """Test that a threshold of 0 never opens the breaker"""
+        breaker = CircuitBreaker(threshold=0)
+        
+        for test_id in ("test_a", "test_b", "test_c"):
+            breaker.record(test_id, refused())
+        
+        assert not breaker.is_open
+    
+    def test_stays_open(self):
+        """Test that outcomes recorded after the breaker opened do not close it"""
+        breaker = CircuitBreaker(threshold=1)
+        
+        breaker.record("test_a", refused())
+        breaker.record("test_b", None)
+        
+        assert breaker.is_open
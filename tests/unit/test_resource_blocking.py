@@ -0,0 +1,77 @@
+import re
+import json
+import pytest
+from utilities.resource_blocking import blocked_url_patterns, BlockingStats
+
+def is_blocked(url, patterns):
+    """Match a URL like Network.setBlockedURLs, where only "*" is a wildcard"""
+    return any(re.fullmatch(re.escape(pattern).replace(r"\*", ".*"), url) for pattern in patterns)
+
+class FakeDriver:
+    """Driver returning canned performance log entries"""
+    
+    def __init__(self, events):
+        self.events = events
+    
+    def get_log(self, log_type):
+        entries = [{"message": json.dumps({"message": event})} for event in self.events]
+        self.events = []
+        return entries
+
+class TestBlockedUrlPatterns:
+    """Test the URL patterns of the resource blocking profiles"""
+    
+    @pytest.mark.parametrize("profile", [None, "none"])
+    def test_no_blocking(self, profile):
+        """Test that no patterns are blocked without a profile or with none"""
+        assert blocked_url_patterns(profile) == []
+    
+    def test_third_party_profile(self):
+        """Test that third_party blocks analytics and web fonts but not the site under test"""
+        patterns = blocked_url_patterns("third_party")
+        
+        assert is_blocked("https://www.google-analytics.com/analytics.js", patterns)
+        assert is_blocked("https://fonts.googleapis.com/css?family=Roboto", patterns)
+        assert not is_blocked("https://webdriveruniversity.com/Contact-Us/contactus.html", patterns)
+        assert not is_blocked("https://webdriveruniversity.com/img/logo.png", patterns)
+    
+    def test_assets_profile(self):
+        """Test that assets also blocks images, fonts and media by extension, with or without a query"""
+        patterns = blocked_url_patterns("assets")
+        
+        assert is_blocked("https://www.google-analytics.com/analytics.js", patterns)
+        assert is_blocked("https://webdriveruniversity.com/img/logo.png", patterns)
+        assert is_blocked("https://webdriveruniversity.com/fonts/icons.woff2?v=4.7.0", patterns)
+        assert is_blocked("https://webdriveruniversity.com/media/intro.mp4", patterns)
+        assert not is_blocked("https://webdriveruniversity.com/Contact-Us/contactus.html", patterns)
+        assert not is_blocked("https://webdriveruniversity.com/js/scripts.js", patterns)
+    
+    def test_unknown_profile(self):
+        """Test that an unknown profile raises a ValueError naming the valid ones"""
+        with pytest.raises(ValueError, match="third_party"):
+            blocked_url_patterns("everything")
+
+class TestBlockingStats:
+    """Test counting blocked requests from the performance log"""
+    
+    def test_summary(self):
+        """Test that blocked requests are counted and sized from unblocked loads of the same URL"""
+        stats = BlockingStats()
+        stats.collect(FakeDriver([
+            # Loaded in full by a full_render test
+            {"method": "Network.requestWillBeSent", "params": {"requestId": "1", "request": {"url": "https://a/logo.png"}}},
+            {"method": "Network.loadingFinished", "params": {"requestId": "1", "encodedDataLength": 2000}},
+            # Blocked twice afterwards
+            {"method": "Network.requestWillBeSent", "params": {"requestId": "2", "request": {"url": "https://a/logo.png"}}},
+            {"method": "Network.loadingFailed", "params": {"requestId": "2", "blockedReason": "inspector"}},
+            {"method": "Network.requestWillBeSent", "params": {"requestId": "3", "request": {"url": "https://a/logo.png"}}},
+            {"method": "Network.loadingFailed", "params": {"requestId": "3", "blockedReason": "inspector"}},
+            # Blocked, never loaded in full
+            {"method": "Network.requestWillBeSent", "params": {"requestId": "4", "request": {"url": "https://b/ga.js"}}},
+            {"method": "Network.loadingFailed", "params": {"requestId": "4", "blockedReason": "inspector"}},
+            # Failed for another reason
+            {"method": "Network.requestWillBeSent", "params": {"requestId": "5", "request": {"url": "https://c/api"}}},
+            {"method": "Network.loadingFailed", "params": {"requestId": "5", "errorText": "net::ERR_FAILED"}}
+        ]))
+        
+        assert stats.summary() == {"blocked_requests": 3, "bytes_saved": 4000, "unknown_size_requests": 1}
@@ -0,0 +1,171 @@
+import os
+import time
+import pytest
+from utilities.artifact_catalog import ArtifactCatalog, RUN, REPORT, FAILURE, SCREENSHOT
+from utilities import cleanup_utils
+from utilities.cleanup_utils import select_expired_runs, cleanup_reports, cleanup_screenshots, DeletionBatch, parse_size
+
+DAY = 86400
+
+@pytest.fixture
+def catalog(tmp_path):
+    """Empty artifact catalog in a temporary directory"""
+    return ArtifactCatalog(str(tmp_path / "artifacts.db"))
+
+def add_run(catalog, tmp_path, run_id, age_days, size, report=True, failed=False, blobs=()):
+    """
+    Record a run in the catalog
+
+    Args:
+        catalog: ArtifactCatalog to record the run in
+        tmp_path: Directory holding the run directories
+        run_id: Run id
+        age_days: Age of the run in days
+        size: Cached size of the run directory in bytes
+        report: Whether the run wrote its report
+        failed: Whether a test of the run failed
+        blobs: (name, size) of the screenshot blobs the run references
+    """
+    created = time.time() - age_days * DAY
+    path = os.path.join(str(tmp_path), run_id)
+    rows = [(run_id, RUN, path, None, size, created)]
+    if report:
+        rows.append((run_id, REPORT, os.path.join(path, "report.html"), None, None, created))
+    if failed:
+        rows.append((run_id, FAILURE, path, "tests/test_cases/test_login.py::test_login", None, created))
+    for name, blob_size in blobs:
+        rows.append((run_id, SCREENSHOT, os.path.join(str(tmp_path), "blobs", name), name, blob_size, created))
+    catalog.add_many(rows)
+
+class TestSelectExpiredRuns:
+    """Test which runs the retention policies delete"""
+    
+    def test_runs_past_max_reports_expire(self, catalog, tmp_path):
+        """Test that only the newest max_reports reported runs are kept"""
+        for index in range(4):
+            add_run(catalog, tmp_path, f"run_{index}", age_days=index + 1, size=10)
+        
+        expired = select_expired_runs(catalog, max_reports=2)
+        
+        assert sorted(expired) == ["run_2", "run_3"]
+        assert {reason for _, _, reason in expired.values()} == {"count"}
+    
+    def test_runs_past_max_age_expire(self, catalog, tmp_path):
+        """Test that runs older than max_age_days are deleted"""
+        add_run(catalog, tmp_path, "recent", age_days=1, size=10)
+        add_run(catalog, tmp_path, "old", age_days=10, size=10)
+        
+        expired = select_expired_runs(catalog, max_age_days=7)
+        
+        assert list(expired) == ["old"]
+        assert expired["old"][2] == "age"
+    
+    def test_byte_budget_keeps_newest_runs(self, catalog, tmp_path):
+        """Test that runs no longer fitting into the budget are deleted, and every older one with them"""
+        add_run(catalog, tmp_path, "newest", age_days=1, size=100)
+        add_run(catalog, tmp_path, "middle", age_days=2, size=100)
+        add_run(catalog, tmp_path, "large", age_days=3, size=500)
+        add_run(catalog, tmp_path, "oldest", age_days=4, size=10)
+        
+        expired = select_expired_runs(catalog, max_bytes=250)
+        
+        assert sorted(expired) == ["large", "oldest"]
+        assert expired["large"] == (os.path.join(str(tmp_path), "large"), 500, "size")
+    
+    def test_newest_run_always_fits(self, catalog, tmp_path):
+        """Test that the newest run is kept even if it alone exceeds the budget"""
+        add_run(catalog, tmp_path, "newest", age_days=1, size=1000)
+        
+        assert select_expired_runs(catalog, max_bytes=100) == {}
+    
+    def test_shared_screenshots_count_once(self, catalog, tmp_path):
+        """Test that a blob referenced by several runs counts towards the newest of them only"""
+        add_run(catalog, tmp_path, "newest", age_days=1, size=10, blobs=[("shared.png", 100)])
+        add_run(catalog, tmp_path, "older", age_days=2, size=10, blobs=[("shared.png", 100)])
+        
+        assert select_expired_runs(catalog, max_bytes=130) == {}
+        assert list(select_expired_runs(catalog, max_bytes=115)) == ["older"]
+    
+    def test_own_screenshots_count_towards_the_run(self, catalog, tmp_path):
+        """Test that the blobs only a run references count towards its size"""
+        add_run(catalog, tmp_path, "newest", age_days=1, size=10, blobs=[("newest.png", 100)])
+        add_run(catalog, tmp_path, "older", age_days=2, size=10, blobs=[("older.png", 100)])
+        
+        assert list(select_expired_runs(catalog, max_bytes=130)) == ["older"]
+    
+    def test_keep_failed_overrides_policies(self, catalog, tmp_path):
+        """Test that runs with a failed test are kept with keep_failed"""
+        add_run(catalog, tmp_path, "newest", age_days=1, size=10)
+        add_run(catalog, tmp_path, "failed", age_days=20, size=10, failed=True)
+        add_run(catalog, tmp_path, "passed", age_days=30, size=10)
+        
+        assert sorted(select_expired_runs(catalog, max_reports=1, max_age_days=7)) == ["failed", "passed"]
+        assert list(select_expired_runs(catalog, max_reports=1, max_age_days=7, keep_failed=True)) == ["passed"]
+    
+    def test_unfinished_runs_are_kept(self, catalog, tmp_path):
+        """Test that a recent run without a report is assumed to be running and kept"""
+        add_run(catalog, tmp_path, "running", age_days=0, size=10, report=False)
+        add_run(catalog, tmp_path, "finished", age_days=1, size=10)
+        add_run(catalog, tmp_path, "abandoned", age_days=5, size=10, report=False)
+        
+        expired = select_expired_runs(catalog, max_reports=1)
+        
+        assert list(expired) == ["abandoned"]
+
+class TestCleanupScreenshots:
+    """Test that screenshot garbage collection follows run retention"""
+    
+    @pytest.fixture
+    def store_dirs(self, tmp_path, monkeypatch):
+        """Point cleanup at temporary reports and screenshots directories"""
+        monkeypatch.setattr(cleanup_utils, "REPORTS_DIR", str(tmp_path))
+        monkeypatch.setattr(cleanup_utils, "SCREENSHOTS_DIR", str(tmp_path / "screenshots"))
+        return tmp_path
+    
+    def add_run_with_blob(self, catalog, tmp_path, run_id, age_days, failed=False):
+        """Record a run with a run directory and a screenshot blob of its own on disk"""
+        os.makedirs(tmp_path / run_id)
+        blob = tmp_path / "screenshots" / "blobs" / "ab" / f"{run_id}.png"
+        os.makedirs(blob.parent, exist_ok=True)
+        blob.write_bytes(b"png")
+        created = time.time() - age_days * DAY
+        rows = [(run_id, RUN, str(tmp_path / run_id), None, 10, created),
+                (run_id, REPORT, str(tmp_path / run_id / "report.html"), None, None, created),
+                (run_id, SCREENSHOT, str(blob), "failure", 3, created)]
+        if failed:
+            rows.append((run_id, FAILURE, str(tmp_path / run_id), "tests/test_cases/test_login.py::test_login", None, created))
+        catalog.add_many(rows)
+        return blob
+    
+    def test_kept_failed_run_keeps_its_screenshots(self, catalog, store_dirs):
+        """Test that a failed run kept by keep_failed beyond reports_to_match keeps its blobs"""
+        blobs = {run_id: self.add_run_with_blob(catalog, store_dirs, run_id, age_days=index + 1,
+                                                failed=run_id == "failed")
+                 for index, run_id in enumerate(["newest", "middle", "failed", "oldest"])}
+        batch = DeletionBatch()
+        
+        cleanup_reports(max_reports=1, catalog=catalog, keep_failed=True, batch=batch)
+        cleanup_screenshots("match_reports", reports_to_match=1, catalog=catalog, batch=batch)
+        
+        assert os.path.isdir(store_dirs / "failed") and blobs["failed"].exists()
+        assert blobs["newest"].exists()
+        assert not os.path.exists(store_dirs / "middle") and not blobs["middle"].exists()
+        assert not os.path.exists(store_dirs / "oldest") and not blobs["oldest"].exists()
+
+class TestParseSize:
+    """Test parsing of the --max-bytes option"""
+    
+    @pytest.mark.parametrize("value, expected", [
+        ("500", 500),
+        ("2K", 2048),
+        ("1.5M", 1536 * 1024),
+        ("20GB", 20 * 1024 ** 3)
+    ])
+    def test_valid_sizes(self, value, expected):
+        """Test that sizes with and without a unit are parsed"""
+        assert parse_size(value) == expected
+    
+    def test_invalid_size(self):
+        """Test that an invalid size raises a ValueError"""
+        with pytest.raises(ValueError):
+            parse_size("lots")
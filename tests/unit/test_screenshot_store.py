@@ -0,0 +1,124 @@
+import io
+import os
+import json
+import base64
+import pytest
+from PIL import Image
+from utilities.artifact_catalog import ArtifactCatalog
+from utilities.screenshot_store import ScreenshotStore
+from utilities.screenshot_pipeline import ScreenshotPipeline
+from utilities.screenshot_utils import embed_previews, PREVIEW_PLACEHOLDER
+
+def png_payload(color, size=(40, 30)):
+    """Base64 PNG of a single color"""
+    output = io.BytesIO()
+    Image.new("RGB", size, color).save(output, "PNG")
+    return base64.b64encode(output.getvalue()).decode()
+
+class FakeDriver:
+    """Driver whose viewport screenshots are canned payloads"""
+    
+    def __init__(self, *payloads):
+        self.payloads = list(payloads)
+    
+    def get_screenshot_as_base64(self):
+        return self.payloads.pop(0)
+
+@pytest.fixture
+def catalog(tmp_path):
+    """Empty artifact catalog in a temporary directory"""
+    return ArtifactCatalog(str(tmp_path / "artifacts.db"))
+
+@pytest.fixture
+def store(tmp_path, catalog):
+    """Screenshot store of a run in a temporary directory"""
+    return ScreenshotStore(root=str(tmp_path / "screenshots"), run_id="run_1", run_dir=str(tmp_path / "run_1"),
+                           catalog=catalog)
+
+class TestScreenshotStore:
+    """Test the content-addressed screenshot store"""
+    
+    def test_identical_captures_share_a_blob(self, store):
+        """Test that identical images are written once and listed under each name in the manifest"""
+        red, blue = png_payload("red"), png_payload("blue")
+        pipeline = ScreenshotPipeline(workers=1, image_format="png", store=store)
+        
+        first, _ = pipeline.capture(FakeDriver(red), "first", mode="viewport")
+        second, _ = pipeline.capture(FakeDriver(red), "second", mode="viewport")
+        other, _ = pipeline.capture(FakeDriver(blue), "other", mode="viewport")
+        pipeline.shutdown()
+        
+        assert first == second != other
+        assert os.path.exists(first) and os.path.exists(other)
+        stats = pipeline.get_stats()
+        assert (stats["captures"], stats["writes"], stats["deduplicated"]) == (3, 2, 1)
+        with open(store.manifest_path) as f:
+            manifest = json.load(f)
+        assert [entry["name"] for entry in manifest["screenshots"]] == ["first", "second", "other"]
+    
+    def test_existing_blob_is_reused(self, tmp_path, catalog):
+        """Test that a later run reuses a blob written by an earlier one"""
+        payload = png_payload("green")
+        for run_id in ("run_1", "run_2"):
+            store = ScreenshotStore(root=str(tmp_path / "screenshots"), run_id=run_id,
+                                    run_dir=str(tmp_path / run_id), catalog=catalog)
+            pipeline = ScreenshotPipeline(workers=1, image_format="png", store=store)
+            pipeline.capture(FakeDriver(payload), "page", mode="viewport")
+            pipeline.shutdown()
+        
+        assert pipeline.get_stats()["writes"] == 0
+        assert pipeline.get_stats()["deduplicated"] == 1
+        assert sorted(run_id for run_id, _, _ in catalog.screenshot_references()) == ["run_1", "run_2"]
+    
+    def test_capture_leaves_catalog_to_writers(self, store):
+        """Test that recording a capture in the manifest does not write to the catalog on the test thread"""
+        store.catalog = None
+        
+        store.add("page", "ab" * 32, "png")
+        
+        assert len(store.entries) == 1
+    
+    def test_reference_protects_blob_from_cleanup(self, store, catalog):
+        """Test that a referenced blob is kept for its run before the manifest is saved"""
+        path = store.add("page", "ab" * 32, "png")
+        store.reference(path, "page")
+        
+        assert catalog.unreferenced_blobs(["run_1"]) == []
+        assert catalog.unreferenced_blobs([]) == [(os.path.abspath(path), None)]
+    
+    def test_blob_size_recorded_with_manifest(self, store, catalog):
+        """Test that the size of a blob written after it was referenced is filled in when the manifest is saved"""
+        path = store.add("page", "ab" * 32, "png")
+        store.reference(path, "page")
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            f.write(b"x" * 123)
+        
+        store.save_manifest()
+        
+        assert catalog.screenshot_references() == [("run_1", os.path.abspath(path), 123)]
+
+class TestEmbedPreviews:
+    """Test inlining the previews of failed tests into the self-contained report"""
+    
+    def test_previews_written_by_pipeline_are_embedded(self, tmp_path, store):
+        """Test that placeholders are replaced with the previews the writers produced, as data URIs"""
+        preview_path = str(tmp_path / "previews" / "test_a.thumb.jpg")
+        pipeline = ScreenshotPipeline(workers=1, image_format="png", store=store)
+        pipeline.capture(FakeDriver(png_payload("red")), "test_a", "viewport", preview_path=preview_path)
+        pipeline.flush()
+        report = tmp_path / "report.html"
+        # pytest-html keeps the extras as HTML-escaped JSON
+        report.write_text(f'<div data-jsonblob="{{&#34;src&#34;: &#34;{PREVIEW_PLACEHOLDER}0&#34;, '
+                          f'&#34;other&#34;: &#34;{PREVIEW_PLACEHOLDER}1&#34;}}"></div>')
+        with open(preview_path, "rb") as f:
+            expected = "data:image/jpeg;base64," + base64.b64encode(f.read()).decode()
+        
+        embed_previews(str(report), {f"{PREVIEW_PLACEHOLDER}0": preview_path,
+                                     f"{PREVIEW_PLACEHOLDER}1": str(tmp_path / "missing.jpg")})
+        
+        html = report.read_text()
+        assert expected in html
+        assert f"{PREVIEW_PLACEHOLDER}0" not in html
+        assert f"{PREVIEW_PLACEHOLDER}1" in html
+        assert not os.path.exists(tmp_path / "previews")
@@ -0,0 +1,80 @@
+import pytest
+from utilities.test_timings import TimingsStore, estimate_durations, balance_shards, DEFAULT_SECONDS_PER_BYTE
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty timings store in a temporary file"""
+    return TimingsStore(str(tmp_path / "timings.json"))
+
+@pytest.fixture
+def test_file(tmp_path):
+    """Test module of 1000 bytes"""
+    path = tmp_path / "test_module.py"
+    path.write_bytes(b"#" * 1000)
+    return str(path)
+
+class TestEstimateDurations:
+    """Test the duration estimates used to balance shards"""
+    
+    def test_known_tests_use_stored_duration(self, store, test_file):
+        """Test that a test that ran before is estimated at its stored duration"""
+        store.durations[f"{test_file}::test_a"] = 12.5
+        
+        estimates = estimate_durations([f"{test_file}::test_a"], store)
+        
+        assert estimates == {f"{test_file}::test_a": 12.5}
+    
+    def test_unseen_tests_share_their_file_size(self, store, test_file):
+        """Test that unseen tests get an equal share of their module's size at the default rate"""
+        test_ids = [f"{test_file}::test_a", f"{test_file}::test_b"]
+        
+        estimates = estimate_durations(test_ids, store)
+        
+        assert estimates[test_ids[0]] == pytest.approx(500 * DEFAULT_SECONDS_PER_BYTE)
+        assert estimates[test_ids[1]] == pytest.approx(500 * DEFAULT_SECONDS_PER_BYTE)
+    
+    def test_unseen_tests_are_calibrated_by_known_tests(self, store, test_file):
+        """Test that the seconds per byte of known tests are applied to unseen tests"""
+        test_ids = [f"{test_file}::test_a", f"{test_file}::test_b"]
+        store.durations[test_ids[0]] = 5.0
+        
+        estimates = estimate_durations(test_ids, store)
+        
+        # 5 seconds for 500 bytes of the module
+        assert estimates[test_ids[1]] == pytest.approx(5.0)
+    
+    def test_blended_update_is_persisted(self, store):
+        """Test that a new duration is blended with the stored one and saved"""
+        store.update({"test_a": 10.0})
+        store.update({"test_a": 20.0})
+        
+        assert TimingsStore(store.path).get("test_a") == pytest.approx(15.0)
+
+class TestBalanceShards:
+    """Test longest-processing-time-first shard balancing"""
+    
+    def test_longest_tests_are_spread_over_workers(self):
+        """Test that the shards end up with equal predicted durations when possible"""
+        estimates = {"a": 8.0, "b": 7.0, "c": 5.0, "d": 4.0, "e": 3.0, "f": 3.0}
+        
+        shards, loads = balance_shards(estimates, 2)
+        
+        assert sorted(loads) == [15.0, 15.0]
+        assert sorted(test_id for shard in shards for test_id in shard) == sorted(estimates)
+    
+    def test_predicted_durations_match_shards(self):
+        """Test that every predicted shard duration is the sum of its tests' estimates"""
+        estimates = {f"test_{index}": float(index % 7 + 1) for index in range(20)}
+        
+        shards, loads = balance_shards(estimates, 3)
+        
+        assert len(shards) == 3
+        for shard, load in zip(shards, loads):
+            assert load == pytest.approx(sum(estimates[test_id] for test_id in shard))
+    
+    def test_empty_shards_are_dropped(self):
+        """Test that more workers than tests do not produce empty shards"""
+        shards, loads = balance_shards({"a": 1.0, "b": 2.0}, 4)
+        
+        assert sorted(shards) == [["a"], ["b"]]
+        assert sorted(loads) == [1.0, 2.0]
@@ -0,0 +1,107 @@
+import io
+import os
+import base64
+import numpy as np
+import pytest
+from PIL import Image
+from utilities import visual_diff
+from utilities.visual_diff import VisualBaseline
+
+def png_payload(pixels):
+    """Base64 PNG of an RGB array"""
+    output = io.BytesIO()
+    Image.fromarray(pixels).save(output, "PNG")
+    return base64.b64encode(output.getvalue()).decode()
+
+def page(changed_rows=0, size=(200, 300)):
+    """Gray page with a black band of changed rows at the top"""
+    pixels = np.full(size + (3,), 200, dtype=np.uint8)
+    pixels[:changed_rows] = 0
+    return pixels
+
+@pytest.fixture
+def baselines(tmp_path, monkeypatch):
+    """Baselines recorded from the unchanged page; heat-maps go to a temporary run directory"""
+    monkeypatch.setattr(visual_diff, "RUN_DIR", str(tmp_path / "run"))
+    root = str(tmp_path / "baselines")
+    VisualBaseline("chrome", root=root, update=True, tile_size=32).check("page", png_payload(page()))
+    return VisualBaseline("chrome", root=root, update=False, tile_size=32)
+
+class TestVisualBaseline:
+    """Test comparing captures against their baselines"""
+    
+    def test_missing_baseline_fails(self, tmp_path):
+        """Test that a capture without a baseline fails unless baselines are updated"""
+        baseline = VisualBaseline("chrome", root=str(tmp_path / "baselines"), update=False)
+        
+        result = baseline.check("page", png_payload(page()))
+        
+        assert not result["passed"]
+        assert "UPDATE_BASELINES=1" in result["reason"]
+        assert not os.path.exists(tmp_path / "baselines" / "chrome" / "page.png")
+    
+    def test_update_records_baseline(self, tmp_path):
+        """Test that update mode records the capture as the baseline"""
+        baseline = VisualBaseline("chrome", root=str(tmp_path / "baselines"), update=True)
+        
+        result = baseline.check("page", png_payload(page()))
+        
+        assert result["passed"] and result["reason"] == "baseline recorded"
+        assert os.path.exists(tmp_path / "baselines" / "chrome" / "page.png")
+    
+    def test_identical_capture_passes(self, baselines):
+        """Test that an unchanged capture matches on the cached fingerprints alone"""
+        result = baselines.check("page", png_payload(page()))
+        
+        assert result["passed"]
+        assert result["changed_tiles"] == 0
+    
+    def test_replaced_baseline_ignores_stale_fingerprints(self, baselines):
+        """Test that a baseline replaced without its fingerprint cache is compared pixel by pixel"""
+        with open(os.path.join(baselines.directory, "page.png"), "wb") as f:
+            f.write(base64.b64decode(png_payload(page(changed_rows=40))))
+        
+        result = baselines.check("page", png_payload(page()), max_diff_ratio=0.05)
+        
+        assert not result["passed"]
+        assert result["diff_ratio"] == pytest.approx(40 / 200)
+    
+    def test_small_change_within_ratio_passes(self, baselines):
+        """Test that a change below max_diff_ratio passes"""
+        result = baselines.check("page", png_payload(page(changed_rows=2)), max_diff_ratio=0.05)
+        
+        assert result["passed"]
+        assert result["changed_pixels"] == 2 * 300
+        assert result["heatmap_path"] is None
+    
+    def test_large_change_fails_with_heatmap(self, baselines):
+        """Test that a change above max_diff_ratio fails and writes a heat-map"""
+        result = baselines.check("page", png_payload(page(changed_rows=40)), max_diff_ratio=0.05)
+        
+        assert not result["passed"]
+        assert result["diff_ratio"] == pytest.approx(40 / 200)
+        assert os.path.exists(result["heatmap_path"])
+    
+    def test_changes_below_tolerance_are_ignored(self, baselines):
+        """Test that pixels differing less than the tolerance do not count as changed"""
+        pixels = page()
+        pixels[:100] += 3
+        
+        result = baselines.check("page", png_payload(pixels), tolerance=8)
+        
+        assert result["passed"]
+        assert result["changed_pixels"] == 0
+    
+    def test_ignored_region(self, baselines):
+        """Test that changes inside an ignore region do not count"""
+        result = baselines.check("page", png_payload(page(changed_rows=40)), ignore_regions=[(0, 0, 300, 40)],
+                                 max_diff_ratio=0.0)
+        
+        assert result["passed"]
+    
+    def test_size_change_fails(self, baselines):
+        """Test that a capture of another size fails with the size change as reason"""
+        result = baselines.check("page", png_payload(page(size=(250, 300))))
+        
+        assert not result["passed"]
+        assert result["reason"] == "size changed from 300x200 to 300x250"
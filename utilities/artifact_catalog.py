@@ -0,0 +1,368 @@
+import os
+import json
+import glob
+import time
+import sqlite3
+from contextlib import contextmanager
+from config.config import ARTIFACT_CATALOG_PATH, REPORTS_DIR, SCREENSHOTS_DIR, REPORT_NAME
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    test_id TEXT,
+    size INTEGER,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_kind_created ON artifacts (kind, created);
+CREATE INDEX IF NOT EXISTS artifacts_run ON artifacts (run_id, kind);
+CREATE INDEX IF NOT EXISTS artifacts_path ON artifacts (path);
+"""
+
+# Artifact kinds
+RUN = "run"  # Directory of a run, holding its report, logs, manifests and shard output
+REPORT = "report"  # HTML report of a run, recorded once it is complete
+MANIFEST = "manifest"  # Screenshot manifest of a run worker
+SCREENSHOT = "screenshot"  # Screenshot blob referenced by a run (blobs are shared between runs)
+FAILURE = "failure"  # Failed test of a run
+
+def directory_size(path):
+    """
+    Get the total size of the files under a directory
+
+    Args:
+        path: Directory (or file) path
+
+    Returns:
+        int: Size in bytes, 0 if the path does not exist
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(directory, name))
+            except OSError:
+                pass
+    return total
+
+class ArtifactCatalog:
+    """
+    SQLite index of the runs and screenshots produced by test runs
+
+    Artifacts are recorded when they are created, grouped by run id, so cleanup can
+    select whole runs to keep with indexed queries instead of scanning the report and
+    screenshot directories. Parallel workers may write to the catalog at the same time.
+    """
+
+    def __init__(self, path=ARTIFACT_CATALOG_PATH):
+        """
+        Initialize the ArtifactCatalog
+
+        Args:
+            path: Path of the SQLite database
+        """
+        self.path = path
+
+    @property
+    def exists(self):
+        """Whether the catalog has been created"""
+        return os.path.exists(self.path)
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection, commit on success and always close it"""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def add(self, run_id, kind, path, test_id=None, size=None, created=None):
+        """
+        Record an artifact
+
+        Args:
+            run_id: Run the artifact belongs to
+            kind: Artifact kind (RUN, REPORT, MANIFEST, SCREENSHOT or FAILURE)
+            path: Absolute path of the artifact
+            test_id: Test that produced the artifact (optional)
+            size: Size in bytes (optional)
+            created: Creation time as a Unix timestamp, defaults to now
+        """
+        self.add_many([(run_id, kind, path, test_id, size, created)])
+
+    def add_many(self, rows):
+        """
+        Record several artifacts in one transaction
+
+        Args:
+            rows: Iterable of (run_id, kind, path, test_id, size, created) tuples;
+                  created may be None for now
+        """
+        now = time.time()
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO artifacts (run_id, kind, path, test_id, size, created) VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, kind, os.path.abspath(path), test_id, size, now if created is None else created)
+                 for run_id, kind, path, test_id, size, created in rows]
+            )
+
+    def add_run(self, run_id, path):
+        """
+        Record a run unless it is already known
+
+        Every worker of a parallel run calls this; only the first one records the run.
+
+        Args:
+            run_id: Run id
+            path: Run directory
+        """
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO artifacts (run_id, kind, path, created) SELECT ?, ?, ?, ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM artifacts WHERE run_id = ? AND kind = ?)",
+                (run_id, RUN, os.path.abspath(path), time.time(), run_id, RUN)
+            )
+
+    def set_run_size(self, run_id, size):
+        """
+        Cache the size of a run directory
+
+        Args:
+            run_id: Run id
+            size: Size in bytes
+        """
+        with self._connect() as connection:
+            connection.execute("UPDATE artifacts SET size = ? WHERE run_id = ? AND kind = ?", (size, run_id, RUN))
+
+    def set_sizes(self, kind, sizes):
+        """
+        Record the size of artifacts that were cataloged before they were written
+
+        Args:
+            kind: Artifact kind
+            sizes: Iterable of (path, size) tuples
+        """
+        with self._connect() as connection:
+            connection.executemany(
+                "UPDATE artifacts SET size = ? WHERE kind = ? AND path = ? AND size IS NULL",
+                [(size, kind, os.path.abspath(path)) for path, size in sizes]
+            )
+
+    def run_index(self):
+        """
+        List every run with its cached size and whether it has a report and failures
+
+        Returns:
+            list: (run_id, path, created, size, has_report, has_failures) tuples, newest first;
+                  size is None until it has been cached
+        """
+        with self._connect() as connection:
+            return [(run_id, path, created, size, bool(has_report), bool(has_failures))
+                    for run_id, path, created, size, has_report, has_failures in connection.execute(
+                "SELECT r.run_id, r.path, r.created, r.size, "
+                "EXISTS (SELECT 1 FROM artifacts x WHERE x.run_id = r.run_id AND x.kind = ?), "
+                "EXISTS (SELECT 1 FROM artifacts x WHERE x.run_id = r.run_id AND x.kind = ?) "
+                "FROM artifacts r WHERE r.kind = ? ORDER BY r.created DESC",
+                (REPORT, FAILURE, RUN)
+            )]
+
+    def screenshot_references(self):
+        """
+        List which screenshot blobs each run references
+
+        Returns:
+            list: (run_id, path, size) tuples
+        """
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT DISTINCT run_id, path, size FROM artifacts WHERE kind = ?", (SCREENSHOT,)
+            ).fetchall()
+
+    def snapshot(self, path):
+        """
+        Copy the catalog, e.g. to evaluate a cleanup without changing the real catalog
+
+        Args:
+            path: Path of the copy
+
+        Returns:
+            ArtifactCatalog: Catalog backed by the copy
+        """
+        with self._connect() as connection:
+            target = sqlite3.connect(path)
+            try:
+                connection.backup(target)
+            finally:
+                target.close()
+        return ArtifactCatalog(path)
+
+    def newest(self, kind, offset=0, limit=-1):
+        """
+        List artifacts of a kind, newest first
+
+        Args:
+            kind: Artifact kind
+            offset: Number of newest artifacts to skip
+            limit: Maximum number of artifacts to return, -1 for all
+
+        Returns:
+            list: (run_id, path, created) tuples
+        """
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT run_id, path, created FROM artifacts WHERE kind = ? ORDER BY created DESC LIMIT ? OFFSET ?",
+                (kind, limit, offset)
+            ).fetchall()
+
+    def screenshot_counts(self):
+        """
+        Count the screenshots of every run that took any, newest run first
+
+        Returns:
+            list: (run_id, created, number of screenshots) tuples
+        """
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT run_id, MAX(created), COUNT(*) FROM artifacts WHERE kind = ? AND run_id != '' "
+                "GROUP BY run_id ORDER BY MAX(created) DESC",
+                (SCREENSHOT,)
+            ).fetchall()
+
+    def paths(self, run_ids, kinds):
+        """
+        Get the paths of the artifacts of some runs
+
+        Args:
+            run_ids: Run ids
+            kinds: Artifact kinds
+
+        Returns:
+            list: Paths
+        """
+        with self._connect() as connection:
+            self._fill_run_table(connection, run_ids)
+            return [row[0] for row in connection.execute(
+                f"SELECT path FROM artifacts WHERE run_id IN (SELECT run_id FROM selected_runs) "
+                f"AND kind IN ({', '.join('?' * len(kinds))})", tuple(kinds)
+            )]
+
+    def unreferenced_blobs(self, keep_run_ids):
+        """
+        Find the screenshot blobs that no kept run references
+
+        Args:
+            keep_run_ids: Runs whose screenshots are kept
+
+        Returns:
+            list: (path, size) tuples
+        """
+        with self._connect() as connection:
+            self._fill_run_table(connection, keep_run_ids)
+            return connection.execute(
+                "SELECT path, MAX(size) FROM artifacts WHERE kind = ? GROUP BY path "
+                "HAVING SUM(run_id IN (SELECT run_id FROM selected_runs)) = 0",
+                (SCREENSHOT,)
+            ).fetchall()
+
+    def remove_runs(self, run_ids, kinds=None):
+        """
+        Forget the artifacts of some runs
+
+        Args:
+            run_ids: Run ids
+            kinds: Only forget artifacts of these kinds (optional)
+        """
+        with self._connect() as connection:
+            self._fill_run_table(connection, run_ids)
+            query = "DELETE FROM artifacts WHERE run_id IN (SELECT run_id FROM selected_runs)"
+            if kinds:
+                query += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            connection.execute(query, tuple(kinds or ()))
+
+    def detach_screenshots(self, run_ids):
+        """
+        Move the screenshot references of some runs to no run, so they are collected
+        unless another run references the same images
+
+        Args:
+            run_ids: Run ids
+        """
+        with self._connect() as connection:
+            self._fill_run_table(connection, run_ids)
+            connection.execute("UPDATE artifacts SET run_id = '' WHERE kind = ? "
+                               "AND run_id IN (SELECT run_id FROM selected_runs)", (SCREENSHOT,))
+
+    def rebuild(self, reports_dir=REPORTS_DIR, screenshots_dir=SCREENSHOTS_DIR):
+        """
+        Recreate the catalog from the files on disk
+
+        Used for directories written before the catalog existed, or after files were
+        removed by hand. Creation times are taken from the file modification times.
+        Reports written before runs had their own directory are recorded as runs of
+        their own. Failed tests are not recovered, so keep-failed retention only
+        protects runs recorded after a rebuild.
+
+        Args:
+            reports_dir: Reports directory holding the run directories
+            screenshots_dir: Screenshots directory holding the blobs
+
+        Returns:
+            int: Number of artifacts recorded
+        """
+        rows = []
+        referenced = set()
+        for entry in os.listdir(reports_dir) if os.path.isdir(reports_dir) else []:
+            path = os.path.join(reports_dir, entry)
+            if entry.startswith("test_report_") and entry.endswith(".html"):
+                created = os.path.getmtime(path)
+                run_id = os.path.splitext(entry)[0]
+                rows.append((run_id, RUN, path, None, os.path.getsize(path), created))
+                rows.append((run_id, REPORT, path, None, os.path.getsize(path), created))
+                continue
+            if not os.path.isdir(path) or entry.startswith("."):
+                continue
+
+            created = os.path.getmtime(path)
+            rows.append((entry, RUN, path, None, directory_size(path), created))
+            report_path = os.path.join(path, REPORT_NAME)
+            if os.path.exists(report_path):
+                rows.append((entry, REPORT, report_path, None, os.path.getsize(report_path),
+                             os.path.getmtime(report_path)))
+            for manifest_path in glob.glob(os.path.join(path, "manifests", "*.json")):
+                try:
+                    with open(manifest_path) as f:
+                        manifest = json.load(f)
+                except ValueError:
+                    print(f"Skipping unreadable manifest: {manifest_path}")
+                    continue
+                rows.append((entry, MANIFEST, manifest_path, None, None, created))
+                for screenshot in manifest.get("screenshots", []):
+                    blob = os.path.normpath(os.path.join(screenshots_dir, screenshot["blob"]))
+                    size = os.path.getsize(blob) if os.path.exists(blob) else None
+                    rows.append((entry, SCREENSHOT, blob, screenshot.get("name"), size, created))
+                    referenced.add(blob)
+
+        # Blobs no manifest references are recorded without a run so cleanup deletes them
+        for blob in glob.glob(os.path.join(screenshots_dir, "blobs", "*", "*")):
+            blob = os.path.normpath(blob)
+            if blob not in referenced and not blob.endswith(".tmp"):
+                rows.append(("", SCREENSHOT, blob, None, os.path.getsize(blob), os.path.getmtime(blob)))
+
+        with self._connect() as connection:
+            connection.execute("DELETE FROM artifacts")
+        self.add_many(rows)
+        return len(rows)
+
+    @staticmethod
+    def _fill_run_table(connection, run_ids):
+        """Load run ids into a temporary table so queries do not need huge IN lists"""
+        connection.execute("CREATE TEMP TABLE IF NOT EXISTS selected_runs (run_id TEXT PRIMARY KEY)")
+        connection.execute("DELETE FROM selected_runs")
+        connection.executemany("INSERT OR IGNORE INTO selected_runs VALUES (?)", [(r,) for r in run_ids])
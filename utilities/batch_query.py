@@ -0,0 +1,39 @@
+from utilities.js_locator import LOCATOR_JS
+
+# Script that resolves a set of named locators and describes the matches in a single
+# call. Each query is {by, value, all}; the result maps every name to a description of
+# its first match, or to a list of descriptions of all matches when "all" is set.
+BATCH_QUERY_JS = LOCATOR_JS + """
+var queries = arguments[0], attributes = arguments[1];
+
+function describe(el) {
+    var visible = isVisible(el);
+    var attrs = {};
+    attributes.forEach(function (name) {
+        attrs[name] = el.getAttribute(name);
+    });
+    return {
+        present: true,
+        visible: visible,
+        // Like WebElement.text, hidden elements have no text
+        text: visible ? el.innerText.trim() : '',
+        attributes: attrs,
+        classes: Array.prototype.slice.call(el.classList)
+    };
+}
+
+var results = {};
+Object.keys(queries).forEach(function (name) {
+    var query = queries[name];
+    var elements = findAll(query.by, query.value);
+    if (query.all) {
+        results[name] = elements.map(describe);
+    } else if (elements.length) {
+        results[name] = describe(elements[0]);
+        results[name].count = elements.length;
+    } else {
+        results[name] = {present: false, visible: false, text: '', attributes: {}, classes: [], count: 0};
+    }
+});
+return results;
+"""
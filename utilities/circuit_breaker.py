@@ -0,0 +1,101 @@
+from urllib3.exceptions import HTTPError, NewConnectionError, MaxRetryError, TimeoutError as CommandTimeout
+from selenium.common.exceptions import WebDriverException, SessionNotCreatedException
+from config.config import CIRCUIT_BREAKER_THRESHOLD
+from utilities.driver_resolver import DriverResolutionError
+from utilities.logger import setup_logger
+
+logger = setup_logger("CircuitBreaker")
+
+# Failure classes that point at the environment rather than at the application under test
+NAVIGATION = "navigation error"
+CONNECTION = "connection refused"
+SESSION = "session creation failure"
+
+# Browser error pages: Chromium reports net::ERR_* codes, Firefox an about:neterror page
+NAVIGATION_MARKERS = ("net::ERR_", "about:neterror", "Reached error page")
+
+def classify_failure(error):
+    """
+    Tell whether an exception was caused by the environment
+
+    The exception and the exceptions it was raised from are inspected, so a wrapped
+    failure (e.g. a session failure re-raised by a fixture) is still recognized. Only
+    refused connections count as connection failures; a command that timed out means
+    a hung browser, which the driver pool respawns, not an unreachable environment.
+
+    Args:
+        error: Exception raised by a test or its setup
+
+    Returns:
+        str: NAVIGATION, CONNECTION or SESSION, None for other failures
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (SessionNotCreatedException, DriverResolutionError)):
+            return SESSION
+        if isinstance(error, (ConnectionRefusedError, NewConnectionError)):
+            return CONNECTION
+        if isinstance(error, (CommandTimeout, TimeoutError)):
+            return None
+        if isinstance(error, MaxRetryError):
+            # Retries exhausted; what counts is the error of the last attempt
+            error = error.reason
+            continue
+        if isinstance(error, WebDriverException) and any(marker in (error.msg or "") for marker in NAVIGATION_MARKERS):
+            return NAVIGATION
+        if isinstance(error, HTTPError) and "refused" in str(error).lower():
+            return CONNECTION
+        error = error.__cause__ or error.__context__
+    return None
+
+class CircuitBreaker:
+    """
+    Stops a run from spending the full wait and page-load timeouts on every test when
+    the site under test is unreachable or the browser driver is broken
+
+    After `threshold` consecutive environmental failures the breaker opens, and every
+    remaining test fails immediately with the failure that opened it. Any test that
+    passes or fails for another reason resets the count.
+    """
+
+    def __init__(self, threshold=CIRCUIT_BREAKER_THRESHOLD):
+        """
+        Initialize the CircuitBreaker
+
+        Args:
+            threshold: Consecutive environmental failures that open the breaker, 0 to disable
+        """
+        self.threshold = threshold
+        self.consecutive = 0
+        self.last_failure = None
+        self.reason = None
+        self.skipped = 0
+
+    @property
+    def is_open(self):
+        """Whether remaining tests are failed without running"""
+        return self.reason is not None
+
+    def record(self, test_id, error):
+        """
+        Record the outcome of a test phase
+
+        Args:
+            test_id: Node id of the test
+            error: Exception the phase failed with, None if it passed
+        """
+        if self.is_open or not self.threshold:
+            return
+        kind = classify_failure(error) if error is not None else None
+        if kind is None:
+            self.consecutive = 0
+            return
+
+        self.consecutive += 1
+        message = str(error).strip().splitlines()
+        self.last_failure = f"{kind} in {test_id}: {type(error).__name__}: {message[0] if message else ''}"
+        if self.consecutive >= self.threshold:
+            self.reason = (f"Circuit breaker opened after {self.consecutive} consecutive environmental failures; "
+                           f"last: {self.last_failure}")
+            logger.error(self.reason)
@@ -1,210 +1,334 @@
 import os
 import re
 import glob
+import time
 import shutil
-from datetime import datetime
-from config.config import REPORTS_DIR, SCREENSHOTS_DIR
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from config.config import REPORTS_DIR, SCREENSHOTS_DIR, CLEANUP_WORKERS, RETENTION_UNFINISHED_HOURS
+from utilities.artifact_catalog import ArtifactCatalog, REPORT, MANIFEST, SCREENSHOT, directory_size
+from utilities.screenshot_store import BLOBS_DIR
 
-def get_file_timestamp(filename):
+def open_catalog(rebuild=False):
     """
-    Extract timestamp from a filename
+    Open the artifact catalog, building it from the files on disk if needed
     
     Args:
-        filename: Name of the file
+        rebuild: Rebuild the catalog even if it exists
     
     Returns:
-        datetime object representing the timestamp in the filename
+        ArtifactCatalog: The project catalog
     """
-    # Extract timestamp in format YYYY-MM-DD_HH-MM-SS
-    match = re.search(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})', filename)
-    if match:
-        timestamp_str = match.group(1)
-        try:
-            return datetime.strptime(timestamp_str, '%Y-%m-%d_%H-%M-%S')
-        except ValueError:
-            # If conversion fails, return a very old date
-            return datetime.min
-    return datetime.min
+    catalog = ArtifactCatalog()
+    if rebuild or not catalog.exists:
+        count = catalog.rebuild(REPORTS_DIR, SCREENSHOTS_DIR)
+        print(f"Rebuilt artifact catalog with {count} artifact(s)")
+    return catalog
 
-def cleanup_reports(max_reports=5):
+def delete_run(path):
     """
-    Keep only the specified number of most recent reports
+    Delete a run directory as a whole
+    
+    The directory is first renamed out of the way, so a run is either complete or
+    gone, even if the deletion is interrupted.
     
     Args:
-        max_reports: Maximum number of reports to keep
+        path: Run directory (or report file of a run from before run directories)
     """
-    if not os.path.exists(REPORTS_DIR):
-        return
-        
-    # Get all HTML report files
-    report_files = glob.glob(os.path.join(REPORTS_DIR, "test_report_*.html"))
-    
-    # Sort by timestamp (newest first)
-    report_files.sort(key=get_file_timestamp, reverse=True)
+    if os.path.isdir(path):
+        trash = os.path.join(os.path.dirname(path), f".deleting_{os.path.basename(path)}")
+        os.rename(path, trash)
+        shutil.rmtree(trash)
+    elif os.path.exists(path):
+        os.remove(path)
+
+def parse_size(value):
+    """
+    Parse a byte size such as "500M" or "20G"
     
-    # Keep only the latest N reports
-    files_to_delete = report_files[max_reports:]
+    Args:
+        value: Number of bytes, optionally followed by K, M, G or T (powers of 1024)
     
-    # Delete older files
-    for file_path in files_to_delete:
-        try:
-            os.remove(file_path)
-            print(f"Deleted old report: {os.path.basename(file_path)}")
-        except Exception as e:
-            print(f"Error deleting report {file_path}: {e}")
+    Returns:
+        int: Size in bytes
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)B?\s*", str(value), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMGT".index(unit.upper() or " "))
 
-def cleanup_screenshots(option="match_reports", max_screenshots=None, reports_to_match=5):
+def format_size(size):
+    """Format a byte count for the cleanup summary"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+class DeletionBatch:
     """
-    Manage screenshots based on selected strategy
+    Collects the files and directories a cleanup removes and deletes them on a thread pool
     
-    Args:
-        option: "last_execution" to keep only latest screenshots, 
-                "match_reports" to organize screenshots to match reports
-        max_screenshots: Maximum number of screenshots to keep (only used with last_execution option)
-        reports_to_match: Number of latest reports to match screenshots with (only used with match_reports option)
+    Deletion is dominated by file system latency, so several paths are removed at once.
+    Instead of a line per file, the batch keeps per-kind totals that are printed as one
+    summary; in dry-run mode nothing is deleted and the summary tells what would be.
     """
-    if not os.path.exists(SCREENSHOTS_DIR):
-        return
     
-    # Check for important folder and delete it if it exists
-    important_folder = os.path.join(SCREENSHOTS_DIR, "important")
-    if os.path.exists(important_folder) and os.path.isdir(important_folder):
-        try:
-            shutil.rmtree(important_folder)
-            print(f"Removed 'important' folder as requested")
-        except Exception as e:
-            print(f"Error removing 'important' folder: {e}")
-           
-    # Get all screenshot files (only in the root screenshots directory)
-    screenshot_files = glob.glob(os.path.join(SCREENSHOTS_DIR, "*.png"))
-    
-    # If no unorganized screenshots in the root directory, we can proceed to cleanup existing folders
-    if len(screenshot_files) == 0 and option == "match_reports":
-        # Get all report files
-        report_files = glob.glob(os.path.join(REPORTS_DIR, "test_report_*.html"))
+    def __init__(self, dry_run=False, workers=CLEANUP_WORKERS):
+        """
+        Initialize the DeletionBatch
         
-        # Sort by timestamp (newest first)
-        report_files.sort(key=get_file_timestamp, reverse=True)
+        Args:
+            dry_run: Only report what would be deleted
+            workers: Number of deletion threads
+        """
+        self.dry_run = dry_run
+        self.workers = max(1, workers)
+        self.pending = []
+        # kind -> {"count", "bytes", "reasons"} over everything executed so far
+        self.totals = {}
+        self.errors = []
+    
+    def add(self, kind, path, size=0, reason=None):
+        """
+        Schedule a path for deletion
         
-        # Keep only the latest N reports
-        recent_reports = report_files[:reports_to_match]
+        Args:
+            kind: Label the path is summarized under, e.g. "run" or "screenshot"
+            path: File or directory to delete
+            size: Size in bytes, for the summary
+            reason: Why the path is deleted, for the summary (optional)
+        """
+        self.pending.append((kind, path, size or 0, reason))
+    
+    def execute(self):
+        """
+        Delete the scheduled paths
         
-        # Extract timestamps from reports
-        report_timestamps = [get_file_timestamp(r) for r in recent_reports]
-        valid_folder_names = [t.strftime('%Y-%m-%d_%H-%M-%S') for t in report_timestamps]
+        Returns:
+            set: Paths that were deleted (or would be, in dry-run mode)
+        """
+        pending, self.pending = self.pending, []
+        if self.dry_run:
+            results = [None] * len(pending)
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(self._delete, [path for _, path, _, _ in pending]))
+        
+        deleted = set()
+        for (kind, path, size, reason), error in zip(pending, results):
+            if error:
+                self.errors.append(f"{path}: {error}")
+                continue
+            deleted.add(path)
+            totals = self.totals.setdefault(kind, {"count": 0, "bytes": 0, "reasons": {}})
+            totals["count"] += 1
+            totals["bytes"] += size
+            if reason:
+                totals["reasons"][reason] = totals["reasons"].get(reason, 0) + 1
+        return deleted
+    
+    def summary(self):
+        """
+        Describe what was deleted
         
-        # Remove any folders that don't match recent report timestamps
-        timestamp_folders = [d for d in os.listdir(SCREENSHOTS_DIR) 
-                           if os.path.isdir(os.path.join(SCREENSHOTS_DIR, d))]
+        Returns:
+            str: One line per kind, followed by any errors
+        """
+        verb = "Would delete" if self.dry_run else "Deleted"
+        if not self.totals:
+            lines = [f"{verb} nothing"]
+        else:
+            lines = []
+            for kind, totals in sorted(self.totals.items()):
+                line = f"{verb} {totals['count']} {kind}(s), {format_size(totals['bytes'])}"
+                if totals["reasons"]:
+                    line += " (" + ", ".join(f"{reason}: {count}" for reason, count in sorted(totals["reasons"].items())) + ")"
+                lines.append(line)
+        lines += [f"Error deleting {error}" for error in self.errors]
+        return "\n".join(lines)
+    
+    @staticmethod
+    def _delete(path):
+        """Delete a path, returning the error instead of raising it"""
+        try:
+            delete_run(path)
+        except OSError as e:
+            return e
+        return None
+
+def select_expired_runs(catalog, max_reports=None, max_bytes=None, max_age_days=None, keep_failed=False):
+    """
+    Decide which runs the retention policies delete
+    
+    Runs are walked newest first against the catalog's size index. A run is deleted
+    when it is past the newest max_reports reported runs, older than max_age_days, or
+    does not fit into the max_bytes budget any more (every older run is then deleted
+    as well, so the newest runs are the ones that fit). Screenshots shared between runs
+    count once, towards the newest run referencing them. The newest run always fits,
+    runs without a report that started less than RETENTION_UNFINISHED_HOURS ago are
+    assumed to be still running and are kept, and with keep_failed runs with a failed
+    test are always kept.
+    
+    Args:
+        catalog: ArtifactCatalog to query
+        max_reports: Number of reported runs to keep (optional)
+        max_bytes: Total size budget in bytes (optional)
+        max_age_days: Maximum run age in days (optional)
+        keep_failed: Keep runs with failed tests regardless of the other policies
+    
+    Returns:
+        dict: run id -> (path, size in bytes, reason) of the runs to delete
+    """
+    now = time.time()
+    blobs_by_run = {}
+    for run_id, path, size in catalog.screenshot_references():
+        blobs_by_run.setdefault(run_id, []).append((path, size or 0))
+    
+    expired = {}
+    counted_blobs = set()
+    reports, used, over_budget, kept_any = 0, 0, False, False
+    for run_id, path, created, size, has_report, has_failures in catalog.run_index():
+        if size is None:
+            # Runs recorded before sizes were cached are measured once
+            size = directory_size(path)
+            catalog.set_run_size(run_id, size)
+        cost = size + sum(blob_size for blob, blob_size in blobs_by_run.get(run_id, ()) if blob not in counted_blobs)
         
-        for folder in timestamp_folders:
-            if folder not in valid_folder_names:
-                folder_path = os.path.join(SCREENSHOTS_DIR, folder)
-                try:
-                    shutil.rmtree(folder_path)
-                    print(f"Removed old screenshot folder: {folder}")
-                except Exception as e:
-                    print(f"Error removing folder {folder_path}: {e}")
+        reason = None
+        if has_report:
+            reports += 1
+        if not has_report and now - created < RETENTION_UNFINISHED_HOURS * 3600:
+            pass
+        elif max_reports is not None and (reports > max_reports or (not has_report and reports >= max_reports)):
+            reason = "count"
+        elif max_age_days is not None and now - created > max_age_days * 86400:
+            reason = "age"
+        elif max_bytes is not None and kept_any and (over_budget or used + cost > max_bytes):
+            over_budget = True
+            reason = "size"
+        if reason and keep_failed and has_failures:
+            reason = None
         
+        if reason:
+            expired[run_id] = (path, size, reason)
+        else:
+            kept_any = True
+            used += cost
+            counted_blobs.update(blob for blob, _ in blobs_by_run.get(run_id, ()))
+    return expired
+
+def cleanup_reports(max_reports=5, catalog=None, max_bytes=None, max_age_days=None, keep_failed=False, batch=None):
+    """
+    Delete the runs the retention policies no longer keep
+    
+    Runs are deleted with everything they wrote: report, logs, screenshot manifests
+    and shard output. See select_expired_runs for the policies.
+    
+    Args:
+        max_reports: Maximum number of reports to keep
+        catalog: ArtifactCatalog to query, defaults to the project catalog
+        max_bytes: Total size budget of the runs and their screenshots in bytes (optional)
+        max_age_days: Maximum run age in days (optional)
+        keep_failed: Always keep runs with failed tests
+        batch: DeletionBatch to delete with; by default a batch is created and its summary printed
+    """
+    catalog = catalog or open_catalog()
+    own_batch = batch is None
+    batch = batch or DeletionBatch()
+    
+    # Finish deletions an earlier cleanup was interrupted in
+    for trash in glob.glob(os.path.join(REPORTS_DIR, ".deleting_*")):
+        batch.add("interrupted deletion", trash)
+    
+    expired = select_expired_runs(catalog, max_reports, max_bytes, max_age_days, keep_failed)
+    for run_id, (path, size, reason) in expired.items():
+        batch.add("run", path, size, reason)
+    deleted = batch.execute()
+    
+    # Runs that could not be deleted stay in the catalog and keep their images; the
+    # images of deleted runs are collected by cleanup_screenshots unless a kept run shares them
+    old_runs = {run_id for run_id, (path, _, _) in expired.items() if path in deleted}
+    catalog.detach_screenshots(old_runs)
+    catalog.remove_runs(old_runs)
+    if own_batch:
+        print(batch.summary())
+
+def cleanup_screenshots(option="match_reports", max_screenshots=None, reports_to_match=5, catalog=None, batch=None):
+    """
+    Garbage-collect the screenshot store based on selected strategy
+    
+    Screenshots are stored once per distinct image and referenced from the manifests
+    in the run directories. The strategy decides which runs keep their screenshots;
+    every image that no such run references is then deleted. Runs and images are
+    looked up in the artifact catalog rather than by scanning the directories.
+    
+    Args:
+        option: "last_execution" to keep only the latest run's screenshots,
+                "match_reports" to keep the screenshots of every run that is still kept
+        max_screenshots: Maximum number of screenshots to keep (only used with last_execution option)
+        reports_to_match: Number of latest reports to keep screenshots for even if their run is no
+                          longer cataloged (only used with match_reports option)
+        catalog: ArtifactCatalog to query, defaults to the project catalog
+        batch: DeletionBatch to delete with; by default a batch is created and its summary printed
+    """
+    if not os.path.exists(SCREENSHOTS_DIR):
         return
+    catalog = catalog or open_catalog()
+    own_batch = batch is None
+    batch = batch or DeletionBatch()
     
-    # Handle screenshots based on the selected option
+    runs_with_screenshots = catalog.screenshot_counts()
     if option == "last_execution":
-        # Sort by timestamp (newest first)
-        screenshot_files.sort(key=get_file_timestamp, reverse=True)
-        
-        # If max_screenshots is None, find the newest timestamp and keep only files with that timestamp
         if max_screenshots is None:
-            if not screenshot_files:
-                return
-                
-            newest_timestamp = get_file_timestamp(screenshot_files[0])
-            files_to_keep = [f for f in screenshot_files if get_file_timestamp(f).date() == newest_timestamp.date()]
-            files_to_delete = [f for f in screenshot_files if f not in files_to_keep]
+            keep = {run_id for run_id, _, _ in runs_with_screenshots[:1]}
         else:
-            # Keep only the latest N screenshots
-            files_to_delete = screenshot_files[max_screenshots:]
-        
-        # Delete older files
-        for file_path in files_to_delete:
-            try:
-                os.remove(file_path)
-                print(f"Deleted old screenshot: {os.path.basename(file_path)}")
-            except Exception as e:
-                print(f"Error deleting screenshot {file_path}: {e}")
-                
+            # Keep the newest runs until the screenshot budget is used up
+            keep, kept_screenshots = set(), 0
+            for run_id, _, count in runs_with_screenshots:
+                if keep and kept_screenshots + count > max_screenshots:
+                    break
+                keep.add(run_id)
+                kept_screenshots += count
     elif option == "match_reports":
-        # Get all report files
-        report_files = glob.glob(os.path.join(REPORTS_DIR, "test_report_*.html"))
-        
-        # Sort by timestamp (newest first)
-        report_files.sort(key=get_file_timestamp, reverse=True)
-        
-        # Keep only the latest N reports
-        recent_reports = report_files[:reports_to_match]
-        
-        # Extract timestamps from reports
-        report_timestamps = [get_file_timestamp(r) for r in recent_reports]
-        
-        # Create folders for each report timestamp if they don't exist
-        for timestamp in report_timestamps:
-            folder_name = timestamp.strftime('%Y-%m-%d_%H-%M-%S')
-            folder_path = os.path.join(SCREENSHOTS_DIR, folder_name)
-            if not os.path.exists(folder_path):
-                os.makedirs(folder_path)
-        
-        # Move unorganized screenshots to appropriate folders based on timestamp
-        for screenshot in screenshot_files:
-            screenshot_timestamp = get_file_timestamp(screenshot)
-            
-            # Find the closest report timestamp
-            closest_timestamp = None
-            min_diff = float('inf')
-            
-            for report_timestamp in report_timestamps:
-                diff = abs((screenshot_timestamp - report_timestamp).total_seconds())
-                if diff < min_diff:
-                    min_diff = diff
-                    closest_timestamp = report_timestamp
-            
-            # If we found a close timestamp and it's within a reasonable time (1 hour)
-            if closest_timestamp and min_diff < 3600:
-                folder_name = closest_timestamp.strftime('%Y-%m-%d_%H-%M-%S')
-                folder_path = os.path.join(SCREENSHOTS_DIR, folder_name)
-                target_path = os.path.join(folder_path, os.path.basename(screenshot))
-                
-                try:
-                    shutil.move(screenshot, target_path)
-                    print(f"Moved screenshot {os.path.basename(screenshot)} to {folder_name}")
-                except Exception as e:
-                    print(f"Error moving screenshot {screenshot}: {e}")
-            else:
-                # If not matching any recent report, delete it
-                try:
-                    os.remove(screenshot)
-                    print(f"Deleted unmatched screenshot: {os.path.basename(screenshot)}")
-                except Exception as e:
-                    print(f"Error deleting screenshot {screenshot}: {e}")
-        
-        # Remove any folders that don't match recent report timestamps
-        timestamp_folders = [d for d in os.listdir(SCREENSHOTS_DIR) 
-                           if os.path.isdir(os.path.join(SCREENSHOTS_DIR, d))]
-        
-        valid_folder_names = [t.strftime('%Y-%m-%d_%H-%M-%S') for t in report_timestamps]
-        
-        for folder in timestamp_folders:
-            if folder not in valid_folder_names:
-                folder_path = os.path.join(SCREENSHOTS_DIR, folder)
-                try:
-                    shutil.rmtree(folder_path)
-                    print(f"Removed old screenshot folder: {folder}")
-                except Exception as e:
-                    print(f"Error removing folder {folder_path}: {e}")
+        # Keep the screenshots of every run that survived retention (including runs kept by
+        # keep_failed, age or size policies beyond the latest reports), the latest N reports
+        # and runs that have not written their report yet, so no kept report loses its images
+        reported = {run_id for run_id, _, _ in catalog.newest(REPORT)}
+        keep = {run_id for run_id, *_ in catalog.run_index()}
+        keep |= {run_id for run_id, _, _ in catalog.newest(REPORT, limit=reports_to_match)}
+        keep |= {run_id for run_id, _, _ in runs_with_screenshots if run_id not in reported}
     else:
         print(f"Unknown cleanup option: {option}")
+        return
+    
+    # Only blobs live in the screenshots directory, anything else is from older layouts
+    for entry in os.listdir(SCREENSHOTS_DIR):
+        if entry != BLOBS_DIR:
+            batch.add("old screenshot entry", os.path.join(SCREENSHOTS_DIR, entry))
+    
+    # Delete the manifests of the other runs and every image no kept run references
+    drop = {run_id for run_id, _, _ in runs_with_screenshots} - keep
+    for manifest_path in catalog.paths(drop, [MANIFEST]):
+        batch.add("manifest", manifest_path)
+    blobs = catalog.unreferenced_blobs(keep)
+    for blob, size in blobs:
+        batch.add("screenshot", blob, size)
+    batch.execute()
+    # Blobs recorded without a run (found by a rebuild) are gone now as well
+    catalog.remove_runs(drop | {""}, [MANIFEST, SCREENSHOT])
+    
+    # Drop emptied fan-out directories
+    for directory in {os.path.dirname(blob) for blob, _ in blobs}:
+        if not batch.dry_run and os.path.isdir(directory) and not os.listdir(directory):
+            os.rmdir(directory)
+    if own_batch:
+        print(batch.summary())
 
-def run_cleanup(max_reports=5, screenshot_option="match_reports", 
-               max_screenshots=None, reports_to_match=5):
+def run_cleanup(max_reports=5, screenshot_option="match_reports",
+               max_screenshots=None, reports_to_match=5, rebuild_catalog=False,
+               max_bytes=None, max_age_days=None, keep_failed=False, dry_run=False, workers=CLEANUP_WORKERS):
     """
     Run the cleanup process for both reports and screenshots
     
@@ -213,13 +337,27 @@ def run_cleanup(max_reports=5, screenshot_option="match_reports",
         screenshot_option: "last_execution" or "match_reports"
         max_screenshots: Number of screenshots to keep (for last_execution)
         reports_to_match: Number of reports to match screenshots with (for match_reports)
+        rebuild_catalog: Rebuild the artifact catalog from the files on disk first
+        max_bytes: Total size budget of the runs and their screenshots in bytes (optional)
+        max_age_days: Maximum run age in days (optional)
+        keep_failed: Always keep runs with failed tests
+        dry_run: Only print what would be deleted
+        workers: Number of deletion threads
     """
     print("Running cleanup process...")
+    catalog = open_catalog(rebuild_catalog)
+    batch = DeletionBatch(dry_run, workers)
     
-    # Clean up reports
-    cleanup_reports(max_reports)
-    
-    # Clean up screenshots
-    cleanup_screenshots(screenshot_option, max_screenshots, reports_to_match)
+    with tempfile.TemporaryDirectory() as scratch:
+        if dry_run:
+            # Work on a copy so the screenshot step sees the runs the report step would delete
+            catalog = catalog.snapshot(os.path.join(scratch, "catalog.db"))
+        
+        # Clean up reports
+        cleanup_reports(max_reports, catalog, max_bytes, max_age_days, keep_failed, batch)
+        
+        # Clean up screenshots
+        cleanup_screenshots(screenshot_option, max_screenshots, reports_to_match, catalog, batch)
     
-    print("Cleanup completed.") 
\ No newline at end of file
+    print(batch.summary())
+    print("Cleanup completed.")
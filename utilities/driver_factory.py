@@ -1,68 +1,153 @@
+import selenium
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from config.config import IMPLICIT_WAIT, PAGE_LOAD_TIMEOUT, WINDOW_SIZE, HEADLESS
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from config.config import IMPLICIT_WAIT, PAGE_LOAD_TIMEOUT, PAGE_LOAD_STRATEGY, WINDOW_SIZE, HEADLESS, COMMAND_TIMEOUT, RESOURCE_BLOCKING
+from utilities.driver_resolver import DriverResolver
+from utilities.wait_policy import set_implicit_wait
+from utilities.resource_blocking import blocked_url_patterns, apply_blocking, supports_blocking
+from utilities.logger import setup_logger
 import os
 
+# Set up logger
+logger = setup_logger("DriverFactory")
+
+# Selenium release whose RemoteConnection internals DriverFactory._bound_commands patches
+# (pinned in requirements.txt); other releases keep urllib3's default retries
+BOUND_COMMANDS_SELENIUM_VERSION = "4.15.2"
+if selenium.__version__ != BOUND_COMMANDS_SELENIUM_VERSION:
+    logger.warning(f"Selenium {selenium.__version__} is not {BOUND_COMMANDS_SELENIUM_VERSION}: commands are not "
+                   f"protected from retries and may take several times COMMAND_TIMEOUT to fail")
+
 class DriverFactory:
     """
     Factory class for creating WebDriver instances with proper configuration
     """
     
     @staticmethod
-    def get_driver(browser):
+    def get_driver(browser, headless=None, blocking=RESOURCE_BLOCKING):
         """
         Initialize the WebDriver based on the browser specified
         
         Args:
             browser (str): Browser name - chrome, firefox, or edge
+            headless (bool): Run without a visible window (defaults to HEADLESS from config)
+            blocking (str): Resource blocking profile from RESOURCE_BLOCKING_PROFILES (Chrome and Edge)
             
         Returns:
             WebDriver: An instance of the specified browser driver
         """
+        if headless is None:
+            headless = HEADLESS
+        # Validate the profile before starting a browser
+        block = bool(blocked_url_patterns(blocking))
+        
+        # Bound every command, so a hung browser fails the command instead of blocking the run
+        RemoteConnection.set_timeout(COMMAND_TIMEOUT)
+        # Start the driver in its own process group, so a hung browser can be killed with it
+        service_args = {"popen_kw": {"start_new_session": True}} if os.name == "posix" else {}
+        
         if browser.lower() == "chrome":
             options = webdriver.ChromeOptions()
-            if HEADLESS:
+            options.page_load_strategy = PAGE_LOAD_STRATEGY
+            if headless:
                 options.add_argument("--headless")
             options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
             options.add_argument("--disable-gpu")
             options.add_argument("--disable-extensions")
+            if block:
+                DriverFactory._log_network(options, "goog:loggingPrefs")
             
             # Use the manually downloaded ChromeDriver
             chrome_driver_path = os.path.expanduser("~/.webdriver/chromedriver")
             if os.path.exists(chrome_driver_path):
-                driver = webdriver.Chrome(service=ChromeService(chrome_driver_path), options=options)
+                driver = webdriver.Chrome(service=ChromeService(chrome_driver_path, **service_args), options=options)
             else:
-                # Fallback to webdriver_manager
-                from webdriver_manager.chrome import ChromeDriverManager
-                driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
+                # Fallback to the cached driver resolver
+                driver = webdriver.Chrome(service=ChromeService(DriverResolver.resolve("chrome"), **service_args), options=options)
         
         elif browser.lower() == "firefox":
             options = webdriver.FirefoxOptions()
-            if HEADLESS:
+            options.page_load_strategy = PAGE_LOAD_STRATEGY
+            if headless:
                 options.add_argument("--headless")
             options.add_argument(f"--width={WINDOW_SIZE[0]}")
             options.add_argument(f"--height={WINDOW_SIZE[1]}")
-            driver = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()), options=options)
+            driver = webdriver.Firefox(service=FirefoxService(DriverResolver.resolve("firefox"), **service_args), options=options)
         
         elif browser.lower() == "edge":
             options = webdriver.EdgeOptions()
-            if HEADLESS:
+            options.page_load_strategy = PAGE_LOAD_STRATEGY
+            if headless:
                 options.add_argument("--headless")
             options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
-            driver = webdriver.Edge(service=EdgeService(EdgeChromiumDriverManager().install()), options=options)
+            if block:
+                DriverFactory._log_network(options, "ms:loggingPrefs")
+            driver = webdriver.Edge(service=EdgeService(DriverResolver.resolve("edge"), **service_args), options=options)
         
         else:
             raise Exception(f"Browser '{browser}' is not supported. Use chrome, firefox, or edge.")
         
+        DriverFactory._bound_commands(driver)
+        
         # Set timeouts
-        driver.implicitly_wait(IMPLICIT_WAIT)
+        driver._implicit_wait = IMPLICIT_WAIT  # Read by the wait policy to restore it after explicit waits
+        set_implicit_wait(driver, IMPLICIT_WAIT)
         driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
         driver.maximize_window()
         
-        return driver 
\ No newline at end of file
+        # Block the profile's requests in the initial window
+        if block:
+            if supports_blocking(driver):
+                apply_blocking(driver, blocking)
+            else:
+                logger.warning(f"Resource blocking needs CDP, which {browser} does not offer; loading all resources")
+        
+        return driver
+    
+    @staticmethod
+    def _bound_commands(driver):
+        """
+        Make COMMAND_TIMEOUT the wall-clock ceiling of a command
+        
+        The timeout itself is set with the public RemoteConnection.set_timeout. urllib3
+        retries a request that timed out up to 3 times by default, so a command to a
+        hung browser would only fail after 4 times the timeout. Commands are sent without
+        retries instead; the driver runs locally, so a retry would hit the same hung
+        browser anyway. Selenium 4.15 has no public setting for the retries (ClientConfig
+        came later), so the connection manager is patched, only on the release it was
+        written against.
+        
+        Args:
+            driver: WebDriver instance
+        """
+        if selenium.__version__ != BOUND_COMMANDS_SELENIUM_VERSION:
+            return
+        executor = driver.command_executor
+        make_manager = executor._get_connection_manager
+        
+        def connection_manager():
+            manager = make_manager()
+            manager.connection_pool_kw["retries"] = False
+            return manager
+        
+        executor._get_connection_manager = connection_manager
+        if executor.keep_alive:
+            executor._conn.clear()
+            executor._conn = connection_manager()
+    
+    @staticmethod
+    def _log_network(options, capability):
+        """
+        Enable the performance log with network events only, used to count blocked requests
+        
+        Args:
+            options: Chromium options
+            capability: Vendor logging preferences capability name
+        """
+        options.set_capability(capability, {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False}) 
\ No newline at end of file
@@ -0,0 +1,477 @@
+import os
+import time
+import signal
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from urllib3.exceptions import HTTPError
+from selenium.common.exceptions import WebDriverException, NoAlertPresentException, InvalidSessionIdException
+from config.config import (DRIVER_POOL_SIZE, DRIVER_POOL_MAX_LEASES, ISOLATION_MODE, WINDOW_SIZE,
+                           COMMAND_TIMEOUT, HEALTH_CHECK_TIMEOUT, RESOURCE_BLOCKING)
+from utilities.driver_factory import DriverFactory
+from utilities.resource_blocking import BlockingStats, apply_blocking, blocked_url_patterns
+from utilities.logger import setup_logger
+
+# Set up logger
+logger = setup_logger("DriverPool")
+
+ISOLATION_MODES = ("reset", "context", "restart")
+
+class DriverPool:
+    """
+    Pool of warm WebDriver instances that are leased to tests and isolated between leases
+
+    Isolation modes:
+        reset: clear cookies, storage and extra windows of the browser on return
+        context: open every lease in a new incognito-style browser context of the warm
+                 browser and dispose of it on return (Chromium only, others use reset)
+        restart: quit the browser on return and start a new one
+
+    Browsers whose session died or hung (no answer within COMMAND_TIMEOUT) are killed
+    and respawned before the next lease; these events are kept for the test report.
+    """
+
+    def __init__(self, browser, size=DRIVER_POOL_SIZE, max_leases=DRIVER_POOL_MAX_LEASES, headless=None,
+                 isolation=ISOLATION_MODE, blocking=RESOURCE_BLOCKING):
+        """
+        Initialize the DriverPool
+
+        Args:
+            browser (str): Browser name - chrome, firefox, or edge
+            size (int): Number of browsers to keep warm
+            max_leases (int): Number of leases after which a browser is recycled
+            headless (bool): Run browsers without a visible window (defaults to config)
+            isolation (str): "reset", "context" or "restart"
+            blocking (str): Resource blocking profile for tests that do not need full rendering
+        """
+        if isolation not in ISOLATION_MODES:
+            raise ValueError(f"Unknown isolation mode: {isolation}. Use {', '.join(ISOLATION_MODES)}.")
+        if isolation == "context" and browser.lower() not in ("chrome", "edge"):
+            logger.warning(f"Browser contexts need CDP, which {browser} does not offer; isolating by reset instead")
+            isolation = "reset"
+        self.browser = browser
+        self.headless = headless
+        self.size = size
+        self.max_leases = max_leases
+        self.isolation = isolation
+        self.blocking = blocking
+        # Blocked requests are counted on Chromium browsers, the only ones that block
+        chromium = browser.lower() in ("chrome", "edge")
+        self.blocking_stats = BlockingStats() if chromium and blocked_url_patterns(blocking) else None
+        # driver -> blocking profile active in the window the driver is switched to
+        self._blocking = {}
+        self._idle = deque()
+        self._leased = set()
+        self._lease_counts = {}
+        # driver -> (browser context id, window handle of the default context) while leased
+        self._contexts = {}
+        # driver -> seconds spent isolating the current lease
+        self._isolation_time = {}
+        # Watchdog events not yet picked up by drain_events()
+        self._events = []
+        # Health pings run here so a hung browser cannot block a lease for long
+        self._pinger = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver-watchdog")
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "spawns": 0,
+            "spawn_seconds": 0.0,
+            "resets": 0,
+            "reset_seconds": 0.0,
+            "recycled": 0,
+            "health_failures": 0,
+            "isolations": 0,
+            "isolation_seconds": 0.0,
+            "respawns": 0
+        }
+
+    def start(self):
+        """
+        Pre-spawn the configured number of browsers
+
+        Returns:
+            DriverPool: Self reference for method chaining
+        """
+        logger.info(f"Warming driver pool with {self.size} {self.browser} browser(s)")
+        for _ in range(self.size):
+            driver = self._spawn()
+            with self._lock:
+                self._idle.append(driver)
+        return self
+
+    def lease(self, full_render=False):
+        """
+        Lease a healthy browser from the pool, spawning one on a miss
+
+        Args:
+            full_render: Load every resource, ignoring the resource blocking profile
+
+        Returns:
+            WebDriver: A reset WebDriver instance
+        """
+        driver = None
+        while driver is None:
+            with self._lock:
+                candidate = self._idle.popleft() if self._idle else None
+            if candidate is None:
+                break
+            problem = self._health_problem(candidate)
+            if problem is None:
+                driver = candidate
+            else:
+                self.stats["health_failures"] += 1
+                self._respawn(candidate, problem)
+
+        if driver is None:
+            self.stats["misses"] += 1
+            driver = self._spawn()
+        else:
+            self.stats["hits"] += 1
+
+        with self._lock:
+            self._leased.add(driver)
+            self._lease_counts[driver] += 1
+            self._isolation_time[driver] = 0.0
+
+        if self.isolation == "context":
+            start = time.perf_counter()
+            try:
+                self._open_context(driver)
+            except (WebDriverException, HTTPError) as e:
+                # The lease never started, so there is nothing to isolate or account for
+                with self._lock:
+                    self._isolation_time.pop(driver, None)
+                self.discard(driver)
+                raise WebDriverException(f"Could not open a browser context: {e}") from e
+            with self._lock:
+                self._isolation_time[driver] += time.perf_counter() - start
+
+        if self.blocking_stats is not None:
+            profile = "none" if full_render else self.blocking
+            if self._blocking.get(driver) != profile:
+                try:
+                    apply_blocking(driver, profile)
+                except WebDriverException as e:
+                    self.release(driver)
+                    raise WebDriverException(f"Could not apply resource blocking profile {profile}: {e}") from e
+                self._blocking[driver] = profile
+        return driver
+
+    def release(self, driver, suspect=False):
+        """
+        Return a leased browser to the pool, isolating it from the next lease or recycling it
+
+        Args:
+            driver: WebDriver instance previously returned by lease()
+            suspect: The test failed in a way that suggests the browser died or hung; it
+                     is pinged first, so a hung browser does not stall the isolation commands
+
+        Returns:
+            float: Seconds this lease spent on isolation (opening and disposing of its
+                   browser context, resetting the browser or restarting it)
+        """
+        with self._lock:
+            self._leased.discard(driver)
+            lease_count = self._lease_counts.get(driver, 0)
+        if self.blocking_stats is not None and not suspect:
+            self.blocking_stats.collect(driver)
+        start = time.perf_counter()
+
+        try:
+            problem = self._health_problem(driver) if suspect else None
+            if problem:
+                self._respawn(driver, problem)
+                return self._finish_isolation(driver, start)
+
+            if self.isolation == "restart" or lease_count >= self.max_leases:
+                if self.isolation != "restart":
+                    logger.info(f"Recycling browser after {lease_count} leases")
+                    self.stats["recycled"] += 1
+                self._discard(driver)
+                self._replenish()
+                return self._finish_isolation(driver, start)
+
+            try:
+                if driver in self._contexts:
+                    self._close_context(driver)
+                else:
+                    self._reset(driver)
+            except (WebDriverException, HTTPError) as e:
+                problem = self._crash_reason(driver, e)
+                if problem:
+                    self._respawn(driver, problem)
+                else:
+                    logger.warning(f"Browser isolation failed, recycling it: {e}")
+                    self.stats["recycled"] += 1
+                    self._discard(driver)
+                    self._replenish()
+                return self._finish_isolation(driver, start)
+
+            with self._lock:
+                self._idle.append(driver)
+            return self._finish_isolation(driver, start)
+        finally:
+            self._contexts.pop(driver, None)
+
+    def discard(self, driver):
+        """
+        Remove a leased browser from the pool without returning it
+
+        Args:
+            driver: WebDriver instance previously returned by lease()
+        """
+        with self._lock:
+            self._leased.discard(driver)
+        self._discard(driver)
+        self._replenish()
+
+    def shutdown(self):
+        """Quit every browser owned by the pool"""
+        with self._lock:
+            drivers = list(self._idle) + list(self._leased)
+            self._idle.clear()
+            self._leased.clear()
+        for driver in drivers:
+            self._discard(driver)
+        self._pinger.shutdown(wait=False)
+
+    def drain_events(self):
+        """
+        Get the watchdog events since the last call
+
+        Returns:
+            list: Descriptions of the browsers that were found dead or hung and respawned
+        """
+        with self._lock:
+            events, self._events = self._events, []
+        return events
+
+    def get_stats(self):
+        """
+        Get pool counters for sizing the pool
+
+        Returns:
+            dict: Hit/miss counts and spawn/reset latencies
+        """
+        stats = dict(self.stats)
+        leases = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / leases if leases else 0.0
+        stats["avg_spawn_ms"] = 1000 * stats["spawn_seconds"] / stats["spawns"] if stats["spawns"] else 0.0
+        stats["avg_reset_ms"] = 1000 * stats["reset_seconds"] / stats["resets"] if stats["resets"] else 0.0
+        stats["isolation"] = self.isolation
+        if self.blocking_stats is not None:
+            stats["blocking"] = self.blocking
+            stats.update(self.blocking_stats.summary())
+        stats["avg_isolation_ms"] = (1000 * stats["isolation_seconds"] / stats["isolations"]
+                                     if stats["isolations"] else 0.0)
+        return stats
+
+    def _spawn(self):
+        """Start a new browser and register it with the pool"""
+        start = time.perf_counter()
+        driver = DriverFactory.get_driver(self.browser, headless=self.headless, blocking=self.blocking)
+        self.stats["spawns"] += 1
+        self.stats["spawn_seconds"] += time.perf_counter() - start
+        with self._lock:
+            self._lease_counts[driver] = 0
+            self._blocking[driver] = self.blocking
+        return driver
+
+    def _replenish(self):
+        """Spawn browsers until the pool is back at its configured size"""
+        with self._lock:
+            missing = self.size - len(self._idle) - len(self._leased)
+        for _ in range(max(missing, 0)):
+            try:
+                driver = self._spawn()
+            except WebDriverException as e:
+                logger.error(f"Failed to replenish driver pool: {e}")
+                return
+            with self._lock:
+                self._idle.append(driver)
+
+    def _finish_isolation(self, driver, start):
+        """Account for the isolation work of a lease and return its total in seconds"""
+        with self._lock:
+            seconds = self._isolation_time.pop(driver, 0.0) + time.perf_counter() - start
+        self.stats["isolations"] += 1
+        self.stats["isolation_seconds"] += seconds
+        return seconds
+
+    def _open_context(self, driver):
+        """
+        Switch the browser to a window in a new browser context
+
+        A browser context has its own cookies, storage and cache, like a new
+        incognito profile, but costs no more than opening a tab.
+
+        Args:
+            driver: Chromium WebDriver instance
+        """
+        home = driver.current_window_handle
+        context_id = driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+        self._contexts[driver] = (context_id, home)
+        target = driver.execute_cdp_cmd("Target.createTarget", {
+            "url": "about:blank",
+            "browserContextId": context_id,
+            "newWindow": True,
+            "width": WINDOW_SIZE[0],
+            "height": WINDOW_SIZE[1]
+        })
+        # ChromeDriver uses the CDP target id as the window handle
+        driver.switch_to.window(target["targetId"])
+        self._blocking[driver] = "none"
+
+    def _close_context(self, driver):
+        """
+        Dispose of the lease's browser context with every window it opened
+
+        Args:
+            driver: Chromium WebDriver instance
+        """
+        context_id, home = self._contexts[driver]
+        driver.switch_to.window(home)
+        driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+
+    def _discard(self, driver, kill=False):
+        """
+        Quit a browser and forget about it
+
+        Args:
+            driver: WebDriver instance
+            kill: Kill the driver process and the browser it started instead of asking a
+                  dead or hung session to quit
+        """
+        with self._lock:
+            self._lease_counts.pop(driver, None)
+            self._contexts.pop(driver, None)
+            self._blocking.pop(driver, None)
+        process = self._driver_process(driver)
+        if kill and process is not None:
+            self._kill(driver, process)
+            return
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting browser: {e}")
+
+    def _respawn(self, driver, problem):
+        """Kill a dead or hung browser, record the event and start a replacement"""
+        event = f"{self.browser} browser {problem}; respawned it"
+        logger.warning(event)
+        with self._lock:
+            self._events.append(event)
+        self.stats["respawns"] += 1
+        self._discard(driver, kill=True)
+        self._replenish()
+
+    def _health_problem(self, driver):
+        """
+        Check that the browser session still responds
+
+        Args:
+            driver: WebDriver instance
+
+        Returns:
+            str: What is wrong with the browser, None if it is healthy
+        """
+        process = self._driver_process(driver)
+        if process is not None and process.poll() is not None:
+            return f"driver process exited with code {process.returncode}"
+        ping = self._pinger.submit(lambda: driver.current_window_handle)
+        try:
+            ping.result(timeout=HEALTH_CHECK_TIMEOUT)
+        except FutureTimeout:
+            # The ping thread stays blocked until the browser is killed; ping others on a new one
+            self._pinger.shutdown(wait=False)
+            self._pinger = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver-watchdog")
+            return f"did not answer the health ping within {HEALTH_CHECK_TIMEOUT}s"
+        except (WebDriverException, HTTPError) as e:
+            return f"failed the health ping ({type(e).__name__})"
+        return None
+
+    def _crash_reason(self, driver, error):
+        """
+        Tell whether a failed command means the browser died or hung
+
+        Args:
+            driver: WebDriver instance
+            error: Exception raised by the command
+
+        Returns:
+            str: What happened to the browser, None for an ordinary command failure
+        """
+        if isinstance(error, HTTPError):
+            return f"did not answer a command within {COMMAND_TIMEOUT}s"
+        if isinstance(error, InvalidSessionIdException):
+            return "lost its session"
+        process = self._driver_process(driver)
+        if process is not None and process.poll() is not None:
+            return f"driver process exited with code {process.returncode}"
+        return None
+
+    @staticmethod
+    def _kill(driver, process):
+        """
+        Kill a driver process with the browser processes it started
+
+        The driver factory starts every driver in its own process group on POSIX, so
+        killing the group also kills the browser, even if the driver already exited;
+        elsewhere only the driver is killed.
+
+        Args:
+            driver: WebDriver instance
+            process: Popen of the driver
+        """
+        if getattr(driver.service, "popen_kw", {}).get("start_new_session"):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+    @staticmethod
+    def _driver_process(driver):
+        """Get the driver (e.g. chromedriver) process of a browser, if it runs locally"""
+        return getattr(getattr(driver, "service", None), "process", None)
+
+    def _reset(self, driver):
+        """
+        Reset browser state between leases
+
+        Args:
+            driver: WebDriver instance to reset
+        """
+        start = time.perf_counter()
+
+        # Dismiss any alert left open by the previous test
+        try:
+            driver.switch_to.alert.dismiss()
+        except NoAlertPresentException:
+            pass
+
+        # Close every window except the first one
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # Clear storage for the current origin, then cookies
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            # Storage is not accessible on some pages (e.g. about:blank)
+            pass
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            driver.delete_all_cookies()
+
+        driver.get("about:blank")
+
+        self.stats["resets"] += 1
+        self.stats["reset_seconds"] += time.perf_counter() - start
@@ -0,0 +1,195 @@
+import os
+import json
+import time
+from config.config import DRIVER_CACHE_DIR, DRIVER_OFFLINE, DRIVER_LOCK_TIMEOUT, DRIVER_LOCK_STALE_AGE
+from utilities.logger import setup_logger
+
+# Set up logger
+logger = setup_logger("DriverResolver")
+
+MANIFEST_PATH = os.path.join(DRIVER_CACHE_DIR, "manifest.json")
+LOCK_PATH = os.path.join(DRIVER_CACHE_DIR, "manifest.lock")
+
+class DriverResolutionError(Exception):
+    """Raised when a driver binary cannot be resolved"""
+
+class _FileLock:
+    """
+    Cross-process lock based on exclusive creation of a lock file holding the owner's PID
+    """
+
+    def __init__(self, path, timeout=DRIVER_LOCK_TIMEOUT, stale_age=DRIVER_LOCK_STALE_AGE):
+        """
+        Initialize the lock
+
+        Args:
+            path: Path of the lock file
+            timeout: Seconds to wait for the lock before failing
+            stale_age: Age after which a lock whose owner cannot be checked is considered stale
+        """
+        self.path = path
+        self.timeout = timeout
+        self.stale_age = stale_age
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if self._is_stale():
+                        logger.warning(f"Removing stale driver lock: {self.path}")
+                        os.remove(self.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise DriverResolutionError(f"Timed out waiting for driver lock {self.path}")
+                time.sleep(0.1)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _is_stale(self):
+        """
+        Check whether the lock was left behind by a process that is gone
+
+        A live owner keeps its lock however long its download takes. The age is only
+        used when the owner cannot be checked: a lock file whose PID is not written yet,
+        or a platform without signal 0.
+
+        Returns:
+            bool: True if the lock can be broken
+        """
+        with open(self.path) as f:
+            owner = f.read().strip()
+        if owner.isdigit() and os.name == "posix":
+            try:
+                os.kill(int(owner), 0)
+            except ProcessLookupError:
+                return True
+            except PermissionError:
+                # The PID exists but belongs to another user
+                return False
+            return False
+        return time.time() - os.path.getmtime(self.path) > self.stale_age
+
+class DriverResolver:
+    """
+    Resolves driver binaries once per browser version and caches their paths in an on-disk manifest
+    """
+
+    # Paths already resolved by this process, keyed by browser name
+    _resolved = {}
+
+    @classmethod
+    def resolve(cls, browser):
+        """
+        Get the path of the driver binary for a browser
+
+        Args:
+            browser (str): Browser name - chrome, firefox, or edge
+
+        Returns:
+            str: Path to the driver binary
+        """
+        browser = browser.lower()
+        if browser in cls._resolved:
+            return cls._resolved[browser]
+
+        version = cls._get_browser_version(browser)
+        key = f"{browser}-{version}"
+
+        # Fast path: another process (or an earlier run) already resolved it
+        path = cls._lookup(key)
+        if path is None:
+            if DRIVER_OFFLINE:
+                raise DriverResolutionError(
+                    f"Offline mode: no cached driver for '{key}' in {MANIFEST_PATH}. "
+                    f"Run once with network access or unset DRIVER_OFFLINE."
+                )
+            os.makedirs(DRIVER_CACHE_DIR, exist_ok=True)
+            with _FileLock(LOCK_PATH):
+                # Re-check now that we hold the lock, a parallel worker may have won the race
+                path = cls._lookup(key)
+                if path is None:
+                    logger.info(f"Resolving driver binary for {key}")
+                    path = cls._install(browser)
+                    cls._store(key, path)
+
+        cls._resolved[browser] = path
+        return path
+
+    @staticmethod
+    def _get_browser_version(browser):
+        """
+        Detect the installed browser version
+
+        Args:
+            browser (str): Browser name - chrome, firefox, or edge
+
+        Returns:
+            str: Browser version, or "unknown" if it cannot be detected
+        """
+        from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+        browser_types = {
+            "chrome": ChromeType.GOOGLE,
+            "firefox": "firefox",
+            "edge": ChromeType.MSEDGE
+        }
+        if browser not in browser_types:
+            raise Exception(f"Browser '{browser}' is not supported. Use chrome, firefox, or edge.")
+        try:
+            version = OperationSystemManager().get_browser_version_from_os(browser_types[browser])
+        except Exception as e:
+            logger.warning(f"Could not detect {browser} version: {e}")
+            version = None
+        return version or "unknown"
+
+    @staticmethod
+    def _read_manifest():
+        """Read the manifest, returning an empty one if it is missing or corrupt"""
+        try:
+            with open(MANIFEST_PATH) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @classmethod
+    def _lookup(cls, key):
+        """Get the cached driver path for a key if the binary still exists"""
+        entry = cls._read_manifest().get(key)
+        if entry and os.path.exists(entry["path"]):
+            return entry["path"]
+        return None
+
+    @classmethod
+    def _store(cls, key, path):
+        """Record a resolved driver path in the manifest (caller must hold the lock)"""
+        manifest = cls._read_manifest()
+        manifest[key] = {"path": path, "resolved_at": time.strftime("%Y-%m-%d_%H-%M-%S")}
+        tmp_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, MANIFEST_PATH)
+
+    @staticmethod
+    def _install(browser):
+        """Download (or locate in the webdriver_manager cache) the driver binary"""
+        if browser == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager().install()
+        elif browser == "firefox":
+            from webdriver_manager.firefox import GeckoDriverManager
+            return GeckoDriverManager().install()
+        elif browser == "edge":
+            from webdriver_manager.microsoft import EdgeChromiumDriverManager
+            return EdgeChromiumDriverManager().install()
+        raise Exception(f"Browser '{browser}' is not supported. Use chrome, firefox, or edge.")
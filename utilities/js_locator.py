@@ -0,0 +1,53 @@
+# JavaScript helpers shared by scripts that locate elements inside the page.
+# findAll(by, value) mirrors the Selenium locator strategies (the first item of a
+# (by, value) locator tuple) and isVisible(el) approximates WebElement.is_displayed().
+LOCATOR_JS = """
+function findAll(by, value) {
+    var toArray = function (nodes) { return Array.prototype.slice.call(nodes); };
+    switch (by) {
+        case 'id':
+            var byId = document.getElementById(value);
+            return byId ? [byId] : [];
+        case 'css selector':
+            return toArray(document.querySelectorAll(value));
+        case 'xpath':
+            var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var found = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                found.push(snapshot.snapshotItem(i));
+            }
+            return found;
+        case 'name':
+            return toArray(document.getElementsByName(value));
+        case 'class name':
+            return toArray(document.getElementsByClassName(value));
+        case 'tag name':
+            return toArray(document.getElementsByTagName(value));
+        case 'link text':
+            return toArray(document.querySelectorAll('a')).filter(function (a) { return a.innerText.trim() === value; });
+        case 'partial link text':
+            return toArray(document.querySelectorAll('a')).filter(function (a) { return a.innerText.indexOf(value) !== -1; });
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+
+function isVisible(el) {
+    if (!el || !el.isConnected) {
+        return false;
+    }
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' || style.visibility === 'collapse') {
+        return false;
+    }
+    if (!el.getClientRects().length) {
+        return false;
+    }
+    for (var node = el; node && node.nodeType === 1; node = node.parentElement) {
+        if (parseFloat(window.getComputedStyle(node).opacity) === 0) {
+            return false;
+        }
+    }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 || rect.height > 0;
+}
+"""
@@ -0,0 +1,192 @@
+import os
+import shutil
+from html import escape
+from datetime import datetime
+from utilities.logger import setup_logger
+
+logger = setup_logger("LinkedReport")
+
+HEADER = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; font-size: 13px; }}
+table {{ border-collapse: collapse; margin-bottom: 20px; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; vertical-align: top; }}
+tr.passed td:nth-child(2) {{ color: green; }}
+tr.failed td:nth-child(2), tr.error td:nth-child(2) {{ color: red; }}
+tr.skipped td:nth-child(2) {{ color: orange; }}
+pre {{ max-width: 1000px; max-height: 400px; overflow: auto; white-space: pre-wrap; }}
+img {{ border: 1px solid #ccc; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>Started {started}</p>
+<table>
+<tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Details</th></tr>
+"""
+
+FOOTER = """</table>
+<p>{total} tests finished {finished}: {summary}</p>
+</body>
+</html>
+"""
+
+class LinkedReport:
+    """
+    HTML report written row by row as tests finish
+
+    Artifacts are not inlined: they live in a "<report>_files" directory next to the
+    report and are referenced by relative path, so the report stays small however many
+    tests fail and is readable while the run is still going.
+    """
+
+    def __init__(self, path, title="Automation Test Report"):
+        """
+        Initialize the LinkedReport
+
+        Args:
+            path: Path of the HTML report
+            title: Report title
+        """
+        self.path = path
+        self.title = title
+        self.artifacts_dir = f"{os.path.splitext(path)[0]}_files"
+        self.counts = {}
+        # (source, destination) pairs linked into the artifacts directory on close
+        self.pending_artifacts = []
+        self.file = None
+
+    def open(self):
+        """Create the report and write its header"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.file.write(HEADER.format(title=escape(self.title),
+                                      started=datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        self.file.flush()
+
+    def artifact_href(self, name):
+        """
+        Get the link to an artifact relative to the report
+
+        Args:
+            name: File name inside the artifacts directory
+
+        Returns:
+            str: Relative URL of the artifact
+        """
+        return f"{os.path.basename(self.artifacts_dir)}/{name}"
+
+    def write_artifact(self, name, data):
+        """
+        Write an artifact next to the report
+
+        Args:
+            name: File name inside the artifacts directory
+            data: File content as bytes
+
+        Returns:
+            str: Relative URL of the artifact
+        """
+        os.makedirs(self.artifacts_dir, exist_ok=True)
+        with open(os.path.join(self.artifacts_dir, name), "wb") as f:
+            f.write(data)
+        return self.artifact_href(name)
+
+    def add_artifact(self, source_path):
+        """
+        Reference a file that is placed next to the report when the report is closed
+
+        The file may still be in the process of being written (e.g. by the screenshot
+        pipeline); it only has to exist by the time close() is called.
+
+        Args:
+            source_path: Path of the file
+
+        Returns:
+            str: Relative URL of the artifact
+        """
+        name = os.path.basename(source_path)
+        self.pending_artifacts.append((source_path, os.path.join(self.artifacts_dir, name)))
+        return self.artifact_href(name)
+
+    def add_row(self, test_id, outcome, duration, description=None, longrepr=None, extras=()):
+        """
+        Append a test row to the report and flush it to disk
+
+        Args:
+            test_id: Node id of the test
+            outcome: "passed", "failed", "error" or "skipped"
+            duration: Duration in seconds
+            description: Test description (optional)
+            longrepr: Failure or skip details (optional)
+            extras: pytest-html extras to render in the row
+        """
+        self.counts[outcome] = self.counts.get(outcome, 0) + 1
+        details = ""
+        if description:
+            details += f"<p>{escape(description)}</p>"
+        if longrepr:
+            details += f"<details><summary>Details</summary><pre>{escape(longrepr)}</pre></details>"
+        details += "".join(self._render_extra(extra) for extra in extras)
+
+        self.file.write(f"<tr class=\"{outcome}\"><td>{escape(test_id)}</td><td>{outcome}</td>"
+                        f"<td>{duration:.2f}s</td><td>{details}</td></tr>\n")
+        self.file.flush()
+
+    def pytest_runtest_logreport(self, report):
+        """Write a row for every test call, and for setup or teardown phases that did not pass"""
+        if report.when == "call":
+            outcome = report.outcome
+        elif report.failed:
+            outcome = "error"
+        elif report.skipped and report.when == "setup":
+            outcome = "skipped"
+        else:
+            return
+        longrepr = None
+        if report.skipped and isinstance(report.longrepr, tuple):
+            longrepr = report.longrepr[2]
+        elif not report.passed:
+            longrepr = report.longreprtext
+        self.add_row(report.nodeid, outcome, report.duration, getattr(report, "description", None),
+                     longrepr, getattr(report, "extras", []))
+
+    def close(self):
+        """Place the referenced artifacts next to the report and write the summary"""
+        for source, destination in self.pending_artifacts:
+            try:
+                os.makedirs(self.artifacts_dir, exist_ok=True)
+                if not os.path.exists(destination):
+                    # Hard links cost no space; copy when the store is on another file system
+                    try:
+                        os.link(source, destination)
+                    except OSError:
+                        shutil.copy2(source, destination)
+            except OSError as e:
+                logger.error(f"Failed to add artifact {source} to the report: {e}")
+
+        summary = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.counts.items()))
+        self.file.write(FOOTER.format(total=sum(self.counts.values()), summary=summary or "no tests",
+                                      finished=datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        self.file.close()
+
+    @staticmethod
+    def _render_extra(extra):
+        """Render a pytest-html extra dict as HTML"""
+        content = extra.get("content", "")
+        format_type = extra.get("format_type")
+        if format_type == "html":
+            return content
+        if format_type == "image":
+            # Images are given either as a path/URL or as a base64 payload
+            src = content
+            if not content.lower().endswith(f".{extra.get('extension') or 'png'}"):
+                src = f"data:{extra.get('mime_type')};base64,{content}"
+            return f"<img src=\"{escape(src)}\" alt=\"{escape(extra.get('name') or '')}\"/>"
+        if format_type == "url":
+            return f"<a href=\"{escape(content)}\">{escape(extra.get('name') or content)}</a>"
+        return f"<pre>{escape(str(content))}</pre>"
@@ -1,44 +1,135 @@
 import os
+import atexit
 import logging
-from datetime import datetime
-from config.config import LOGS_DIR
+import threading
+from queue import SimpleQueue
+from logging.handlers import QueueHandler, QueueListener
+from config.config import LOGS_DIR, WORKER_ID
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Records kept until the log file is opened; older ones are dropped past this count
+PENDING_RECORDS_LIMIT = 10000
+
+# Shared by every framework logger; created by the first setup_logger call
+_backend_lock = threading.Lock()
+_queue_handler = None
+_file_handler = None
+_listener = None
+
+class _InProcessQueueHandler(QueueHandler):
+    """
+    Queue handler that hands records over unformatted
+    
+    The stock handler merges the message arguments and renders tracebacks on the
+    calling thread so records can be pickled. The queue never leaves this process,
+    so all formatting is left to the listener thread.
+    """
+    
+    def prepare(self, record):
+        return record
+
+class _DeferredFileHandler(logging.FileHandler):
+    """
+    File handler that keeps its records in memory until start_logging() is called
+    
+    Importing the framework, collecting tests or linting must not leave an empty log
+    directory behind, which would also be counted as a run by the artifact catalog.
+    """
+    
+    def __init__(self, filename):
+        super().__init__(filename, encoding="utf-8", delay=True)
+        self.pending = []
+        self.started = False
+    
+    def start(self):
+        """Write the records kept so far and every later record to the log file"""
+        self.acquire()
+        try:
+            if self.started:
+                return
+            self.started = True
+            for record in self.pending:
+                super().emit(record)
+            self.pending = []
+        finally:
+            self.release()
+    
+    def _open(self):
+        # The file is opened by the first record written after start()
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+    
+    def emit(self, record):
+        if self.started:
+            super().emit(record)
+        elif len(self.pending) < PENDING_RECORDS_LIMIT:
+            self.pending.append(record)
+
+def _start_backend():
+    """Start the listener thread that formats and writes the records of every logger"""
+    global _queue_handler, _file_handler, _listener
+    
+    # One file per run and worker, shared by all loggers of the process; opened by start_logging()
+    file_handler = _DeferredFileHandler(os.path.join(LOGS_DIR, f"{WORKER_ID}.log"))
+    console_handler = logging.StreamHandler()
+    formatter = logging.Formatter(LOG_FORMAT)
+    # Levels are set on the loggers, so e.g. page objects can log their waits at DEBUG
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+    
+    queue = SimpleQueue()
+    _queue_handler = _InProcessQueueHandler(queue)
+    _file_handler = file_handler
+    _listener = QueueListener(queue, file_handler, console_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+def start_logging():
+    """
+    Start writing the log file of this run and worker
+    
+    Called by the entry points that run tests; until then records only go to the
+    console and are kept in memory, so they are still written once the run starts.
+    """
+    with _backend_lock:
+        if _listener is None:
+            _start_backend()
+        file_handler = _file_handler
+    file_handler.start()
+
+def stop_logging():
+    """Write out the queued records and close the log file"""
+    global _listener
+    with _backend_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 def setup_logger(logger_name):
     """
-    Set up a logger with file and console handlers
+    Set up a logger writing to the run's log file and the console
+    
+    Records are put on a queue and formatted and written by a background thread, so
+    logging does not block the test thread on file writes. Calling this again for the
+    same name returns the same logger without adding handlers.
     
     Args:
         logger_name: Name of the logger
-        
+    
     Returns:
         Logger: Configured logger instance
     """
     logger = logging.getLogger(logger_name)
     logger.setLevel(logging.INFO)
     
-    # Create logs directory if it doesn't exist
-    if not os.path.exists(LOGS_DIR):
-        os.makedirs(LOGS_DIR)
-    
-    # Create a timestamp for the log file name
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    log_file = os.path.join(LOGS_DIR, f"{logger_name}_{timestamp}.log")
-    
-    # File handler
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
-    # Create formatter and add it to the handlers
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    with _backend_lock:
+        if _listener is None:
+            _start_backend()
+        if _queue_handler not in logger.handlers:
+            logger.addHandler(_queue_handler)
     
-    return logger 
\ No newline at end of file
+    return logger
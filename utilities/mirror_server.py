@@ -0,0 +1,97 @@
+import threading
+from functools import partial
+from urllib.parse import parse_qs
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from config.config import MIRROR_DIR
+from utilities.logger import setup_logger
+
+logger = setup_logger("MirrorServer")
+
+class MirrorRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the mirrored pages and emulates the server-side form handlers they post to
+    """
+
+    def do_POST(self):
+        """Handle the Contact Us form submission"""
+        if not self.path.startswith("/Contact-Us/contact_us.php"):
+            self.send_error(404, "No form handler for this path")
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+
+        errors = []
+        if not all(form.get(field, "").strip() for field in ("first_name", "last_name", "email", "message")):
+            errors.append("Error: all fields are required")
+        if "@" not in form.get("email", ""):
+            errors.append("Error: Invalid email address")
+
+        if errors:
+            body = "<br>\n".join(errors)
+        else:
+            body = '<div id="contact_reply"><h1>Thank You for your Message!</h1></div>'
+        self._send_html(f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"></head><body>{body}</body></html>")
+
+    def _send_html(self, html):
+        """Send an HTML response"""
+        content = html.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        """Route request logs through the framework logger instead of stderr"""
+        logger.debug(format % args)
+
+class MirrorServer:
+    """
+    Local HTTP server for the offline mirror of the pages under test
+    """
+
+    def __init__(self, root=MIRROR_DIR, host="127.0.0.1", port=0):
+        """
+        Initialize the MirrorServer
+
+        Args:
+            root: Directory with the mirrored pages
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free port
+        """
+        self.root = root
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def url(self):
+        """Base URL of the running server, usable as BASE_URL"""
+        return f"http://{self.host}:{self.httpd.server_port}/"
+
+    def start(self):
+        """
+        Start serving in a background thread
+
+        Returns:
+            MirrorServer: Self reference for method chaining
+        """
+        handler = partial(MirrorRequestHandler, directory=self.root)
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="MirrorServer", daemon=True)
+        self.thread.start()
+        logger.info(f"Serving {self.root} at {self.url}")
+        return self
+
+    def stop(self):
+        """Stop the server and release its port"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.thread.join()
+            logger.info("Mirror server stopped")
+            self.httpd = None
+            self.thread = None
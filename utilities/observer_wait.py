@@ -0,0 +1,194 @@
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (TimeoutException, NoSuchElementException,
+                                        StaleElementReferenceException, WebDriverException)
+from config.config import EXPLICIT_WAIT
+from utilities.js_locator import LOCATOR_JS
+
+# Async script that resolves as soon as the condition holds. The DOM is watched with a
+# MutationObserver; CSS transition/animation end events and a coarse interval cover
+# visibility changes that do not mutate the DOM (e.g. opacity fades).
+WAIT_JS = LOCATOR_JS + """
+var target = arguments[0], condition = arguments[1], expected = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+
+function check() {
+    // The target is either a {by, value} locator or an element (for staleness checks)
+    var elements = target.by ? findAll(target.by, target.value) : (target.isConnected ? [target] : []);
+    var first = elements[0];
+    switch (condition) {
+        case 'present':
+            return first || null;
+        case 'visible':
+            return isVisible(first) ? first : null;
+        case 'clickable':
+            return isVisible(first) && !first.disabled ? first : null;
+        case 'all_visible':
+            return elements.length && elements.every(isVisible) ? elements : null;
+        case 'invisible':
+            return !isVisible(first) ? true : null;
+        case 'absent':
+            return !elements.length ? true : null;
+        case 'count_changed':
+            return elements.length !== expected ? true : null;
+        case 'class_present':
+            return first && first.classList.contains(expected) ? first : null;
+        case 'class_absent':
+            return first && !first.classList.contains(expected) ? first : null;
+        case 'text_changed':
+            return isVisible(first) && first.innerText.trim() !== expected.trim() ? first : null;
+    }
+    throw new Error('Unsupported wait condition: ' + condition);
+}
+
+var initial = check();
+if (initial) {
+    done(initial);
+    return;
+}
+
+var finished = false, observer, interval, timer;
+function finish(result) {
+    finished = true;
+    observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    document.removeEventListener('transitionend', tryFinish, true);
+    document.removeEventListener('animationend', tryFinish, true);
+    done(result);
+}
+function tryFinish() {
+    if (finished) {
+        return;
+    }
+    var result = check();
+    if (result) {
+        finish(result);
+    }
+}
+
+observer = new MutationObserver(tryFinish);
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+document.addEventListener('transitionend', tryFinish, true);
+document.addEventListener('animationend', tryFinish, true);
+interval = setInterval(tryFinish, 100);
+timer = setTimeout(function () {
+    if (!finished) {
+        finish(null);
+    }
+}, timeoutMs);
+"""
+
+def polling_condition(target, condition, expected=None):
+    """
+    Get the WebDriverWait condition equivalent to an observer condition
+
+    Args:
+        target: (by, value) tuple, or a WebElement for the absent condition
+        condition: Observer wait condition name
+        expected: Extra value used by the condition (count, class name or text)
+
+    Returns:
+        callable: Condition accepted by WebDriverWait.until
+    """
+    if condition == "present":
+        return EC.presence_of_element_located(target)
+    if condition == "visible":
+        return EC.visibility_of_element_located(target)
+    if condition == "clickable":
+        return EC.element_to_be_clickable(target)
+    if condition == "all_visible":
+        return EC.visibility_of_all_elements_located(target)
+    if condition == "invisible":
+        return EC.invisibility_of_element_located(target)
+    if condition == "absent":
+        if not isinstance(target, tuple):
+            return EC.staleness_of(target)
+        return lambda driver: not driver.find_elements(*target)
+    if condition == "count_changed":
+        return lambda driver: len(driver.find_elements(*target)) != expected
+
+    def element_state(driver):
+        element = driver.find_element(*target)
+        classes = (element.get_attribute("class") or "").split()
+        if condition == "class_present":
+            return element if expected in classes else False
+        if condition == "class_absent":
+            return element if expected not in classes else False
+        if condition == "text_changed":
+            return element if element.is_displayed() and element.text.strip() != expected.strip() else False
+        raise ValueError(f"Unsupported wait condition: {condition}")
+    return element_state
+
+class ObserverWait:
+    """
+    Event-driven wait that blocks inside the browser until a locator condition is met
+    """
+
+    def __init__(self, driver, timeout=EXPLICIT_WAIT):
+        """
+        Initialize the ObserverWait
+
+        Args:
+            driver: WebDriver instance
+            timeout: Maximum time to wait in seconds
+        """
+        self.driver = driver
+        self.timeout = timeout
+
+    def until(self, locator, condition="visible", timeout=None, expected=None):
+        """
+        Wait for a condition on a locator
+
+        Args:
+            locator: (by, value) tuple, or a WebElement for the absent (staleness) condition
+            condition: present, visible, clickable, all_visible, invisible, absent,
+                       count_changed, class_present, class_absent or text_changed
+            timeout: Maximum time to wait in seconds (defaults to the instance timeout)
+            expected: Previous count, class name or previous text for the conditions that need one
+
+        Returns:
+            WebElement, list of WebElements or True depending on the condition
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if getattr(self.driver, "_async_waits_unavailable", False):
+            return self._poll(locator, condition, expected, timeout)
+
+        target = {"by": locator[0], "value": locator[1]} if isinstance(locator, tuple) else locator
+        start = time.monotonic()
+        self._ensure_script_timeout(timeout)
+        try:
+            result = self.driver.execute_async_script(WAIT_JS, target, condition, expected, int(timeout * 1000))
+        except StaleElementReferenceException:
+            # An element target that is already detached satisfies the absent condition
+            result = True if condition == "absent" and not isinstance(locator, tuple) else None
+        except NoSuchElementException:
+            result = None
+        except WebDriverException as e:
+            # The page navigated mid-wait or the driver cannot run async scripts:
+            # finish the remaining time by polling
+            if "unknown command" in str(e).lower() or "not supported" in str(e).lower():
+                self.driver._async_waits_unavailable = True
+            remaining = max(timeout - (time.monotonic() - start), 0)
+            return self._poll(locator, condition, expected, remaining)
+
+        if not result:
+            raise TimeoutException(f"Timed out after {timeout}s waiting for {locator} to be {condition}")
+        return result
+
+    def _poll(self, locator, condition, expected, timeout):
+        """Fall back to WebDriverWait polling"""
+        return WebDriverWait(
+            self.driver,
+            timeout,
+            poll_frequency=0.5,
+            ignored_exceptions=[NoSuchElementException, StaleElementReferenceException]
+        ).until(polling_condition(locator, condition, expected))
+
+    def _ensure_script_timeout(self, timeout):
+        """Make sure the session script timeout outlasts the wait (one round trip, only when raised)"""
+        required = timeout + 5
+        if getattr(self.driver, "_observer_script_timeout", 0) < required:
+            self.driver.set_script_timeout(required)
+            self.driver._observer_script_timeout = required
@@ -0,0 +1,328 @@
+import os
+import re
+import sys
+import time
+import subprocess
+import xml.etree.ElementTree as ET
+from html import escape
+from config.config import RUN_ID, RUN_DIR, REPORT_NAME
+from utilities.test_timings import TimingsStore, estimate_durations, balance_shards
+from utilities.artifact_catalog import ArtifactCatalog, REPORT, directory_size
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_CASES_DIR = os.path.join("tests", "test_cases")
+
+def build_targets(all_tests=False, test_file="", module="", test_case=""):
+    """
+    Translate the runner selection flags into pytest targets
+
+    Args:
+        all_tests: Run the whole test_cases tree
+        test_file: Specific test file name
+        module: Module name (contact_us, login, etc.)
+        test_case: Test case name (requires module)
+
+    Returns:
+        tuple: (list of pytest targets, test case name to filter on or None)
+    """
+    if test_case and not module:
+        raise ValueError("A module (-m) must be specified when using a test case (-c)")
+
+    if all_tests:
+        return [TEST_CASES_DIR + "/"], None
+
+    if test_file:
+        if not test_file.endswith(".py"):
+            test_file = f"{test_file}.py"
+        path = os.path.join(TEST_CASES_DIR, test_file)
+        if not os.path.isfile(os.path.join(PROJECT_ROOT, path)):
+            raise ValueError(f"Test file {path} does not exist")
+        return [path], None
+
+    if module:
+        if not module.endswith(".py"):
+            module = f"test_{module}.py"
+        elif not module.startswith("test_"):
+            module = f"test_{module}"
+        path = os.path.join(TEST_CASES_DIR, module)
+        if not os.path.isfile(os.path.join(PROJECT_ROOT, path)):
+            raise ValueError(f"Module file {path} does not exist")
+        return [path], test_case or None
+
+    raise ValueError("No test selection specified")
+
+def collect_tests(targets, test_case=None):
+    """
+    Collect the test node ids for the given targets without running them
+
+    Args:
+        targets: List of pytest targets
+        test_case: Only keep tests with this name (optional)
+
+    Returns:
+        list: Collected test node ids
+    """
+    command = [sys.executable, "-m", "pytest", "--collect-only", "-q", *targets]
+    result = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode not in (0, 5):
+        raise RuntimeError(f"Test collection failed:\n{result.stdout}{result.stderr}")
+
+    test_ids = []
+    for line in result.stdout.splitlines():
+        line = line.strip()
+        if not line:
+            # The node ids are followed by a blank line and the summary
+            break
+        if "::" in line:
+            test_ids.append(line)
+
+    if test_case:
+        test_ids = [t for t in test_ids if t.split("::")[-1] == test_case]
+        if not test_ids:
+            raise ValueError(f"Test case {test_case} not found in {targets[0]}")
+    return test_ids
+
+def junit_key(test_id):
+    """
+    Get the (classname, name) pair JUnit XML uses for a pytest node id
+
+    Args:
+        test_id: Pytest node id (e.g. tests/test_cases/test_login.py::TestLogin::test_failed_login)
+
+    Returns:
+        tuple: (classname, name)
+    """
+    path, *parts = test_id.split("::")
+    module = path[:-3].replace("/", ".")
+    return ".".join([module] + parts[:-1]), parts[-1]
+
+def run_shards(shards, browser, headless, shard_dir):
+    """
+    Run every shard in its own pytest process (and therefore its own browser)
+
+    Args:
+        shards: List of lists of test ids
+        browser: Browser name
+        headless: Run browsers in headless mode
+        shard_dir: Directory for per-shard reports and logs
+
+    Returns:
+        list: One result dict per shard
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    running = []
+    for index, shard in enumerate(shards):
+        html_path = os.path.join(shard_dir, f"shard_{index}.html")
+        junit_path = os.path.join(shard_dir, f"shard_{index}.xml")
+        log_path = os.path.join(shard_dir, f"shard_{index}.log")
+        command = [
+            sys.executable, "-m", "pytest", "-v",
+            f"--browser-name={browser}",
+            f"--html={html_path}", "--self-contained-html",
+            f"--junitxml={junit_path}"
+        ]
+        if headless:
+            command.append("--headless")
+        command.extend(shard)
+        log_file = open(log_path, "w")
+        # Each shard writes its own file in the run's log directory
+        env = dict(os.environ, WORKER_ID=f"shard_{index}")
+        process = subprocess.Popen(command, cwd=PROJECT_ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+        running.append({
+            "index": index,
+            "tests": shard,
+            "process": process,
+            "log_file": log_file,
+            "started": time.monotonic(),
+            "html": html_path,
+            "junit": junit_path,
+            "log": log_path
+        })
+
+    results = []
+    for shard in running:
+        shard["returncode"] = shard.pop("process").wait()
+        shard["duration"] = time.monotonic() - shard.pop("started")
+        shard.pop("log_file").close()
+        results.append(shard)
+    return results
+
+def merge_junit(results, output_path):
+    """
+    Merge the per-shard JUnit XML files into one
+
+    Args:
+        results: Shard results from run_shards
+        output_path: Path of the merged JUnit XML file
+
+    Returns:
+        list: Test case dicts (name, classname, time, outcome, message, shard)
+    """
+    merged = ET.Element("testsuite", name="pytest")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0, "time": 0.0}
+    cases = []
+
+    for result in results:
+        if not os.path.exists(result["junit"]):
+            continue
+        root = ET.parse(result["junit"]).getroot()
+        suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+        for suite in suites:
+            for key in ("tests", "failures", "errors", "skipped"):
+                totals[key] += int(suite.get(key, 0))
+            totals["time"] += float(suite.get("time", 0))
+            for case in suite.findall("testcase"):
+                case.set("shard", str(result["index"]))
+                merged.append(case)
+                outcome, message = "passed", ""
+                for tag in ("failure", "error", "skipped"):
+                    child = case.find(tag)
+                    if child is not None:
+                        outcome = {"failure": "failed", "error": "error", "skipped": "skipped"}[tag]
+                        message = child.get("message", "")
+                        break
+                cases.append({
+                    "name": case.get("name"),
+                    "classname": case.get("classname"),
+                    "time": float(case.get("time", 0)),
+                    "outcome": outcome,
+                    "message": message,
+                    "shard": result["index"]
+                })
+
+    for key, value in totals.items():
+        merged.set(key, f"{value:.3f}" if key == "time" else str(value))
+    wrapper = ET.Element("testsuites")
+    wrapper.append(merged)
+    ET.ElementTree(wrapper).write(output_path, encoding="utf-8", xml_declaration=True)
+    return cases
+
+def write_merged_html(cases, results, output_path):
+    """
+    Write a single HTML report summarizing every shard
+
+    Args:
+        cases: Test case dicts from merge_junit
+        results: Shard results from run_shards
+        output_path: Path of the merged HTML report
+    """
+    report_dir = os.path.dirname(output_path)
+    counts = {}
+    for case in cases:
+        counts[case["outcome"]] = counts.get(case["outcome"], 0) + 1
+    summary = ", ".join(f"{count} {outcome}" for outcome, count in sorted(counts.items()))
+
+    shard_rows = "".join(
+        f"<tr><td>{r['index']}</td><td>{len(r['tests'])}</td><td>{r['predicted']:.1f}s</td>"
+        f"<td>{r['test_time']:.1f}s</td><td>{r['duration']:.1f}s</td>"
+        f"<td>{r['returncode']}</td>"
+        f"<td><a href=\"{escape(os.path.relpath(r['html'], report_dir))}\">report</a> "
+        f"<a href=\"{escape(os.path.relpath(r['log'], report_dir))}\">log</a></td></tr>"
+        for r in results
+    )
+    case_rows = "".join(
+        f"<tr class=\"{c['outcome']}\"><td>{escape(c['classname'])}::{escape(c['name'])}</td>"
+        f"<td>{c['outcome']}</td><td>{c['time']:.2f}s</td><td>{c['shard']}</td>"
+        f"<td>{escape(c['message'])}</td></tr>"
+        for c in cases
+    )
+
+    with open(output_path, "w") as f:
+        f.write(f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Automation Test Report</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; font-size: 13px; }}
+table {{ border-collapse: collapse; margin-bottom: 20px; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+tr.passed td:nth-child(2) {{ color: green; }}
+tr.failed td:nth-child(2), tr.error td:nth-child(2) {{ color: red; }}
+tr.skipped td:nth-child(2) {{ color: orange; }}
+</style>
+</head>
+<body>
+<h1>Automation Test Report</h1>
+<p>{len(cases)} tests across {len(results)} shards: {summary}</p>
+<h2>Shards</h2>
+<table><tr><th>Shard</th><th>Tests</th><th>Predicted</th><th>Test time</th><th>Wall time</th><th>Exit code</th><th>Details</th></tr>{shard_rows}</table>
+<h2>Results</h2>
+<table><tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Shard</th><th>Message</th></tr>{case_rows}</table>
+</body>
+</html>
+""")
+
+def run_parallel(targets, test_case=None, workers=4, browser="chrome", headless=False):
+    """
+    Collect, shard, run and merge a test selection
+
+    Args:
+        targets: List of pytest targets
+        test_case: Only run tests with this name (optional)
+        workers: Number of worker processes
+        browser: Browser name
+        headless: Run browsers in headless mode
+
+    Returns:
+        tuple: (exit code, path of the merged HTML report)
+    """
+    # The collection and every shard write into this run's directory
+    os.environ["RUN_ID"] = RUN_ID
+    catalog = ArtifactCatalog()
+    catalog.add_run(RUN_ID, RUN_DIR)
+
+    test_ids = collect_tests(targets, test_case)
+    if not test_ids:
+        print("No tests collected.")
+        return 5, None
+
+    shard_dir = os.path.join(RUN_DIR, "shards")
+
+    # Balance the shards using durations recorded by previous runs
+    store = TimingsStore()
+    shards, predicted = balance_shards(estimate_durations(test_ids, store), workers)
+    print(f"Running {len(test_ids)} tests across {len(shards)} workers")
+
+    results = run_shards(shards, browser, headless, shard_dir)
+
+    report_path = os.path.join(RUN_DIR, REPORT_NAME)
+    cases = merge_junit(results, re.sub(r"\.html$", ".xml", report_path))
+
+    # Record the actual durations for the next run (errored tests did not run to completion)
+    test_ids_by_key = {junit_key(test_id): test_id for test_id in test_ids}
+    durations = {}
+    completed = {}
+    for case in cases:
+        test_id = test_ids_by_key.get((case["classname"], case["name"]))
+        if test_id:
+            durations[test_id] = case["time"]
+            if case["outcome"] != "error":
+                completed[test_id] = case["time"]
+    store.update(completed)
+
+    for result in results:
+        result["predicted"] = predicted[result["index"]]
+        result["test_time"] = sum(durations.get(test_id, 0.0) for test_id in result["tests"])
+
+    write_merged_html(cases, results, report_path)
+    catalog.add(RUN_ID, REPORT, report_path, size=os.path.getsize(report_path))
+    # The shards measured only part of the run directory
+    catalog.set_run_size(RUN_ID, directory_size(RUN_DIR))
+
+    for result in results:
+        print(f"Shard {result['index']}: {len(result['tests'])} tests, predicted {result['predicted']:.1f}s, "
+              f"actual {result['test_time']:.1f}s of tests in {result['duration']:.1f}s wall time "
+              f"(exit code {result['returncode']})")
+    print(f"Makespan: predicted {max(predicted):.1f}s, "
+          f"actual {max(r['test_time'] for r in results):.1f}s of tests, "
+          f"{max(r['duration'] for r in results):.1f}s wall time")
+
+    return_codes = [r["returncode"] for r in results]
+    if all(code == 0 for code in return_codes):
+        exit_code = 0
+    elif 1 in return_codes:
+        exit_code = 1
+    else:
+        exit_code = max(return_codes)
+    return exit_code, report_path
@@ -0,0 +1,120 @@
+import json
+from selenium.common.exceptions import WebDriverException
+from config.config import RESOURCE_BLOCKING_PROFILES
+from utilities.logger import setup_logger
+
+logger = setup_logger("ResourceBlocking")
+
+# URL patterns per resource type. Network.setBlockedURLs only matches URLs; blocking by
+# the request's resource type needs Fetch interception, which relies on CDP events that
+# classic WebDriver sessions cannot receive.
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.png?*", "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.gif", "*.gif?*",
+              "*.webp", "*.webp?*", "*.svg", "*.svg?*", "*.ico", "*.ico?*"],
+    "font": ["*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*", "*.otf", "*.otf?*",
+             "*.eot", "*.eot?*"],
+    "media": ["*.mp4", "*.mp4?*", "*.webm", "*.webm?*", "*.mp3", "*.mp3?*", "*.ogg", "*.ogg?*"]
+}
+
+def blocked_url_patterns(profile):
+    """
+    Get the URL patterns a blocking profile blocks
+
+    Args:
+        profile: Name of a profile in RESOURCE_BLOCKING_PROFILES, None for no blocking
+
+    Returns:
+        list: Patterns for Network.setBlockedURLs ("*" matches any characters)
+    """
+    if profile is None:
+        return []
+    if profile not in RESOURCE_BLOCKING_PROFILES:
+        raise ValueError(f"Unknown resource blocking profile: {profile}. "
+                         f"Use one of: {', '.join(RESOURCE_BLOCKING_PROFILES)}")
+    settings = RESOURCE_BLOCKING_PROFILES[profile]
+    patterns = []
+    for resource_type in settings.get("resource_types", []):
+        if resource_type not in RESOURCE_TYPE_PATTERNS:
+            raise ValueError(f"Unknown resource type to block: {resource_type}. "
+                             f"Use one of: {', '.join(RESOURCE_TYPE_PATTERNS)}")
+        patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+    patterns.extend(settings.get("url_patterns", []))
+    return patterns
+
+def supports_blocking(driver):
+    """Whether the driver can block requests (Chromium-based browsers, through CDP)"""
+    return hasattr(driver, "execute_cdp_cmd")
+
+def apply_blocking(driver, profile):
+    """
+    Block the requests of a profile in the driver's current window
+
+    Blocking applies to the page target (window) the driver is switched to, so it is
+    applied again whenever a test gets a new window, e.g. a new browser context.
+
+    Args:
+        driver: Chromium WebDriver instance
+        profile: Name of a profile in RESOURCE_BLOCKING_PROFILES, None to lift blocking
+    """
+    patterns = blocked_url_patterns(profile)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+class BlockingStats:
+    """
+    Counts the requests blocked during a run and estimates the bytes that saved
+
+    Blocked requests are read from the browser's performance log. Their size is never
+    downloaded, so the bytes saved are estimated from the transfer size of the same
+    URL in loads that were not blocked during the run (e.g. full_render tests); blocked
+    URLs never loaded in full are counted as of unknown size.
+    """
+
+    def __init__(self):
+        """Initialize the BlockingStats"""
+        self.blocked = {}  # url -> number of blocked requests
+        self.sizes = {}  # url -> transfer size of an unblocked load
+
+    def collect(self, driver):
+        """
+        Read the network events the browser logged since the last call
+
+        Args:
+            driver: Chromium WebDriver instance with performance logging enabled
+        """
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException as e:
+            logger.debug("Performance log not available: %s", e)
+            return
+
+        urls = {}
+        for entry in entries:
+            try:
+                event = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = event.get("method"), event.get("params", {})
+            if method == "Network.requestWillBeSent":
+                urls[params.get("requestId")] = params.get("request", {}).get("url")
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                url = urls.get(params.get("requestId"))
+                if url:
+                    self.blocked[url] = self.blocked.get(url, 0) + 1
+            elif method == "Network.loadingFinished":
+                url = urls.get(params.get("requestId"))
+                if url:
+                    self.sizes[url] = max(self.sizes.get(url, 0), int(params.get("encodedDataLength", 0)))
+
+    def summary(self):
+        """
+        Summarize the blocked requests
+
+        Returns:
+            dict: Number of blocked requests, estimated bytes saved and number of
+                  blocked requests whose size is unknown
+        """
+        requests = sum(self.blocked.values())
+        unknown = sum(count for url, count in self.blocked.items() if url not in self.sizes)
+        saved = sum(self.sizes[url] * count for url, count in self.blocked.items() if url in self.sizes)
+        return {"blocked_requests": requests, "bytes_saved": saved, "unknown_size_requests": unknown}
@@ -0,0 +1,228 @@
+import os
+import io
+import time
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.config import (SCREENSHOT_WORKERS, SCREENSHOT_MAX_PENDING, SCREENSHOT_FORMAT, SCREENSHOT_JPEG_QUALITY,
+                           SCREENSHOT_MODE, THUMBNAIL_SIZE, THUMBNAIL_JPEG_QUALITY)
+from utilities.logger import setup_logger
+from utilities.screenshot_store import ScreenshotStore, content_hash
+
+logger = setup_logger("ScreenshotPipeline")
+
+def grab_screenshot(driver, mode=SCREENSHOT_MODE, element=None):
+    """
+    Grab a screenshot from the browser
+
+    Args:
+        driver: WebDriver instance
+        mode: "viewport" for the visible area or "full_page" for the whole document
+        element: WebElement to capture instead of the page (optional)
+
+    Returns:
+        str: Base64 PNG payload
+    """
+    if element is not None:
+        # The browser clips the capture to the element's bounding box
+        return element.screenshot_as_base64
+    if mode == "full_page":
+        if hasattr(driver, "execute_cdp_cmd"):
+            # Chromium renders beyond the viewport in one capture, no scrolling and stitching needed
+            metrics = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+            size = metrics.get("cssContentSize") or metrics["contentSize"]
+            return driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "png",
+                "captureBeyondViewport": True,
+                "clip": {"x": 0, "y": 0, "width": size["width"], "height": size["height"], "scale": 1}
+            })["data"]
+        if hasattr(driver, "get_full_page_screenshot_as_base64"):
+            return driver.get_full_page_screenshot_as_base64()
+        logger.warning("Full page screenshots are not supported by this browser, capturing the viewport")
+    elif mode != "viewport":
+        raise ValueError(f"Unsupported screenshot mode: {mode}")
+    return driver.get_screenshot_as_base64()
+
+class ScreenshotPipeline:
+    """
+    Captures screenshots on the test thread and decodes, re-encodes and writes them
+    into the content-addressed screenshot store on a bounded pool of background threads
+    """
+
+    def __init__(self, workers=SCREENSHOT_WORKERS, max_pending=SCREENSHOT_MAX_PENDING,
+                 image_format=SCREENSHOT_FORMAT, store=None):
+        """
+        Initialize the ScreenshotPipeline
+
+        Args:
+            workers: Number of writer threads
+            max_pending: Captures allowed to wait for a writer before capture blocks
+            image_format: "png" to keep the browser's PNG, "jpeg" to re-encode (requires Pillow)
+            store: ScreenshotStore receiving the images, defaults to one for this run
+        """
+        self.image_format = image_format
+        self.store = store or ScreenshotStore()
+        # Blobs already written or queued by this process
+        self.known_blobs = set()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot")
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.futures = []
+        self.lock = threading.Lock()
+        self.stats = {"captures": 0, "capture_seconds": 0.0, "writes": 0, "write_seconds": 0.0,
+                      "bytes": 0, "deduplicated": 0, "failures": 0}
+
+    def capture(self, driver, name, mode=SCREENSHOT_MODE, element=None, preview_path=None):
+        """
+        Grab a screenshot and queue it for writing
+
+        Only the capture round trip and hashing run on the calling thread. The file
+        appears once a writer has processed it; call flush() to wait for all pending
+        writes. Images already in the store are not written again.
+
+        Args:
+            driver: WebDriver instance
+            name: Screenshot name recorded in the run manifest
+            mode: "viewport" or "full_page"
+            element: WebElement to capture instead of the page (optional)
+            preview_path: Where a writer also saves a downscaled JPEG preview (optional)
+
+        Returns:
+            tuple: (path of the stored image, base64 PNG payload)
+        """
+        start = time.perf_counter()
+        payload = grab_screenshot(driver, mode, element)
+        with self.lock:
+            self.stats["captures"] += 1
+            self.stats["capture_seconds"] += time.perf_counter() - start
+
+        extension = "jpg" if self.image_format == "jpeg" else "png"
+        path = self.store.add(name, content_hash(payload), extension)
+        # A writer thread references new blobs in the catalog and writes them unless they exist;
+        # blobs this process already queued need neither
+        with self.lock:
+            known = path in self.known_blobs
+            self.known_blobs.add(path)
+            if known:
+                self.stats["deduplicated"] += 1
+        if known and preview_path is None:
+            return path, payload
+
+        # Blocks when the writers fall behind so pending payloads cannot pile up in memory
+        self.slots.acquire()
+        future = self.executor.submit(self._write, payload, None if known else path, preview_path, name)
+        with self.lock:
+            self.futures.append(future)
+        return path, payload
+
+    def flush(self):
+        """Wait for every queued screenshot to be written and save the run manifest"""
+        with self.lock:
+            futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
+        self.store.save_manifest()
+
+    def shutdown(self):
+        """Flush pending screenshots and stop the writer threads"""
+        self.flush()
+        self.executor.shutdown()
+
+    def get_stats(self):
+        """
+        Get the pipeline counters
+
+        Returns:
+            dict: Counters with average capture and write times in milliseconds
+        """
+        with self.lock:
+            stats = dict(self.stats)
+        stats["avg_capture_ms"] = stats["capture_seconds"] * 1000 / stats["captures"] if stats["captures"] else 0.0
+        stats["avg_write_ms"] = stats["write_seconds"] * 1000 / stats["writes"] if stats["writes"] else 0.0
+        return stats
+
+    def _write(self, payload, path, preview_path=None, name=None):
+        """Reference a blob, write it atomically unless it exists, and write its preview"""
+        start = time.perf_counter()
+        try:
+            png = base64.b64decode(payload)
+            if path is not None:
+                # Referenced before the existence check, so cleanup cannot collect a reused blob
+                self.store.reference(path, name)
+                if os.path.exists(path):
+                    with self.lock:
+                        self.stats["deduplicated"] += 1
+                else:
+                    data = self._to_jpeg(png) if self.image_format == "jpeg" else png
+                    self._write_file(path, data)
+                    with self.lock:
+                        self.stats["writes"] += 1
+                        self.stats["write_seconds"] += time.perf_counter() - start
+                        self.stats["bytes"] += len(data)
+            if preview_path is not None:
+                self._write_file(preview_path, self._to_thumbnail(png))
+        except Exception as e:
+            with self.lock:
+                self.stats["failures"] += 1
+                self.known_blobs.discard(path)
+            logger.error(f"Failed to write screenshot {path or preview_path}: {e}")
+        finally:
+            self.slots.release()
+
+    @staticmethod
+    def _write_file(path, data):
+        """Write a file atomically"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Workers of a parallel run may write the same blob, so the temp file is per process
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _to_jpeg(data):
+        """Re-encode PNG bytes as JPEG"""
+        from PIL import Image
+
+        output = io.BytesIO()
+        Image.open(io.BytesIO(data)).convert("RGB").save(output, "JPEG", quality=SCREENSHOT_JPEG_QUALITY)
+        return output.getvalue()
+
+    @staticmethod
+    def _to_thumbnail(data, size=THUMBNAIL_SIZE):
+        """Downscale PNG bytes to a JPEG preview fitting in size"""
+        from PIL import Image
+
+        output = io.BytesIO()
+        with Image.open(io.BytesIO(data)) as image:
+            image = image.convert("RGB")
+            image.thumbnail(size)
+            image.save(output, "JPEG", quality=THUMBNAIL_JPEG_QUALITY)
+        return output.getvalue()
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+def get_pipeline():
+    """
+    Get the process-wide screenshot pipeline, creating it on first use
+
+    Returns:
+        ScreenshotPipeline: Shared pipeline instance
+    """
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ScreenshotPipeline()
+        return _pipeline
+
+def flush_pipeline():
+    """
+    Wait for pending screenshots if the pipeline was used
+
+    Returns:
+        dict: Pipeline counters, or None if no screenshot was taken
+    """
+    if _pipeline is None:
+        return None
+    _pipeline.flush()
+    return _pipeline.get_stats()
@@ -0,0 +1,136 @@
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from config.config import SCREENSHOTS_DIR, RUN_ID, RUN_DIR
+from utilities.artifact_catalog import ArtifactCatalog, MANIFEST, SCREENSHOT
+
+BLOBS_DIR = "blobs"
+MANIFESTS_DIR = "manifests"
+
+def content_hash(payload):
+    """
+    Hash a base64 screenshot payload
+
+    The base64 text maps one-to-one to the image bytes, so hashing it identifies the
+    content without decoding it on the test thread.
+
+    Args:
+        payload: Base64 encoded image
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class ScreenshotStore:
+    """
+    Content-addressed screenshot storage
+
+    Images are stored once under blobs/<aa>/<digest>.<ext>, shared by all runs, and each
+    worker of a run records which blobs it captured in <run dir>/manifests/<pid>.json.
+    Identical captures share a blob. Manifests and captures are also recorded in the
+    artifact catalog used by cleanup.
+    """
+
+    def __init__(self, root=SCREENSHOTS_DIR, run_id=RUN_ID, run_dir=RUN_DIR, catalog=None):
+        """
+        Initialize the ScreenshotStore
+
+        Args:
+            root: Screenshots directory holding the blobs
+            run_id: Run the captures belong to
+            run_dir: Directory of the run, receiving the manifest
+            catalog: ArtifactCatalog recording the screenshots, defaults to the project catalog
+        """
+        self.root = root
+        self.run_id = run_id
+        self.run_dir = run_dir
+        self.catalog = catalog or ArtifactCatalog()
+        self.entries = []
+        # Number of entries whose blob size is already recorded in the catalog
+        self.cataloged = 0
+        self.lock = threading.Lock()
+
+    @property
+    def manifest_path(self):
+        """Path of this worker's manifest"""
+        return os.path.join(self.run_dir, MANIFESTS_DIR, f"{os.getpid()}.json")
+
+    def blob_path(self, digest, extension):
+        """
+        Get the path of a blob
+
+        Args:
+            digest: Content hash
+            extension: File extension without the dot
+
+        Returns:
+            str: Absolute path of the blob
+        """
+        return os.path.join(self.root, BLOBS_DIR, digest[:2], f"{digest}.{extension}")
+
+    def add(self, name, digest, extension):
+        """
+        Record a capture in this run's manifest
+
+        Args:
+            name: Screenshot name given by the test
+            digest: Content hash of the image
+            extension: File extension of the stored blob
+
+        Returns:
+            str: Path of the blob holding the image
+        """
+        path = self.blob_path(digest, extension)
+        with self.lock:
+            self.entries.append({
+                "name": name,
+                "blob": os.path.relpath(path, self.root),
+                "captured": datetime.now().isoformat(timespec="seconds")
+            })
+        return path
+
+    def reference(self, path, name):
+        """
+        Reference a blob of this run in the catalog
+
+        Called before deciding whether the blob has to be written, so a cleanup running
+        meanwhile cannot collect a blob this run reuses. The catalog write is left to the
+        screenshot writer threads, off the test thread.
+
+        Args:
+            path: Path of the blob
+            name: Screenshot name given by the test
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = None  # Not written yet; the size is recorded with the manifest
+        self.catalog.add(self.run_id, SCREENSHOT, path, name, size)
+
+    def save_manifest(self):
+        """Write this run's manifest atomically, if anything was captured, and catalog it with the blob sizes"""
+        with self.lock:
+            if not self.entries:
+                return
+            manifest = {"run_id": self.run_id, "screenshots": list(self.entries)}
+            new_entries = self.entries[self.cataloged:]
+            first_save = self.cataloged == 0
+            self.cataloged = len(self.entries)
+
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+        if first_save:
+            self.catalog.add(self.run_id, MANIFEST, self.manifest_path)
+        sizes = []
+        for entry in new_entries:
+            blob = os.path.join(self.root, entry["blob"])
+            if os.path.exists(blob):
+                sizes.append((blob, os.path.getsize(blob)))
+        self.catalog.set_sizes(SCREENSHOT, sizes)
@@ -1,54 +1,126 @@
 import os
-import pytest
-from datetime import datetime
-from config.config import SCREENSHOTS_DIR
+import re
+import base64
+from config.config import SCREENSHOT_MODE
+from utilities.screenshot_pipeline import get_pipeline
+from utilities.visual_diff import VisualBaseline
+from utilities.wait_policy import wait_for_ready_state
 
-def take_screenshot(driver, test_name):
+# Element rectangles in screenshot pixels; full-page captures start at the document
+# origin, so the scroll position is added to the viewport-relative boxes
+IGNORE_RECTS_JS = """
+var ratio = window.devicePixelRatio || 1;
+var left = arguments[1] ? window.scrollX : 0;
+var top = arguments[1] ? window.scrollY : 0;
+return arguments[0].map(function (el) {
+    var box = el.getBoundingClientRect();
+    return [(box.left + left) * ratio, (box.top + top) * ratio, box.width * ratio, box.height * ratio];
+});
+"""
+
+# Stands in for a preview until it is embedded into the report; survives JSON and HTML escaping
+PREVIEW_PLACEHOLDER = "screenshot-preview-pending-"
+
+def capture_screenshot(driver, test_name, mode=SCREENSHOT_MODE, element=None, preview_path=None):
+    """
+    Take a screenshot and queue it for saving in the screenshot store
+
+    The file is written in the background; it is guaranteed to exist once the
+    screenshot pipeline has been flushed at the end of the session.
+
+    Args:
+        driver: WebDriver instance
+        test_name: Name of the test
+        mode: "viewport" or "full_page"
+        element: WebElement to capture instead of the page (optional)
+        preview_path: Where to also save a downscaled JPEG preview, written in the background (optional)
+
+    Returns:
+        tuple: (path to the screenshot, base64 PNG payload)
+    """
+    return get_pipeline().capture(driver, test_name, mode, element, preview_path)
+
+def take_screenshot(driver, test_name, mode=SCREENSHOT_MODE, element=None):
     """
-    Take a screenshot and save it to the screenshots directory
-    
+    Take a screenshot and queue it for saving in the screenshot store
+
     Args:
         driver: WebDriver instance
         test_name: Name of the test
-        
+        mode: "viewport" or "full_page"
+        element: WebElement to capture instead of the page (optional)
+
     Returns:
         str: Path to the screenshot
     """
-    if not os.path.exists(SCREENSHOTS_DIR):
-        os.makedirs(SCREENSHOTS_DIR)
-        
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    screenshot_name = f"{test_name}_{timestamp}.png"
-    screenshot_path = os.path.join(SCREENSHOTS_DIR, screenshot_name)
-    
-    driver.save_screenshot(screenshot_path)
-    
+    screenshot_path, _ = capture_screenshot(driver, test_name, mode, element)
     return screenshot_path
 
-@pytest.hookimpl(tryfirst=True, hookwrapper=True)
-def pytest_runtest_makereport(item, call):
+def embed_previews(html_path, previews):
     """
-    Pytest hook to take screenshot when test fails
-    
+    Replace preview placeholders in a written HTML report with the previews as data URIs
+
+    The preview files are removed once embedded; placeholders whose preview was not
+    written are left as they are, showing as a broken image.
+
     Args:
-        item: Test item
-        call: Call info
-    """
-    # Execute all other hooks to obtain the report object
-    outcome = yield
-    rep = outcome.get_result()
-    
-    # We only look at actual test calls, not setup/teardown
-    if rep.when == "call" and rep.failed:
+        html_path: Path to the HTML report
+        previews: Dict mapping each placeholder to the path of its JPEG preview
+    """
+    data_uris = {}
+    for placeholder, preview_path in previews.items():
+        try:
+            with open(preview_path, "rb") as f:
+                data_uris[placeholder] = "data:image/jpeg;base64," + base64.b64encode(f.read()).decode("ascii")
+            os.remove(preview_path)
+        except OSError:
+            continue
+    if not data_uris:
+        return
+
+    with open(html_path, encoding="utf-8") as f:
+        html = f.read()
+    pattern = re.compile(re.escape(PREVIEW_PLACEHOLDER) + r"\d+")
+    html = pattern.sub(lambda match: data_uris.get(match.group(0), match.group(0)), html)
+    tmp_path = f"{html_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(tmp_path, html_path)
+
+    preview_dirs = {os.path.dirname(preview_path) for preview_path in previews.values()}
+    for preview_dir in preview_dirs:
         try:
-            driver = item.funcargs["driver"]
-            test_name = item.nodeid.replace("::", "_").replace("/", "_").replace(".py", "")
-            screenshot_path = take_screenshot(driver, test_name)
-            
-            # Add screenshot to HTML report
-            extra = getattr(rep, "extra", [])
-            extra.append(pytest.html.extras.image(screenshot_path))
-            rep.extra = extra
-            
-        except Exception as e:
-            print(f"Failed to take screenshot: {e}") 
\ No newline at end of file
+            os.rmdir(preview_dir)
+        except OSError:
+            pass
+
+def compare_screenshot(driver, name, ignore=None):
+    """
+    Take a screenshot and compare it against the visual baseline of the same name
+
+    With UPDATE_BASELINES set the capture is recorded as the baseline; otherwise a
+    missing baseline fails the comparison. Failed comparisons write a diff heat-map.
+
+    Args:
+        driver: WebDriver instance
+        name: Baseline name
+        ignore: Regions to ignore, as (by, value) locators or (x, y, width, height) rectangles
+
+    Returns:
+        dict: Comparison result with passed, diff_ratio, reason, heatmap_path and screenshot_path
+    """
+    # Pages may be usable before they finished loading; compare only fully loaded pages
+    wait_for_ready_state(driver, "complete")
+
+    regions = [tuple(region) for region in ignore or [] if len(region) == 4]
+    elements = [element for region in ignore or [] if len(region) == 2 for element in driver.find_elements(*region)]
+    if elements:
+        # Rectangles of the elements in the capture, scaled from CSS to screenshot pixels
+        rects = driver.execute_script(IGNORE_RECTS_JS, elements, SCREENSHOT_MODE == "full_page")
+        regions.extend(tuple(int(round(value)) for value in rect) for rect in rects)
+
+    screenshot_path, payload = capture_screenshot(driver, name, SCREENSHOT_MODE)
+    browser = driver.capabilities.get("browserName", "browser")
+    result = VisualBaseline(browser).check(name, payload, ignore_regions=regions)
+    result["screenshot_path"] = screenshot_path
+    return result
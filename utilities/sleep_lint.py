@@ -0,0 +1,62 @@
+import os
+import ast
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(PROJECT_ROOT, "pages")
+
+def find_sleep_calls(directory=PAGES_DIR):
+    """
+    Find fixed sleeps in the Python files of a directory
+
+    Flags time.sleep(...) as well as sleep(...) imported with "from time import sleep".
+    Page objects should wait on page state through the BasePage wait methods instead.
+
+    Args:
+        directory: Directory to scan recursively
+
+    Returns:
+        list: (path relative to the project root, line number) tuples
+    """
+    offenders = []
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.join(root, filename)
+            with open(path) as f:
+                tree = ast.parse(f.read(), filename=path)
+
+            # Names bound to time.sleep by "from time import sleep [as alias]"
+            sleep_names = {
+                alias.asname or alias.name
+                for node in ast.walk(tree) if isinstance(node, ast.ImportFrom) and node.module == "time"
+                for alias in node.names if alias.name == "sleep"
+            }
+
+            for node in ast.walk(tree):
+                if not isinstance(node, ast.Call):
+                    continue
+                func = node.func
+                if (isinstance(func, ast.Attribute) and func.attr == "sleep"
+                        and isinstance(func.value, ast.Name) and func.value.id == "time") \
+                        or (isinstance(func, ast.Name) and func.id in sleep_names):
+                    offenders.append((os.path.relpath(path, PROJECT_ROOT), node.lineno))
+    return sorted(offenders)
+
+def check_no_sleeps(directory=PAGES_DIR):
+    """
+    Print any fixed sleeps found in a directory
+
+    Args:
+        directory: Directory to scan recursively
+
+    Returns:
+        bool: True if no sleeps were found, False otherwise
+    """
+    offenders = find_sleep_calls(directory)
+    for path, line in offenders:
+        print(f"{path}:{line}: time.sleep() in a page object, wait for page state instead")
+    return not offenders
+
+if __name__ == "__main__":
+    raise SystemExit(0 if check_no_sleeps() else 1)
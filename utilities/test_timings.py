@@ -0,0 +1,128 @@
+import os
+import json
+import heapq
+from config.config import TIMINGS_PATH
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Fallback cost for tests that have never run, used until timings are known
+DEFAULT_SECONDS_PER_BYTE = 0.002
+
+# Weight of the latest run when updating a stored duration
+SMOOTHING = 0.5
+
+class TimingsStore:
+    """
+    Persists per-test durations between runs for duration-aware sharding
+    """
+
+    def __init__(self, path=TIMINGS_PATH):
+        """
+        Initialize the TimingsStore
+
+        Args:
+            path: Path of the JSON timings file
+        """
+        self.path = path
+        try:
+            with open(path) as f:
+                self.durations = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.durations = {}
+
+    def get(self, test_id):
+        """
+        Get the stored duration of a test
+
+        Args:
+            test_id: Pytest node id
+
+        Returns:
+            float: Duration in seconds, or None if the test has never run
+        """
+        return self.durations.get(test_id)
+
+    def update(self, durations):
+        """
+        Blend new durations into the store and save it
+
+        Args:
+            durations: Dict of test node id to duration in seconds
+        """
+        for test_id, duration in durations.items():
+            previous = self.durations.get(test_id)
+            if previous is None:
+                self.durations[test_id] = duration
+            else:
+                self.durations[test_id] = SMOOTHING * duration + (1 - SMOOTHING) * previous
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.durations, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+def estimate_durations(test_ids, store):
+    """
+    Estimate how long each test will take
+
+    Known tests use their stored duration. Unseen tests get a share of their
+    module's file size, scaled by the seconds-per-byte observed for known tests.
+
+    Args:
+        test_ids: List of pytest node ids
+        store: TimingsStore instance
+
+    Returns:
+        dict: Test node id to estimated duration in seconds
+    """
+    tests_per_file = {}
+    for test_id in test_ids:
+        path = test_id.split("::")[0]
+        tests_per_file[path] = tests_per_file.get(path, 0) + 1
+
+    bytes_per_test = {}
+    for test_id in test_ids:
+        path = test_id.split("::")[0]
+        try:
+            size = os.path.getsize(os.path.join(PROJECT_ROOT, path))
+        except OSError:
+            size = 0
+        bytes_per_test[test_id] = size / tests_per_file[path]
+
+    # Calibrate the file-size heuristic against tests we have timings for
+    known = [t for t in test_ids if store.get(t) is not None]
+    known_bytes = sum(bytes_per_test[t] for t in known)
+    if known and known_bytes:
+        seconds_per_byte = sum(store.get(t) for t in known) / known_bytes
+    else:
+        seconds_per_byte = DEFAULT_SECONDS_PER_BYTE
+
+    estimates = {}
+    for test_id in test_ids:
+        duration = store.get(test_id)
+        estimates[test_id] = duration if duration is not None else bytes_per_test[test_id] * seconds_per_byte
+    return estimates
+
+def balance_shards(estimates, workers):
+    """
+    Assign tests to workers using longest-processing-time-first bin packing
+
+    Args:
+        estimates: Dict of test node id to estimated duration
+        workers: Number of worker processes
+
+    Returns:
+        tuple: (list of shards as lists of test ids, list of predicted shard durations)
+    """
+    shards = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    heap = [(0.0, index) for index in range(workers)]
+
+    for test_id in sorted(estimates, key=estimates.get, reverse=True):
+        load, index = heapq.heappop(heap)
+        shards[index].append(test_id)
+        loads[index] = load + estimates[test_id]
+        heapq.heappush(heap, (loads[index], index))
+
+    non_empty = [index for index in range(workers) if shards[index]]
+    return [shards[index] for index in non_empty], [loads[index] for index in non_empty]
@@ -0,0 +1,297 @@
+import io
+import os
+import base64
+import hashlib
+import numpy as np
+from PIL import Image
+from config.config import (BASELINES_DIR, RUN_DIR, UPDATE_BASELINES, VISUAL_TILE_SIZE,
+                           VISUAL_PIXEL_TOLERANCE, VISUAL_MAX_DIFF_RATIO)
+from utilities.logger import setup_logger
+
+logger = setup_logger("VisualDiff")
+
+# Luminance weights used to turn a per-channel difference into a perceived one
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# Fixed random odd multipliers for the tile fingerprints, shared by every run so
+# cached baseline fingerprints stay valid
+_FINGERPRINT_WEIGHTS = {}
+
+def _fingerprint_weights(tile_size):
+    """Get the fingerprint multipliers for a tile size"""
+    if tile_size not in _FINGERPRINT_WEIGHTS:
+        rng = np.random.default_rng(tile_size)
+        weights = rng.integers(0, 2 ** 63, size=(tile_size, tile_size, 3), dtype=np.uint64) * 2 + 1
+        _FINGERPRINT_WEIGHTS[tile_size] = weights
+    return _FINGERPRINT_WEIGHTS[tile_size]
+
+def load_image(source):
+    """
+    Load an image as an RGB array
+
+    Args:
+        source: File path, PNG bytes or base64 payload
+
+    Returns:
+        numpy.ndarray: Array of shape (height, width, 3) and dtype uint8
+    """
+    if isinstance(source, str) and not os.path.exists(source):
+        source = base64.b64decode(source)
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        return np.asarray(image.convert("RGB"))
+
+def mask_regions(pixels, ignore_regions):
+    """
+    Blank out regions that should not take part in the comparison
+
+    Args:
+        pixels: RGB array
+        ignore_regions: List of (x, y, width, height) rectangles in image pixels
+
+    Returns:
+        numpy.ndarray: Copy of the array with the regions set to black
+    """
+    if not ignore_regions:
+        return pixels
+    pixels = pixels.copy()
+    for x, y, width, height in ignore_regions:
+        pixels[max(y, 0):y + height, max(x, 0):x + width] = 0
+    return pixels
+
+def to_tiles(pixels, tile_size):
+    """
+    Split an image into square tiles, padding the edges with black
+
+    Args:
+        pixels: RGB array of shape (height, width, 3)
+        tile_size: Tile edge in pixels
+
+    Returns:
+        numpy.ndarray: Array of shape (rows, columns, tile_size, tile_size, 3)
+    """
+    height, width, _ = pixels.shape
+    rows, columns = -(-height // tile_size), -(-width // tile_size)
+    padded = np.zeros((rows * tile_size, columns * tile_size, 3), dtype=pixels.dtype)
+    padded[:height, :width] = pixels
+    return padded.reshape(rows, tile_size, columns, tile_size, 3).swapaxes(1, 2)
+
+def tile_fingerprints(pixels, tile_size=VISUAL_TILE_SIZE):
+    """
+    Compute a 64-bit fingerprint of every tile in one vectorized pass
+
+    Each fingerprint is a weighted sum of the tile's channel values with fixed random
+    odd 64-bit weights, wrapping modulo 2**64. Tiles with equal fingerprints are
+    treated as unchanged.
+
+    Args:
+        pixels: RGB array of shape (height, width, 3)
+        tile_size: Tile edge in pixels
+
+    Returns:
+        numpy.ndarray: Array of shape (rows, columns) and dtype uint64
+    """
+    tiles = to_tiles(pixels, tile_size).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        return np.einsum("rcijk,ijk->rc", tiles, _fingerprint_weights(tile_size))
+
+def perceptual_difference(baseline, actual):
+    """
+    Per-pixel perceived difference between two images of the same size
+
+    Args:
+        baseline: RGB array
+        actual: RGB array
+
+    Returns:
+        numpy.ndarray: Float array of shape (height, width) with values 0-255
+    """
+    delta = np.abs(baseline.astype(np.int16) - actual.astype(np.int16)).astype(np.float32)
+    return delta @ LUMA_WEIGHTS
+
+def compare_images(baseline, actual, tile_size=VISUAL_TILE_SIZE, tolerance=VISUAL_PIXEL_TOLERANCE,
+                   max_diff_ratio=VISUAL_MAX_DIFF_RATIO, ignore_regions=None, baseline_fingerprints=None):
+    """
+    Compare a capture against its baseline
+
+    Tiles whose fingerprints match are skipped; only the remaining tiles get the
+    per-pixel perceptual diff. A pixel counts as changed when its perceived difference
+    exceeds the tolerance, and the comparison fails when the share of changed pixels
+    exceeds max_diff_ratio.
+
+    Args:
+        baseline: Baseline RGB array
+        actual: Captured RGB array
+        tile_size: Tile edge in pixels
+        tolerance: Perceived difference (0-255) below which a pixel is unchanged
+        max_diff_ratio: Share of changed pixels allowed
+        ignore_regions: List of (x, y, width, height) rectangles to ignore
+        baseline_fingerprints: Cached fingerprints of the masked baseline, if known
+
+    Returns:
+        dict: passed, diff_ratio, changed_pixels, changed_tiles, total_tiles and
+              difference (per-pixel perceived difference array, None when identical)
+    """
+    if baseline.shape != actual.shape:
+        return {"passed": False, "diff_ratio": 1.0, "changed_pixels": actual.shape[0] * actual.shape[1],
+                "changed_tiles": None, "total_tiles": None, "difference": None,
+                "reason": f"size changed from {baseline.shape[1]}x{baseline.shape[0]} "
+                          f"to {actual.shape[1]}x{actual.shape[0]}"}
+
+    baseline = mask_regions(baseline, ignore_regions)
+    actual = mask_regions(actual, ignore_regions)
+    if baseline_fingerprints is None:
+        baseline_fingerprints = tile_fingerprints(baseline, tile_size)
+    dirty = baseline_fingerprints != tile_fingerprints(actual, tile_size)
+    total_tiles = dirty.size
+    result = {"passed": True, "diff_ratio": 0.0, "changed_pixels": 0, "changed_tiles": int(dirty.sum()),
+              "total_tiles": total_tiles, "difference": None, "reason": None}
+    if not dirty.any():
+        return result
+
+    # Perceptual diff of the dirty tiles only
+    rows, columns = np.nonzero(dirty)
+    baseline_tiles = to_tiles(baseline, tile_size)[rows, columns]
+    actual_tiles = to_tiles(actual, tile_size)[rows, columns]
+    tile_difference = perceptual_difference(baseline_tiles, actual_tiles)
+
+    changed_pixels = int((tile_difference > tolerance).sum())
+    height, width, _ = actual.shape
+    difference = np.zeros(dirty.shape + (tile_size, tile_size), dtype=np.float32)
+    difference[rows, columns] = tile_difference
+    difference = difference.swapaxes(1, 2).reshape(dirty.shape[0] * tile_size, -1)[:height, :width]
+
+    result.update({
+        "diff_ratio": changed_pixels / (height * width),
+        "changed_pixels": changed_pixels,
+        "difference": difference
+    })
+    result["passed"] = result["diff_ratio"] <= max_diff_ratio
+    if not result["passed"]:
+        result["reason"] = (f"{result['diff_ratio']:.2%} of pixels changed "
+                            f"(allowed {max_diff_ratio:.2%}) in {result['changed_tiles']}/{total_tiles} tiles")
+    return result
+
+def render_heatmap(actual, difference, path, tolerance=VISUAL_PIXEL_TOLERANCE):
+    """
+    Save a heat-map of the differences over a dimmed copy of the capture
+
+    Args:
+        actual: Captured RGB array
+        difference: Per-pixel perceived difference array
+        path: Output PNG path
+        tolerance: Differences at or below this value are not highlighted
+    """
+    dimmed = (actual.astype(np.float32) * 0.3 + 255 * 0.2)
+    intensity = np.clip(difference * 4, 0, 255)
+    changed = difference > tolerance
+    dimmed[changed] = np.stack([np.full_like(intensity, 255), 255 - intensity, 255 - intensity], axis=-1)[changed]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Image.fromarray(dimmed.astype(np.uint8)).save(path)
+
+class VisualBaseline:
+    """
+    Baseline images for visual regression checks, stored per browser
+    """
+
+    def __init__(self, browser, root=BASELINES_DIR, update=UPDATE_BASELINES, tile_size=VISUAL_TILE_SIZE):
+        """
+        Initialize the VisualBaseline
+
+        Args:
+            browser: Browser name used to separate baselines
+            root: Baselines directory
+            update: Replace baselines with the new captures instead of comparing
+            tile_size: Tile edge in pixels
+        """
+        self.directory = os.path.join(root, browser)
+        self.update = update
+        self.tile_size = tile_size
+
+    def check(self, name, payload, ignore_regions=None, tolerance=VISUAL_PIXEL_TOLERANCE,
+              max_diff_ratio=VISUAL_MAX_DIFF_RATIO):
+        """
+        Compare a capture against its baseline, or record it as the baseline in update mode
+
+        A capture without a baseline fails unless baselines are being updated, so a
+        missing or misplaced baseline cannot pass silently.
+
+        Args:
+            name: Baseline name
+            payload: Base64 PNG payload of the capture
+            ignore_regions: List of (x, y, width, height) rectangles to ignore
+            tolerance: Perceived difference (0-255) below which a pixel is unchanged
+            max_diff_ratio: Share of changed pixels allowed
+
+        Returns:
+            dict: Comparison result with an added heatmap_path (None unless it failed)
+        """
+        baseline_path = os.path.join(self.directory, f"{name}.png")
+        actual = load_image(payload)
+
+        if not self.update and not os.path.exists(baseline_path):
+            return {"passed": False, "diff_ratio": 1.0, "changed_pixels": actual.shape[0] * actual.shape[1],
+                    "changed_tiles": None, "total_tiles": None, "difference": None, "heatmap_path": None,
+                    "reason": f"no baseline at {baseline_path}; record it with UPDATE_BASELINES=1"}
+
+        if self.update:
+            os.makedirs(self.directory, exist_ok=True)
+            data = base64.b64decode(payload)
+            with open(baseline_path, "wb") as f:
+                f.write(data)
+            self._save_fingerprints(name, mask_regions(actual, ignore_regions), ignore_regions,
+                                    hashlib.sha256(data).hexdigest())
+            logger.info(f"Recorded visual baseline: {baseline_path}")
+            return {"passed": True, "diff_ratio": 0.0, "changed_pixels": 0, "changed_tiles": 0,
+                    "total_tiles": None, "difference": None, "reason": "baseline recorded", "heatmap_path": None}
+
+        # Compare against cached fingerprints first; the baseline PNG is only decoded
+        # when some tile differs
+        with open(baseline_path, "rb") as f:
+            baseline_hash = hashlib.sha256(f.read()).hexdigest()
+        fingerprints = self._load_fingerprints(name, ignore_regions, baseline_hash)
+        if fingerprints is not None:
+            actual_fingerprints = tile_fingerprints(mask_regions(actual, ignore_regions), self.tile_size)
+            if fingerprints.shape == actual_fingerprints.shape and (fingerprints == actual_fingerprints).all():
+                return {"passed": True, "diff_ratio": 0.0, "changed_pixels": 0, "changed_tiles": 0,
+                        "total_tiles": fingerprints.size, "difference": None, "reason": None, "heatmap_path": None}
+
+        result = compare_images(load_image(baseline_path), actual, self.tile_size, tolerance, max_diff_ratio,
+                                ignore_regions, fingerprints)
+        result["heatmap_path"] = None
+        if not result["passed"] and result["difference"] is not None:
+            result["heatmap_path"] = os.path.join(RUN_DIR, "diffs", f"{name}_diff.png")
+            render_heatmap(actual, result["difference"], result["heatmap_path"], tolerance)
+        return result
+
+    def _fingerprints_path(self, name):
+        """Path of the cached fingerprints of a baseline"""
+        return os.path.join(self.directory, f"{name}.tiles.npz")
+
+    def _save_fingerprints(self, name, masked_pixels, ignore_regions, baseline_hash):
+        """Cache the tile fingerprints of a masked baseline, with the SHA-256 of the baseline file"""
+        np.savez(self._fingerprints_path(name),
+                 fingerprints=tile_fingerprints(masked_pixels, self.tile_size),
+                 ignore_regions=np.array(ignore_regions or [], dtype=np.int64).reshape(-1, 4),
+                 tile_size=self.tile_size,
+                 baseline_hash=baseline_hash)
+
+    def _load_fingerprints(self, name, ignore_regions, baseline_hash):
+        """
+        Load cached fingerprints if they were computed from the current baseline file
+        with the same tiles and ignore regions
+
+        A baseline replaced without regenerating its cache (e.g. copied in or checked
+        out on its own) does not match the stored hash, so its stale cache is ignored.
+        """
+        try:
+            with np.load(self._fingerprints_path(name)) as cached:
+                regions = np.array(ignore_regions or [], dtype=np.int64).reshape(-1, 4)
+                if int(cached["tile_size"]) != self.tile_size or not np.array_equal(cached["ignore_regions"], regions):
+                    return None
+                if str(cached["baseline_hash"]) != baseline_hash:
+                    return None
+                return cached["fingerprints"]
+        except (OSError, KeyError, ValueError):
+            return None
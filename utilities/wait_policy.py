@@ -0,0 +1,127 @@
+import os
+import json
+import time
+from contextlib import contextmanager
+from selenium.webdriver.support.ui import WebDriverWait
+from config.config import SINGLE_TIMEOUT_WAITS, PAGE_LOAD_TIMEOUT
+
+# Wall-clock time spent inside waits for this process, keyed by wait kind
+_wait_stats = {}
+# Implicit wait commands sent to the browsers of this process
+_implicit_wait_changes = 0
+
+# Window property set on a document that is being navigated away from
+LEAVING_PAGE_FLAG = "__leavingPage"
+
+def set_implicit_wait(driver, seconds):
+    """
+    Set the implicit wait of a driver, skipping the round trip when it is already set
+
+    Args:
+        driver: WebDriver instance
+        seconds: Implicit wait in seconds
+    """
+    global _implicit_wait_changes
+    if getattr(driver, "_current_implicit_wait", None) == seconds:
+        return
+    # Unknown until the browser confirmed the change
+    driver._current_implicit_wait = None
+    driver.implicitly_wait(seconds)
+    driver._current_implicit_wait = seconds
+    _implicit_wait_changes += 1
+
+@contextmanager
+def single_timeout(driver, kind="wait"):
+    """
+    Run an explicit wait or absence check with the implicit wait switched off
+
+    With an implicit wait active every find_element inside an explicit wait can block
+    for the implicit timeout, so a negative check may take far longer than its own
+    timeout. While the context is active the implicit wait is 0, giving the operation
+    a single effective timeout. Only the outermost of nested contexts switches the
+    implicit wait and is recorded in the wait report, and no command is sent when the
+    implicit wait already has the wanted value.
+
+    Args:
+        driver: WebDriver instance
+        kind: Label used to group the time spent in the wait report
+    """
+    if getattr(driver, "_single_timeout_active", False):
+        yield
+        return
+
+    driver._single_timeout_active = True
+    start = time.perf_counter()
+    try:
+        if SINGLE_TIMEOUT_WAITS:
+            set_implicit_wait(driver, 0)
+        yield
+    finally:
+        driver._single_timeout_active = False
+        if SINGLE_TIMEOUT_WAITS:
+            try:
+                set_implicit_wait(driver, getattr(driver, "_implicit_wait", 0))
+            except Exception:
+                # The session is gone, nothing to restore
+                pass
+        record_wait(kind, time.perf_counter() - start)
+
+def wait_for_ready_state(driver, state="complete", timeout=PAGE_LOAD_TIMEOUT):
+    """
+    Wait for the document to reach a ready state
+
+    With the "eager" or "none" page load strategy navigation returns before the page
+    has loaded; this waits for what the "normal" strategy would have waited for. A
+    document flagged with LEAVING_PAGE_FLAG never counts as ready.
+
+    Args:
+        driver: WebDriver instance
+        state: "interactive" (DOM parsed) or "complete" (every subresource loaded)
+        timeout: Time to wait in seconds
+    """
+    accepted = ("interactive", "complete") if state == "interactive" else ("complete",)
+    start = time.perf_counter()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(f"return window.{LEAVING_PAGE_FLAG} ? 'leaving' : document.readyState") in accepted
+        )
+    finally:
+        record_wait(f"ready_state_{state}", time.perf_counter() - start)
+
+def record_wait(kind, seconds):
+    """
+    Add time spent waiting to the wait report
+
+    Args:
+        kind: Label of the wait
+        seconds: Time spent in seconds
+    """
+    entry = _wait_stats.setdefault(kind, {"count": 0, "seconds": 0.0})
+    entry["count"] += 1
+    entry["seconds"] += seconds
+
+def get_wait_stats():
+    """
+    Get the time spent inside waits
+
+    Returns:
+        dict: Policy state, totals, implicit wait commands sent and a per-kind breakdown
+    """
+    return {
+        "single_timeout_waits": SINGLE_TIMEOUT_WAITS,
+        "implicit_wait_changes": _implicit_wait_changes,
+        "count": sum(entry["count"] for entry in _wait_stats.values()),
+        "seconds": sum(entry["seconds"] for entry in _wait_stats.values()),
+        "by_kind": {kind: dict(entry) for kind, entry in _wait_stats.items()}
+    }
+
+def write_wait_report(path):
+    """
+    Write the wait report as JSON
+
+    Args:
+        path: Path of the report file
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(get_wait_stats(), f, indent=2)